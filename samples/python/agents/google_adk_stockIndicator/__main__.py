@@ -23,7 +23,13 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option('--host', default='localhost')
 @click.option('--port', default=10011)  
-def main(host, port):
+@click.option('--workers', default=1, help='Number of worker processes.')
+@click.option(
+    '--store',
+    default=None,
+    help='SQLite file shared by the workers for task state.',
+)
+def main(host, port, workers, store):
     try:
         # 如果未使用 Vertex AI，則需檢查 API 金鑰
         if not os.getenv('GOOGLE_GENAI_USE_VERTEXAI') == 'TRUE':
@@ -86,9 +92,12 @@ def main(host, port):
 
         server = A2AServer(
             agent_card=agent_card,
-            task_manager=AgentTaskManager(agent=StockIndicatorAgent()),
+            task_manager=AgentTaskManager(
+                agent=StockIndicatorAgent(), store_path=store
+            ),
             host=host,
             port=port,
+            workers=workers,
         )
 
         server.start()
@@ -6,7 +6,8 @@ from collections.abc import AsyncIterable
 from typing import Any
 
 from common.server import utils
-from common.server.task_manager import InMemoryTaskManager
+from common.server.dedup import SendDeduplicator
+from common.server.task_manager import InMemoryTaskManager, TaskCanceledError
 from common.types import (
     Artifact,
     InternalError,
@@ -17,13 +18,13 @@ from common.types import (
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
     Task,
-    TaskArtifactUpdateEvent,
     TaskSendParams,
     TaskState,
     TaskStatus,
-    TaskStatusUpdateEvent,
     TextPart,
 )
+from common.utils import trusted
+from common.utils.serialization import status_template
 from google.genai import types
 
 
@@ -63,6 +64,36 @@ class AgentWithTaskManager(ABC):
             return ''
         return '\n'.join([p.text for p in events[-1].content.parts if p.text])
 
+    async def ainvoke(self, query, session_id) -> str:
+        """Like invoke(), but runs on the event loop so it can be cancelled."""
+        session = self._runner.session_service.get_session(
+            app_name=self._agent.name,
+            user_id=self._user_id,
+            session_id=session_id,
+        )
+        content = types.Content(
+            role='user', parts=[types.Part.from_text(text=query)]
+        )
+        if session is None:
+            session = self._runner.session_service.create_session(
+                app_name=self._agent.name,
+                user_id=self._user_id,
+                state={},
+                session_id=session_id,
+            )
+        last_event = None
+        async for event in self._runner.run_async(
+            user_id=self._user_id, session_id=session.id, new_message=content
+        ):
+            last_event = event
+        if (
+            last_event is None
+            or not last_event.content
+            or not last_event.content.parts
+        ):
+            return ''
+        return '\n'.join([p.text for p in last_event.content.parts if p.text])
+
     async def stream(self, query, session_id) -> AsyncIterable[dict[str, Any]]:
         session = self._runner.session_service.get_session(
             app_name=self._agent.name,
@@ -119,8 +150,10 @@ class AgentWithTaskManager(ABC):
 
 
 class AgentTaskManager(InMemoryTaskManager):
-    def __init__(self, agent: AgentWithTaskManager):
-        super().__init__()
+    def __init__(
+        self, agent: AgentWithTaskManager, store_path: str | None = None
+    ):
+        super().__init__(store_path=store_path, send_dedup=SendDeduplicator())
         self.agent = agent
 
     async def _stream_generator(
@@ -136,7 +169,6 @@ class AgentTaskManager(InMemoryTaskManager):
                 artifacts = None
                 if not is_task_complete:
                     task_state = TaskState.WORKING
-                    parts = [{'type': 'text', 'text': item['updates']}]
                 else:
                     if isinstance(item['content'], dict):
                         if (
@@ -150,43 +182,48 @@ class AgentTaskManager(InMemoryTaskManager):
                         else:
                             data = item['content']
                             task_state = TaskState.COMPLETED
-                        parts = [{'type': 'data', 'data': data}]
+                        parts = [trusted.data_part(data=data)]
                     else:
                         task_state = TaskState.COMPLETED
-                        parts = [{'type': 'text', 'text': item['content']}]
-                    artifacts = [Artifact(parts=parts, index=0, append=False)]
-            message = Message(role='agent', parts=parts)
-            task_status = TaskStatus(state=task_state, message=message)
+                        parts = [trusted.text_part(text=item['content'])]
+                    artifacts = [
+                        trusted.artifact(parts=parts, index=0, append=False)
+                    ]
+            if is_task_complete:
+                message = trusted.message(role='agent', parts=parts)
+                task_update_event = trusted.status_update(
+                    id=task_send_params.id,
+                    status=trusted.task_status(
+                        state=task_state, message=message
+                    ),
+                    final=False,
+                )
+            else:
+                task_update_event = status_template(
+                    task_state, item['updates']
+                ).event(task_send_params.id)
+            task_status = task_update_event.status
             await self._update_store(
                 task_send_params.id, task_status, artifacts
             )
-            task_update_event = TaskStatusUpdateEvent(
-                id=task_send_params.id,
-                status=task_status,
-                final=False,
-            )
-            yield SendTaskStreamingResponse(
+            yield trusted.streaming_response(
                 id=request.id, result=task_update_event
             )
             # Now yield Artifacts too
             if artifacts:
                 for artifact in artifacts:
-                    yield SendTaskStreamingResponse(
+                    yield trusted.streaming_response(
                         id=request.id,
-                        result=TaskArtifactUpdateEvent(
+                        result=trusted.artifact_update(
                             id=task_send_params.id,
                             artifact=artifact,
                         ),
                     )
             if is_task_complete:
-                yield SendTaskStreamingResponse(
+                yield trusted.streaming_response(
                     id=request.id,
-                    result=TaskStatusUpdateEvent(
-                        id=task_send_params.id,
-                        status=TaskStatus(
-                            state=task_status.state,
-                        ),
-                        final=True,
+                    result=status_template(task_status.state, final=True).event(
+                        task_send_params.id
                     ),
                 )
         except Exception as e:
@@ -217,6 +254,9 @@ class AgentTaskManager(InMemoryTaskManager):
         error = self._validate_request(request)
         if error:
             return error
+        return await self.deduplicate_send(request, self._send_task)
+
+    async def _send_task(self, request: SendTaskRequest) -> SendTaskResponse:
         await self.upsert_task(request.params)
         return await self._invoke(request)
 
@@ -227,31 +267,35 @@ class AgentTaskManager(InMemoryTaskManager):
         if error:
             return error
         await self.upsert_task(request.params)
-        return self._stream_generator(request)
+        return await self.stream_task_events(
+            request.id, request.params.id, self._stream_generator(request)
+        )
 
     async def _update_store(
         self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
     ) -> Task:
-        async with self.lock:
+        async with self.task_lock(task_id):
             try:
-                task = self.tasks[task_id]
+                task = self.tasks.update_task(task_id, status, artifacts)
             except KeyError:
                 logger.error(f'Task {task_id} not found for updating the task')
                 raise ValueError(f'Task {task_id} not found')
-            task.status = status
-            # if status.message is not None:
-            #    self.task_messages[task_id].append(status.message)
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-            return task
+
+        await self.retain(task)
+        return task
 
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            result = self.agent.invoke(query, task_send_params.sessionId)
+            result = await self.run_task(
+                task_send_params.id,
+                self.agent.ainvoke(query, task_send_params.sessionId),
+            )
+        except TaskCanceledError:
+            return SendTaskResponse(
+                id=request.id, result=self.tasks[task_send_params.id]
+            )
         except Exception as e:
             logger.error(f'Error invoking agent: {e}')
             raise ValueError(f'Error invoking agent: {e}')
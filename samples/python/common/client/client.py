@@ -1,12 +1,13 @@
-import json
+import asyncio
 
 from collections.abc import AsyncIterable
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import httpx
 
 from httpx._types import TimeoutTypes
-from httpx_sse import connect_sse
+from httpx_sse import aconnect_sse
+from pydantic import BaseModel
 
 from common.types import (
     A2AClientHTTPError,
@@ -18,7 +19,11 @@ from common.types import (
     GetTaskPushNotificationResponse,
     GetTaskRequest,
     GetTaskResponse,
+    InternalError,
     JSONRPCRequest,
+    JSONRPCResponse,
+    ListTasksRequest,
+    ListTasksResponse,
     SendTaskRequest,
     SendTaskResponse,
     SendTaskStreamingRequest,
@@ -26,6 +31,24 @@ from common.types import (
     SetTaskPushNotificationRequest,
     SetTaskPushNotificationResponse,
 )
+from common.utils.codec import JSONCodec, get_codec, is_json_error
+from common.utils.compression import accept_encoding_header
+
+
+if TYPE_CHECKING:
+    from common.server import A2AServer
+
+
+ResponseT = TypeVar('ResponseT', bound=BaseModel)
+
+RESPONSE_TYPES: dict[type[JSONRPCRequest], type[JSONRPCResponse]] = {
+    SendTaskRequest: SendTaskResponse,
+    GetTaskRequest: GetTaskResponse,
+    CancelTaskRequest: CancelTaskResponse,
+    SetTaskPushNotificationRequest: SetTaskPushNotificationResponse,
+    GetTaskPushNotificationRequest: GetTaskPushNotificationResponse,
+    ListTasksRequest: ListTasksResponse,
+}
 
 
 class A2AClient:
@@ -34,69 +57,193 @@ class A2AClient:
         agent_card: AgentCard = None,
         url: str = None,
         timeout: TimeoutTypes = 60.0,
+        codec: JSONCodec | None = None,
+        local_server: 'A2AServer | None' = None,
     ):
+        """Creates a client for the agent at url, or that of agent_card.
+
+        Passing the A2AServer of a trusted agent running in the same
+        process as local_server makes requests go straight to it: no HTTP,
+        no JSON, and responses are not validated again.
+        """
         if agent_card:
             self.url = agent_card.url
         elif url:
             self.url = url
+        elif local_server is not None:
+            self.url = None
         else:
             raise ValueError('Must provide either agent_card or url')
         self.timeout = timeout
+        self.local_server = local_server
+        self.codec = codec or get_codec()
+        self.headers = {
+            'Content-Type': self.codec.media_type,
+            'Accept-Encoding': accept_encoding_header(),
+        }
 
     async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
-        return SendTaskResponse(**await self._send_request(request))
+        return await self._call(SendTaskResponse, request)
 
     async def send_task_streaming(
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
         request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
-                client, 'POST', self.url, json=request.model_dump()
+        if self.local_server is not None:
+            async for response in self._stream_local(request):
+                yield response
+            return
+        # An async client lets cancelling the consumer abort the request.
+        async with httpx.AsyncClient(timeout=None) as client:
+            async with aconnect_sse(
+                client,
+                'POST',
+                self.url,
+                content=self.codec.encode(request),
+                headers=self.headers,
             ) as event_source:
                 try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
+                    async for sse in event_source.aiter_sse():
+                        if not sse.data:
+                            # Keep-alive comments surface as empty events.
+                            continue
+                        yield self._decode(SendTaskStreamingResponse, sse.data)
                 except httpx.RequestError as e:
                     raise A2AClientHTTPError(400, str(e)) from e
 
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
+    async def batch(
+        self, requests: list[JSONRPCRequest]
+    ) -> list[JSONRPCResponse]:
+        """Sends requests as one JSON-RPC batch in a single round trip.
+
+        Responses are returned in the order of requests, each parsed as the
+        response type matching its request. Streaming requests are rejected
+        by the server.
+        """
+        if not requests:
+            return []
+        if self.local_server is not None:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._call(
+                            RESPONSE_TYPES.get(type(request), JSONRPCResponse),
+                            request,
+                        )
+                        for request in requests
+                    )
+                )
+            )
+
+        content = await self._post(
+            b'[' + b','.join(map(self.codec.encode, requests)) + b']'
+        )
+        try:
+            items = self.codec.loads(content)
+        except ValueError as e:
+            raise A2AClientJSONError(str(e)) from e
+        by_id = {
+            item.get('id'): item for item in items if isinstance(item, dict)
+        }
+        responses = []
+        for request in requests:
+            response_type = RESPONSE_TYPES.get(type(request), JSONRPCResponse)
+            item = by_id.get(request.id)
+            if item is None:
+                responses.append(
+                    JSONRPCResponse(
+                        id=request.id,
+                        error=InternalError(
+                            message='Missing response in batch'
+                        ),
+                    )
+                )
+            else:
+                responses.append(response_type.model_validate(item))
+        return responses
+
+    async def _call(
+        self, response_type: type[ResponseT], request: JSONRPCRequest
+    ) -> ResponseT:
+        if self.local_server is None:
+            return self._decode(
+                response_type, await self._send_request(request)
+            )
+        response = await self.local_server.dispatch_local(request)
+        if not isinstance(response, response_type):
+            response = response_type(id=response.id, error=response.error)
+        return response
+
+    async def _stream_local(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        result = await self.local_server.dispatch_local(request)
+        if isinstance(result, JSONRPCResponse):
+            yield SendTaskStreamingResponse(id=result.id, error=result.error)
+            return
+        try:
+            async for response in result:
+                if not isinstance(response, SendTaskStreamingResponse):
+                    response = SendTaskStreamingResponse(
+                        id=response.id, error=response.error
+                    )
+                yield response
+        finally:
+            aclose = getattr(result, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+
+    async def _send_request(self, request: JSONRPCRequest) -> bytes:
+        return await self._post(self.codec.encode(request))
+
+    async def _post(self, content: bytes) -> bytes:
         async with httpx.AsyncClient() as client:
             try:
                 # Image generation could take time, adding timeout
                 response = await client.post(
-                    self.url, json=request.model_dump(), timeout=self.timeout
+                    self.url,
+                    content=content,
+                    headers=self.headers,
+                    timeout=self.timeout,
                 )
                 response.raise_for_status()
-                return response.json()
+                return response.content
             except httpx.HTTPStatusError as e:
                 raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
+
+    def _decode(
+        self, response_type: type[ResponseT], data: bytes | str
+    ) -> ResponseT:
+        try:
+            return self.codec.decode(response_type, data)
+        except Exception as e:
+            if is_json_error(e):
                 raise A2AClientJSONError(str(e)) from e
+            raise
 
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
-        return GetTaskResponse(**await self._send_request(request))
+        return await self._call(GetTaskResponse, request)
+
+    async def list_tasks(
+        self, payload: dict[str, Any] | None = None
+    ) -> ListTasksResponse:
+        request = ListTasksRequest(params=payload or {})
+        return await self._call(ListTasksResponse, request)
 
     async def cancel_task(self, payload: dict[str, Any]) -> CancelTaskResponse:
         request = CancelTaskRequest(params=payload)
-        return CancelTaskResponse(**await self._send_request(request))
+        return await self._call(CancelTaskResponse, request)
 
     async def set_task_callback(
         self, payload: dict[str, Any]
     ) -> SetTaskPushNotificationResponse:
         request = SetTaskPushNotificationRequest(params=payload)
-        return SetTaskPushNotificationResponse(
-            **await self._send_request(request)
-        )
+        return await self._call(SetTaskPushNotificationResponse, request)
 
     async def get_task_callback(
         self, payload: dict[str, Any]
     ) -> GetTaskPushNotificationResponse:
         request = GetTaskPushNotificationRequest(params=payload)
-        return GetTaskPushNotificationResponse(
-            **await self._send_request(request)
-        )
+        return await self._call(GetTaskPushNotificationResponse, request)
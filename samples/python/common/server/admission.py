@@ -0,0 +1,104 @@
+import asyncio
+import math
+import time
+
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+from common.server.utils import ReleasingStream
+
+
+class OverloadedError(Exception):
+    """Raised when a request cannot be admitted under its method's limit."""
+
+    def __init__(self, method: str, retry_after: int):
+        super().__init__(f'{method} is over its concurrency limit')
+        self.method = method
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimit:
+    """Caps the in-flight requests of one JSON-RPC method.
+
+    Up to max_concurrent requests run at once. Up to max_queue more wait in
+    FIFO order for at most queue_timeout seconds (None waits forever).
+    Anything beyond that is rejected right away with OverloadedError, whose
+    retry_after is estimated from how long recent requests held a slot.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int = 0,
+        queue_timeout: float | None = 5.0,
+    ):
+        if max_concurrent < 1:
+            raise ValueError('max_concurrent must be at least 1')
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.method = ''
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._hold_time = 1.0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up, at least one."""
+        backlog = (len(self._waiters) + 1) / self.max_concurrent
+        return max(1, math.ceil(self._hold_time * backlog))
+
+    async def acquire(self) -> float:
+        """Waits for a slot and returns the time it was granted.
+
+        Pass the returned value to release() once the request is done.
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return time.monotonic()
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise OverloadedError(self.method, self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait was interrupted.
+                self.release(time.monotonic())
+            else:
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                self.timed_out += 1
+                raise OverloadedError(self.method, self.retry_after()) from None
+            raise
+        self.admitted += 1
+        return time.monotonic()
+
+    def release(self, acquired_at: float):
+        held = time.monotonic() - acquired_at
+        self._hold_time += (held - self._hold_time) * 0.2
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter.
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def hold(
+        self, stream: AsyncIterable[Any], acquired_at: float
+    ) -> AsyncIterator[Any]:
+        """Yields from stream and releases the slot once it is done with."""
+        return ReleasingStream(stream, lambda: self.release(acquired_at))
@@ -0,0 +1,60 @@
+import hashlib
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from common.utils.compression import available_encodings, compress, negotiate
+
+
+class CachedResponse:
+    """A response body serialized once and served as precomputed bytes.
+
+    Keeps a variant per available Content-Encoding next to the identity
+    body, each with its own strong ETag, and answers conditional requests
+    with 304 Not Modified. Variants carry their Content-Encoding, so
+    CompressionMiddleware passes them through untouched.
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str = 'application/json',
+        max_age: int = 300,
+    ):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.body = body
+        self.etag = f'"{digest}"'
+        self.variants = {
+            encoding: (compress(body, encoding), f'"{digest}-{encoding}"')
+            for encoding in available_encodings()
+        }
+        self.etags = (self.etag, *(etag for _, etag in self.variants.values()))
+        self.media_type = media_type
+        self.cache_control = f'public, max-age={max_age}'
+
+    def respond(self, request: Request) -> Response:
+        encoding = negotiate(request.headers.get('accept-encoding', ''))
+        body, etag = self.variants.get(encoding, (self.body, self.etag))
+        headers = {
+            'ETag': etag,
+            'Cache-Control': self.cache_control,
+            'Vary': 'Accept-Encoding',
+        }
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match and _etag_matches(if_none_match, self.etags):
+            return Response(status_code=304, headers=headers)
+
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        return Response(body, media_type=self.media_type, headers=headers)
+
+
+def _etag_matches(if_none_match: str, etags: tuple[str, ...]) -> bool:
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip().removeprefix('W/')
+        if candidate in etags:
+            return True
+    return False
@@ -0,0 +1,113 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.utils.compression import (
+    compress,
+    negotiate,
+    stream_compressor,
+)
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding the client accepts.
+
+    Plain responses are compressed when their body reaches minimum_size.
+    text/event-stream responses are always compressed and flushed after each
+    write, so every SSE event reaches the client as soon as it is sent.
+    Responses that already carry a Content-Encoding are left untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self._start: Message | None = None
+        self._compressor = None
+        self._passthrough = False
+
+    async def send(self, message: Message):
+        if message['type'] == 'http.response.start':
+            self._start = message
+            return
+        if message['type'] != 'http.response.body':
+            await self._send(message)
+            return
+
+        if self._start is not None:
+            await self._begin(message)
+            return
+
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        body = self._compressor.compress(message.get('body', b''))
+        more_body = message.get('more_body', False)
+        if not more_body:
+            body += self._compressor.finish()
+        await self._send(
+            {'type': 'http.response.body', 'body': body, 'more_body': more_body}
+        )
+
+    async def _begin(self, message: Message):
+        start, self._start = self._start, None
+        headers = MutableHeaders(raw=start['headers'])
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        streaming = headers.get('content-type', '').startswith(
+            'text/event-stream'
+        )
+
+        if (
+            'content-encoding' in headers
+            or start['status'] in (204, 304)
+            or (
+                not streaming
+                and not more_body
+                and len(body) < self.minimum_size
+            )
+        ):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers['Content-Encoding'] = self.encoding
+        headers.add_vary_header('Accept-Encoding')
+        if not more_body:
+            body = compress(body, self.encoding)
+            headers['Content-Length'] = str(len(body))
+            await self._send(start)
+            await self._send({'type': 'http.response.body', 'body': body})
+            return
+
+        if 'content-length' in headers:
+            del headers['Content-Length']
+        self._compressor = stream_compressor(self.encoding)
+        await self._send(start)
+        await self._send(
+            {
+                'type': 'http.response.body',
+                'body': self._compressor.compress(body),
+                'more_body': True,
+            }
+        )
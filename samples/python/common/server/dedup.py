@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+import time
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from common.types import TaskSendParams
+
+
+DedupKey = tuple[str, str]
+
+
+def send_key(params: TaskSendParams) -> DedupKey:
+    """Identifies a tasks/send by its task id and a hash of its message."""
+    message = params.message.model_dump_json(exclude_none=True)
+    return params.id, hashlib.sha256(message.encode()).hexdigest()
+
+
+class SendDeduplicator:
+    """Collapses retried tasks/send requests into a single execution.
+
+    A request whose key matches one still running waits for that run's
+    result instead of starting another. A request matching one that
+    finished less than window seconds ago gets the stored result, as long
+    as the caller still considers it current. Failed runs are not
+    remembered, so retrying them runs them again. At most max_entries
+    finished results are kept, oldest dropped first.
+    """
+
+    def __init__(self, window: float = 300.0, max_entries: int = 10_000):
+        self.window = window
+        self.max_entries = max_entries
+        self.hits = 0
+        self.joined = 0
+        self.misses = 0
+        self._running: dict[DedupKey, asyncio.Future] = {}
+        self._finished: OrderedDict[DedupKey, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._running) + len(self._finished)
+
+    async def run(
+        self,
+        key: DedupKey,
+        work: Callable[[], Awaitable[Any]],
+        current: Callable[[Any], bool] | None = None,
+    ):
+        """Returns the result of work(), running it only if key is new.
+
+        A stored result for which current() returns False is dropped and
+        the work runs again. The work runs in its own asyncio task, so the
+        requests waiting for it, the first one included, can give up
+        without cancelling it for the others.
+        """
+        now = time.monotonic()
+        self._expire(now)
+        finished = self._finished.get(key)
+        if finished is not None:
+            if current is None or current(finished[1]):
+                self.hits += 1
+                return finished[1]
+            del self._finished[key]
+        running = self._running.get(key)
+        if running is not None:
+            self.joined += 1
+        else:
+            self.misses += 1
+            running = asyncio.ensure_future(work())
+            self._running[key] = running
+            running.add_done_callback(lambda _: self._finish(key, running))
+        return await asyncio.shield(running)
+
+    def _finish(self, key: DedupKey, running: asyncio.Future):
+        del self._running[key]
+        # Retrieving the exception keeps an unawaited failure unreported.
+        if running.cancelled() or running.exception() is not None:
+            return
+        self._finished[key] = (time.monotonic(), running.result())
+        while len(self._finished) > self.max_entries:
+            self._finished.popitem(last=False)
+
+    def forget(self, key: DedupKey):
+        """Drops a stored result so the next matching request runs again."""
+        self._finished.pop(key, None)
+
+    def _expire(self, now: float):
+        finished = self._finished
+        while finished:
+            key, (finished_at, _) = next(iter(finished.items()))
+            if now - finished_at < self.window:
+                break
+            del finished[key]
@@ -0,0 +1,92 @@
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+from common.types import TaskArtifactUpdateEvent, TaskStatusUpdateEvent
+
+
+# Queued after the last event of a stream that ended without a final status
+# update, e.g. when the task is waiting for input.
+STREAM_END = object()
+
+
+class TaskEventLog:
+    """Sequence-numbered log of the events streamed for one task.
+
+    Sequence numbers start at 1 and keep increasing across the streams of
+    the task, so they double as SSE event ids. At most max_events events are
+    kept, oldest dropped first. Once the task reaches a final state the log
+    is compacted to its artifact updates and the final status update, which
+    is all a late subscriber needs to rebuild the outcome.
+    """
+
+    def __init__(self, max_events: int = 1000):
+        self.max_events = max_events
+        self.next_seq = 1
+        self.closed = False
+        self.final = False
+        self._events: deque[tuple[int, Any]] = deque(maxlen=max_events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, event: Any) -> int:
+        """Logs event and returns its sequence number."""
+        seq = self.next_seq
+        self.next_seq += 1
+        self._events.append((seq, event))
+        self.closed = False
+        if isinstance(event, TaskStatusUpdateEvent) and event.final:
+            self.final = True
+            self.compact()
+        else:
+            # A task that took input, for instance, is streaming again.
+            self.final = False
+        return seq
+
+    def open(self):
+        """Marks the start of a new stream, such as the next turn."""
+        self.closed = False
+        self.final = False
+
+    def close(self):
+        """Marks the current stream as ended."""
+        self.closed = True
+
+    def since(self, seq: int | None) -> list[tuple[int, Any]]:
+        """Returns the logged events after seq, oldest first.
+
+        Walks back from the newest event, so the cost grows with the number
+        of events returned rather than the size of the log.
+        """
+        if seq is None:
+            return list(self._events)
+        missed = []
+        for entry in reversed(self._events):
+            if entry[0] <= seq:
+                break
+            missed.append(entry)
+        missed.reverse()
+        return missed
+
+    def compact(self):
+        self._events = deque(
+            (
+                (seq, event)
+                for seq, event in self._events
+                if isinstance(event, TaskArtifactUpdateEvent)
+                or (isinstance(event, TaskStatusUpdateEvent) and event.final)
+            ),
+            maxlen=self.max_events,
+        )
+
+
+def last_event_id(metadata: Mapping[str, Any] | None) -> int | None:
+    """Reads the `lastEventId` a resubscribing client passed in metadata."""
+    if not metadata:
+        return None
+    value = metadata.get('lastEventId')
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
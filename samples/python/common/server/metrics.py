@@ -0,0 +1,227 @@
+"""Prometheus text-format metrics for A2AServer.
+
+The request path only bumps plain attributes on preallocated objects; label
+sets, cumulative buckets and gauges read from the task manager are all
+worked out when /metrics is scraped.
+"""
+
+import time
+
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from typing import Any
+
+from common.server.utils import ReleasingStream
+from common.types import TaskState
+
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+Collector = Callable[[], Iterable[str]]
+
+
+class Histogram:
+    __slots__ = ('bounds', 'count', 'counts', 'sum')
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = '') -> Iterable[str]:
+        sep = ',' if labels else ''
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            cumulative += count
+            yield f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}'
+        suffix = f'{{{labels}}}' if labels else ''
+        yield f'{name}_sum{suffix} {self.sum}'
+        yield f'{name}_count{suffix} {self.count}'
+
+
+class MethodMetrics:
+    """Request counters for one JSON-RPC method."""
+
+    __slots__ = ('errors', 'in_flight', 'latency', 'requests')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency = Histogram()
+
+    def begin(self) -> float:
+        self.in_flight += 1
+        return time.perf_counter()
+
+    def observe(self, started: float, error: bool):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.latency.observe(time.perf_counter() - started)
+
+    def end(self, started: float, error: bool):
+        self.in_flight -= 1
+        self.observe(started, error)
+
+    def track(self, stream: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """Yields from stream and counts it as in flight until done with."""
+        return ReleasingStream(stream, self._leave)
+
+    def _leave(self):
+        self.in_flight -= 1
+
+
+class ServerMetrics:
+    """Metrics registry of one A2AServer.
+
+    Senders passed to A2AServer.add_push_notification_sender() record
+    push-notification latency and failures here. Add scrape-time gauges
+    with add_collector().
+    """
+
+    def __init__(self):
+        self.methods: dict[str, MethodMetrics] = {}
+        self.push_notifications = Histogram()
+        self.push_notification_failures = 0
+        self._collectors: list[Collector] = []
+
+    def method(self, name: str) -> MethodMetrics:
+        metrics = self.methods.get(name)
+        if metrics is None:
+            metrics = self.methods[name] = MethodMetrics()
+        return metrics
+
+    def observe_push_notification(self, seconds: float, success: bool):
+        self.push_notifications.observe(seconds)
+        if not success:
+            self.push_notification_failures += 1
+
+    def add_collector(self, collector: Collector):
+        """Registers a callable that yields metric lines at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> bytes:
+        lines = [
+            '# TYPE a2a_requests_total counter',
+            *(
+                f'a2a_requests_total{{method="{name}"}} {m.requests}'
+                for name, m in self.methods.items()
+            ),
+            '# TYPE a2a_request_errors_total counter',
+            *(
+                f'a2a_request_errors_total{{method="{name}"}} {m.errors}'
+                for name, m in self.methods.items()
+            ),
+            '# TYPE a2a_requests_in_flight gauge',
+            *(
+                f'a2a_requests_in_flight{{method="{name}"}} {m.in_flight}'
+                for name, m in self.methods.items()
+            ),
+            '# TYPE a2a_request_duration_seconds histogram',
+        ]
+        for name, m in self.methods.items():
+            lines.extend(
+                m.latency.render(
+                    'a2a_request_duration_seconds', f'method="{name}"'
+                )
+            )
+        lines.append('# TYPE a2a_push_notification_duration_seconds histogram')
+        lines.extend(
+            self.push_notifications.render(
+                'a2a_push_notification_duration_seconds'
+            )
+        )
+        lines.append('# TYPE a2a_push_notification_failures_total counter')
+        lines.append(
+            'a2a_push_notification_failures_total '
+            f'{self.push_notification_failures}'
+        )
+        for collector in self._collectors:
+            lines.extend(collector())
+        lines.append('')
+        return '\n'.join(lines).encode()
+
+
+def task_manager_metrics(task_manager: Any) -> Iterable[str]:
+    """Gauges for the SSE subscribers and tasks held by a task manager.
+
+    Works with InMemoryTaskManager and anything exposing the same `tasks`,
+    `task_sse_subscribers`, `subscriber_stats`, `send_dedup` and `retention`
+    attributes.
+    """
+    subscribers = getattr(task_manager, 'task_sse_subscribers', None)
+    if subscribers is not None:
+        queues = [q for queues in subscribers.values() for q in queues]
+        depths = [q.qsize() for q in queues]
+        yield '# TYPE a2a_sse_subscribers gauge'
+        yield f'a2a_sse_subscribers {len(queues)}'
+        yield '# TYPE a2a_sse_queue_depth gauge'
+        yield f'a2a_sse_queue_depth {sum(depths)}'
+        yield '# TYPE a2a_sse_queue_depth_max gauge'
+        yield f'a2a_sse_queue_depth_max {max(depths, default=0)}'
+
+    stats = getattr(task_manager, 'subscriber_stats', None)
+    if stats is not None:
+        yield '# TYPE a2a_sse_events_dropped_total counter'
+        yield f'a2a_sse_events_dropped_total {stats.dropped}'
+        yield '# TYPE a2a_sse_events_coalesced_total counter'
+        yield f'a2a_sse_events_coalesced_total {stats.coalesced}'
+        yield '# TYPE a2a_sse_subscribers_disconnected_total counter'
+        yield f'a2a_sse_subscribers_disconnected_total {stats.disconnected}'
+
+    tasks = getattr(task_manager, 'tasks', None)
+    if tasks is not None:
+        count_by = getattr(tasks, 'count_by', None)
+        if count_by is not None:
+            counts = count_by('$.status.state')
+        else:
+            counts = Counter(
+                task.status.state.value for task in list(tasks.values())
+            )
+        yield '# TYPE a2a_tasks gauge'
+        for state in TaskState:
+            count = counts.get(state.value, 0)
+            yield f'a2a_tasks{{state="{state.value}"}} {count}'
+
+    dedup = getattr(task_manager, 'send_dedup', None)
+    if dedup is not None:
+        yield '# TYPE a2a_send_dedup_total counter'
+        yield f'a2a_send_dedup_total{{outcome="cached"}} {dedup.hits}'
+        yield f'a2a_send_dedup_total{{outcome="joined"}} {dedup.joined}'
+        yield f'a2a_send_dedup_total{{outcome="executed"}} {dedup.misses}'
+
+    retention = getattr(task_manager, 'retention', None)
+    if retention is not None:
+        yield '# TYPE a2a_tasks_evicted_total counter'
+        yield f'a2a_tasks_evicted_total{{reason="expired"}} {retention.expired}'
+        yield f'a2a_tasks_evicted_total{{reason="capacity"}} {retention.evicted}'
+        yield '# TYPE a2a_tasks_archived_total counter'
+        yield f'a2a_tasks_archived_total {retention.archived}'
+        yield '# TYPE a2a_task_archive_errors_total counter'
+        yield f'a2a_task_archive_errors_total {retention.archive_errors}'
+        yield '# TYPE a2a_retained_task_bytes gauge'
+        yield f'a2a_retained_task_bytes {retention.bytes}'
@@ -0,0 +1,326 @@
+"""Incremental reading of JSON-RPC request bodies.
+
+Bodies are read from the ASGI stream chunk by chunk so that a size limit can
+be enforced before everything is buffered. When a BlobStore is given, large
+base64 `file.bytes` values of the message parts are decoded on the fly into
+the store, and the request is rewritten to reference the blobs by uri.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+
+from pathlib import Path
+
+from starlette.requests import Request
+
+from common.utils.blob_store import BlobStore
+
+
+_TOKEN = re.compile(rb'["{}\[\],:]')
+_STRING = re.compile(rb'["\\]')
+
+_NORMAL, _STRING_VALUE, _KEY, _CANDIDATE, _SPILL = range(5)
+
+
+class BodyTooLargeError(Exception):
+    """Raised when a request body exceeds the configured maximum size."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f'Request body exceeds {max_size} bytes')
+        self.max_size = max_size
+
+
+class InvalidFileContentError(ValueError):
+    """Raised when a spilled `file.bytes` value is not valid base64."""
+
+
+class _Frame:
+    __slots__ = ('is_object', 'key', 'key_start', 'part_type')
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key: str | None = None
+        self.key_start = 0
+        self.part_type: bytes | None = None
+
+
+class FileSpiller:
+    """Rewrites a JSON-RPC body, moving large `file.bytes` values to blobs.
+
+    Feed the body with feed() and get the rewritten document from finish().
+    Only the file content of `params.message.parts` is considered, in parts
+    whose `"type": "file"` comes before their `file` member; the `bytes` of
+    such a file is replaced by the `uri` of a blob once its value reaches
+    threshold characters. The value is hashed and base64-decoded straight
+    into the store and is never held in memory as a whole. Everything else,
+    such as the content of DataParts and metadata, is copied verbatim.
+    """
+
+    def __init__(self, threshold: int, blob_store: BlobStore):
+        self.threshold = threshold
+        self.blob_store = blob_store
+        self._out = bytearray()
+        self._buf = bytearray()
+        self._stack: list[_Frame] = []
+        self._expect_key = False
+        self._mode = _NORMAL
+        self._key = bytearray()
+        self._pending = bytearray()
+        self._b64_rest = b''
+        self._type: bytearray | None = None
+        self._file = None
+        self._path: str | None = None
+        self._hash = None
+
+    def feed(self, chunk: bytes):
+        self._buf += chunk
+        pos = self._process(0)
+        del self._buf[:pos]
+
+    def finish(self) -> bytes:
+        if self._mode != _NORMAL:
+            # Truncated input; hand back what is left so the JSON decoder
+            # reports the error.
+            self.discard()
+            return bytes(self._out + self._pending + self._buf)
+        self._out += self._buf
+        self._buf.clear()
+        return bytes(self._out)
+
+    def discard(self):
+        """Removes the file being written, if any."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._path is not None:
+            Path(self._path).unlink(missing_ok=True)
+            self._path = None
+        self._hash = None
+
+    def _process(self, pos: int) -> int:
+        buf = self._buf
+        while pos < len(buf):
+            if self._mode == _NORMAL:
+                pos = self._scan_token(pos)
+                continue
+            end, stop = self._string_end(pos)
+            self._consume_string(buf[pos:stop], end)
+            if not end:
+                return stop
+            pos = stop + 1
+        return pos
+
+    def _consume_string(self, segment: bytes, end: bool):
+        mode = self._mode
+        if mode == _STRING_VALUE:
+            self._out += segment
+            if self._type is not None:
+                self._type += segment
+            if end:
+                self._out += b'"'
+                if self._type is not None:
+                    self._stack[-1].part_type = bytes(self._type)
+                    self._type = None
+        elif mode == _KEY:
+            self._out += segment
+            self._key += segment
+            if end:
+                self._out += b'"'
+                self._stack[-1].key = json.loads(b'"' + self._key + b'"')
+        elif mode == _CANDIDATE:
+            self._pending += segment
+            if len(self._pending) >= self.threshold:
+                self._start_spill()
+                if end:
+                    self._end_spill()
+            elif end:
+                self._out += b'"' + self._pending + b'"'
+                self._pending.clear()
+        else:
+            self._write(segment, last=False)
+            if end:
+                self._end_spill()
+        if end:
+            self._mode = _NORMAL
+
+    def _scan_token(self, pos: int) -> int:
+        buf = self._buf
+        match = _TOKEN.search(buf, pos)
+        if match is None:
+            self._out += buf[pos:]
+            return len(buf)
+        start = match.start()
+        self._out += buf[pos:start]
+        token = buf[start : start + 1]
+        top = self._stack[-1] if self._stack else None
+        if token == b'"':
+            if top is not None and top.is_object and self._expect_key:
+                top.key_start = len(self._out)
+                self._out += b'"'
+                self._key.clear()
+                self._mode = _KEY
+            elif self._is_file_bytes():
+                self._mode = _CANDIDATE
+            else:
+                self._out += b'"'
+                self._mode = _STRING_VALUE
+                if top is not None and top.key == 'type' and self._is_part(-1):
+                    self._type = bytearray()
+            return start + 1
+
+        self._out += token
+        if token in (b'{', b'['):
+            self._stack.append(_Frame(is_object=token == b'{'))
+            self._expect_key = token == b'{'
+        elif token in (b'}', b']'):
+            if self._stack:
+                self._stack.pop()
+            self._expect_key = False
+        elif token == b',':
+            self._expect_key = top is not None and top.is_object
+        else:
+            self._expect_key = False
+        return start + 1
+
+    def _is_file_bytes(self) -> bool:
+        stack = self._stack
+        return (
+            len(stack) >= 2
+            and stack[-1].is_object
+            and stack[-1].key == 'bytes'
+            and stack[-2].key == 'file'
+            and stack[-2].part_type == b'file'
+            and self._is_part(-2)
+        )
+
+    def _is_part(self, index: int) -> bool:
+        """Whether the frame at index is an item of params.message.parts.
+
+        The request may be the body itself or an item of a batch.
+        """
+        stack = self._stack
+        depth = len(stack) + index
+        if depth == 5 and not stack[0].is_object:
+            path = stack[1:6]
+        elif depth == 4:
+            path = stack[:5]
+        else:
+            return False
+        return [frame.is_object for frame in path] == [
+            True,
+            True,
+            True,
+            False,
+            True,
+        ] and [frame.key for frame in path[:3]] == [
+            'params',
+            'message',
+            'parts',
+        ]
+
+    def _string_end(self, pos: int) -> tuple[bool, int]:
+        """Finds the closing quote of the string being read.
+
+        Returns whether it was found and the offset up to which the string
+        content can be consumed; a trailing backslash is left for the next
+        chunk so that escapes are never split.
+        """
+        buf = self._buf
+        while True:
+            match = _STRING.search(buf, pos)
+            if match is None:
+                return False, len(buf)
+            index = match.start()
+            if buf[index] == ord('"'):
+                return True, index
+            if index + 1 >= len(buf):
+                return False, index
+            pos = index + 2
+
+    def _start_spill(self):
+        fd, self._path = self.blob_store.temp_file()
+        self._file = os.fdopen(fd, 'wb')
+        self._hash = hashlib.sha256()
+        frame = self._stack[-1]
+        del self._out[frame.key_start :]
+        self._out += b'"uri":'
+        self._mode = _SPILL
+        pending = bytes(self._pending)
+        self._pending.clear()
+        self._write(pending, last=False)
+
+    def _end_spill(self):
+        self._write(b'', last=True)
+        self._file.close()
+        self._file = None
+        uri = self.blob_store.adopt(self._path, self._hash.hexdigest())
+        self._path = None
+        self._hash = None
+        self._out += json.dumps(uri).encode()
+
+    def _write(self, segment: bytes, last: bool):
+        if b'\\' in segment:
+            # Escapes JSON encoders may emit inside base64 text.
+            segment = (
+                segment.replace(b'\\/', b'/')
+                .replace(b'\\n', b'')
+                .replace(b'\\r', b'')
+            )
+        data = self._b64_rest + segment
+        usable = len(data) if last else len(data) - len(data) % 4
+        self._b64_rest = data[usable:]
+        try:
+            decoded = base64.b64decode(data[:usable], validate=True)
+        except binascii.Error as e:
+            self.discard()
+            raise InvalidFileContentError(str(e)) from e
+        self._file.write(decoded)
+        self._hash.update(decoded)
+
+
+async def read_body(
+    request: Request,
+    max_size: int | None = None,
+    spill_threshold: int | None = None,
+    blob_store: BlobStore | None = None,
+) -> bytes:
+    """Reads a request body, enforcing max_size and spilling large files.
+
+    Returns the body, rewritten when file content was spilled into
+    blob_store. Without a blob_store, and for bodies shorter than
+    spill_threshold, the body is returned as received.
+    """
+    length = request.headers.get('content-length')
+    if max_size is not None and length and int(length) > max_size:
+        raise BodyTooLargeError(max_size)
+
+    received = 0
+    head = bytearray()
+    spiller = None
+    if blob_store is None:
+        spill_threshold = None
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if max_size is not None and received > max_size:
+                raise BodyTooLargeError(max_size)
+            if spiller is not None:
+                spiller.feed(chunk)
+                continue
+            head += chunk
+            if spill_threshold is not None and len(head) > spill_threshold:
+                spiller = FileSpiller(spill_threshold, blob_store)
+                spiller.feed(bytes(head))
+                head.clear()
+    except BaseException:
+        if spiller is not None:
+            spiller.discard()
+        raise
+
+    if spiller is None:
+        return bytes(head)
+    return spiller.finish()
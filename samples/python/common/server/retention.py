@@ -0,0 +1,117 @@
+import time
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Container, Iterator
+
+from common.types import Task, TaskState
+
+
+TERMINAL_STATES = frozenset(
+    (TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED)
+)
+
+Archive = Callable[[Task], Awaitable[None] | None]
+
+
+class TaskRetention:
+    """Decides which tasks a task manager may forget.
+
+    Tasks in a terminal state (completed, failed or canceled) expire ttl
+    seconds after they reached it. On top of that at most max_tasks tasks,
+    and roughly max_bytes of serialized task JSON, are kept; beyond either
+    budget the least recently used terminal tasks are evicted first. Tasks
+    that are still in progress are never evicted for the budgets, which
+    are exceeded rather than break running work. Every evicted task is
+    handed to archive, which may be a coroutine function, once it has been
+    dropped.
+
+    Only tasks this process has created or updated are tracked. Sizes are
+    measured by serializing the task on every update, so leave max_bytes
+    unset when that cost matters more than the budget.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_tasks: int | None = None,
+        max_bytes: int | None = None,
+        archive: Archive | None = None,
+    ):
+        self.ttl = ttl
+        self.max_tasks = max_tasks
+        self.max_bytes = max_bytes
+        self.archive = archive
+        self.expired = 0
+        self.evicted = 0
+        self.archived = 0
+        self.archive_errors = 0
+        self.bytes = 0
+        self._lru: OrderedDict[str, int] = OrderedDict()
+        self._terminal: OrderedDict[str, None] = OrderedDict()
+        self._expiry: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def track(self, task: Task):
+        """Records an update of task and marks it as most recently used."""
+        size = 0
+        if self.max_bytes is not None:
+            size = len(task.model_dump_json(exclude_none=True))
+        self.bytes += size - self._lru.pop(task.id, 0)
+        self._lru[task.id] = size
+        if task.status.state not in TERMINAL_STATES:
+            self._terminal.pop(task.id, None)
+            self._expiry.pop(task.id, None)
+            return
+        self._terminal[task.id] = None
+        self._terminal.move_to_end(task.id)
+        if self.ttl is not None and task.id not in self._expiry:
+            self._expiry[task.id] = time.monotonic() + self.ttl
+
+    def touch(self, task_id: str):
+        """Marks task_id as most recently used."""
+        if task_id in self._lru:
+            self._lru.move_to_end(task_id)
+        if task_id in self._terminal:
+            self._terminal.move_to_end(task_id)
+
+    def forget(self, task_id: str):
+        self.bytes -= self._lru.pop(task_id, 0)
+        self._terminal.pop(task_id, None)
+        self._expiry.pop(task_id, None)
+
+    def over_budget(self) -> bool:
+        return (
+            self.max_tasks is not None and len(self._lru) > self.max_tasks
+        ) or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def has_expired(self) -> bool:
+        if not self._expiry:
+            return False
+        return next(iter(self._expiry.values())) <= time.monotonic()
+
+    def due(self, busy: Container[str] = ()) -> Iterator[str]:
+        """Yields the ids of the tasks to evict now, oldest first.
+
+        Over budget, only terminal tasks not in busy, such as those with
+        open streams or running work, are evicted; tasks in busy still
+        expire. Callers must forget() each yielded id before asking for
+        the next one.
+        """
+        now = time.monotonic()
+        while self._expiry:
+            task_id, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            self.expired += 1
+            yield task_id
+        if not self.over_budget():
+            return
+        for task_id in list(self._terminal):
+            if task_id in busy:
+                continue
+            self.evicted += 1
+            yield task_id
+            if not self.over_budget():
+                return
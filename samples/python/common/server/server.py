@@ -1,36 +1,84 @@
+import asyncio
 import json
 import logging
+import os
+import signal
+import weakref
 
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
 from typing import Any
+from urllib.parse import urlparse
 
-from pydantic import ValidationError
-from sse_starlette.sse import EventSourceResponse
+from pydantic import TypeAdapter, ValidationError
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-
+from starlette.responses import FileResponse, Response
 
+from common.server.admission import ConcurrencyLimit, OverloadedError
+from common.server.cached_response import CachedResponse
+from common.server.compression import CompressionMiddleware
+from common.server.metrics import (
+    MethodMetrics,
+    ServerMetrics,
+    task_manager_metrics,
+)
+from common.server.request_body import (
+    BodyTooLargeError,
+    InvalidFileContentError,
+    read_body,
+)
+from common.server.sse import EventStream, SSEResponse
 from common.server.task_manager import TaskManager
+from common.server.task_store import InMemoryTaskStore
 from common.types import (
-    A2ARequest,
     AgentCard,
     CancelTaskRequest,
     GetTaskPushNotificationRequest,
     GetTaskRequest,
     InternalError,
+    InvalidParamsError,
     InvalidRequestError,
     JSONParseError,
+    JSONRPCError,
+    JSONRPCRequest,
     JSONRPCResponse,
+    ListTasksRequest,
+    MethodNotFoundError,
     SendTaskRequest,
     SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    ServerBusyError,
     SetTaskPushNotificationRequest,
     TaskResubscriptionRequest,
 )
+from common.utils.a2a_schema import (
+    SchemaDecoder,
+    SchemaValidationError,
+    decoder_for,
+)
+from common.utils.blob_store import BLOB_SCHEME, BlobStore
+from common.utils.codec import JSONCodec, get_codec, is_json_error
+from common.utils.push_notification_auth import PushNotificationSenderAuth
+from common.utils.serialization import type_adapter
 
 
 logger = logging.getLogger(__name__)
 
+MethodHandler = Callable[[JSONRPCRequest], Awaitable[Any]]
+
+STREAMING_REQUESTS = (SendTaskStreamingRequest, TaskResubscriptionRequest)
+
+TASK_MANAGER_HANDLERS: dict[type[JSONRPCRequest], str] = {
+    GetTaskRequest: 'on_get_task',
+    SendTaskRequest: 'on_send_task',
+    SendTaskStreamingRequest: 'on_send_task_subscribe',
+    CancelTaskRequest: 'on_cancel_task',
+    SetTaskPushNotificationRequest: 'on_set_task_push_notification',
+    GetTaskPushNotificationRequest: 'on_get_task_push_notification',
+    TaskResubscriptionRequest: 'on_resubscribe_to_task',
+    ListTasksRequest: 'on_list_tasks',
+}
+
 
 class A2AServer:
     def __init__(
@@ -40,12 +88,63 @@ class A2AServer:
         endpoint='/',
         agent_card: AgentCard = None,
         task_manager: TaskManager = None,
+        workers: int = 1,
+        codec: JSONCodec | None = None,
+        agent_card_max_age: int = 300,
+        sse_heartbeat_interval: float | None = 15.0,
+        compression_min_size: int | None = 1024,
+        concurrency_limits: dict[str, ConcurrencyLimit] | None = None,
+        metrics: ServerMetrics | bool = True,
+        metrics_path: str = '/metrics',
+        max_body_size: int | None = None,
+        file_spill_threshold: int | None = 1024 * 1024,
+        blob_store: BlobStore | None = None,
+        blob_path: str = '/blobs',
+        validation: str = 'pydantic',
     ):
         self.host = host
         self.port = port
         self.endpoint = endpoint
         self.task_manager = task_manager
+        self.workers = workers
+        self.codec = codec or get_codec()
+        if validation not in ('pydantic', 'schema'):
+            raise ValueError(f'Unknown validation engine: {validation}')
+        self.validation = validation
+        self.agent_card_max_age = agent_card_max_age
+        self.sse_heartbeat_interval = sse_heartbeat_interval
+        self.max_body_size = max_body_size
+        self.file_spill_threshold = file_spill_threshold
+        self.blob_store = blob_store
+        if blob_store is not None and blob_store.base_url is None:
+            # Remote clients can only fetch blobs from the blob route, so
+            # blob uris must point there rather than be `blob:` uris.
+            card = agent_card[0] if isinstance(agent_card, list) else agent_card
+            if card is None:
+                raise ValueError(
+                    'blob_store needs a base_url, or an agent_card to derive '
+                    'it from'
+                )
+            agent = urlparse(card.url)
+            blob_store.base_url = f'{agent.scheme}://{agent.netloc}{blob_path}'
+        self.sse_streams: weakref.WeakSet[EventStream] = weakref.WeakSet()
         self.agent_card = agent_card
+        if metrics is True:
+            metrics = ServerMetrics()
+        self.metrics: ServerMetrics | None = metrics or None
+        self._method_metrics: dict[str, MethodMetrics] = {}
+        self.concurrency_limits: dict[str, ConcurrencyLimit] = {}
+        for method, limit in (concurrency_limits or {}).items():
+            self.set_concurrency_limit(method, limit)
+        self._methods: dict[
+            str, tuple[TypeAdapter | SchemaDecoder, MethodHandler, bool]
+        ] = {}
+        for request_type, handler_name in TASK_MANAGER_HANDLERS.items():
+            self.register_method(
+                request_type,
+                self._task_manager_handler(handler_name),
+                streaming=request_type in STREAMING_REQUESTS,
+            )
         self.app = Starlette()
         self.app.add_route(
             self.endpoint, self._process_request, methods=['POST']
@@ -53,6 +152,17 @@ class A2AServer:
         self.app.add_route(
             '/.well-known/agent.json', self._get_agent_card, methods=['GET']
         )
+        if self.blob_store is not None:
+            self.app.add_route(
+                f'{blob_path}/{{digest}}', self._get_blob, methods=['GET']
+            )
+        if self.metrics is not None:
+            self.metrics.add_collector(self._collect_metrics)
+            self.app.add_route(metrics_path, self._get_metrics, methods=['GET'])
+        if compression_min_size is not None:
+            self.app.add_middleware(
+                CompressionMiddleware, minimum_size=compression_min_size
+            )
 
     def start(self):
         if self.agent_card is None:
@@ -63,84 +173,412 @@ class A2AServer:
 
         import uvicorn
 
-        uvicorn.run(self.app, host=self.host, port=self.port)
+        if self.workers <= 1:
+            uvicorn.run(self.app, host=self.host, port=self.port)
+            return
 
+        if isinstance(
+            getattr(self.task_manager, 'tasks', None), dict | InMemoryTaskStore
+        ):
+            logger.warning(
+                'Task state is local to each of the %d workers; pass a '
+                'store_path to the task manager to share it',
+                self.workers,
+            )
+        self._serve_prefork(uvicorn)
+
+    def _serve_prefork(self, uvicorn):
+        """Binds the socket once and forks workers that accept on it."""
+        if not hasattr(os, 'fork'):
+            raise RuntimeError('workers > 1 requires a platform with fork()')
+
+        config = uvicorn.Config(self.app, host=self.host, port=self.port)
+        sock = config.bind_socket()
+        pids = []
+        for _ in range(self.workers):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    uvicorn.Server(config).run(sockets=[sock])
+                finally:
+                    os._exit(0)
+            pids.append(pid)
+        sock.close()
+
+        def _terminate(signum, _frame):
+            for pid in pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGINT, _terminate)
+        signal.signal(signal.SIGTERM, _terminate)
+        for pid in pids:
+            os.waitpid(pid, 0)
+
+    @property
+    def agent_card(self) -> AgentCard | list[AgentCard] | None:
+        return self._agent_card
 
-    def _get_agent_card(self, request: Request):
-        print(f"DEBUG: self.agent_card = {self.agent_card}")  # 確認是 list 且包含兩個物件
-        if isinstance(self.agent_card, list):
-            return JSONResponse(
-                [card.model_dump(exclude_none=True) for card in self.agent_card]
+    @agent_card.setter
+    def agent_card(self, agent_card: AgentCard | list[AgentCard] | None):
+        self._agent_card = agent_card
+        self.refresh_agent_card()
+
+    def refresh_agent_card(self):
+        """Re-serializes the agent card served at /.well-known/agent.json.
+
+        Assigning `agent_card` does this automatically; call it directly after
+        mutating the current card in place.
+        """
+        if self._agent_card is None:
+            self._agent_card_response = None
+            return
+        if isinstance(self._agent_card, list):
+            body = (
+                b'['
+                + b','.join(map(self.codec.encode, self._agent_card))
+                + b']'
             )
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+        else:
+            body = self.codec.encode(self._agent_card)
+        self._agent_card_response = CachedResponse(
+            body,
+            media_type=self.codec.media_type,
+            max_age=self.agent_card_max_age,
+        )
+
+    def add_push_notification_sender(
+        self,
+        sender: PushNotificationSenderAuth,
+        jwks_path: str = '/.well-known/jwks.json',
+    ):
+        """Serves sender's public keys and records its deliveries.
 
+        The sender reports push-notification latency and failures to this
+        server's metrics, unless it was given other metrics already.
+        """
+        if sender.metrics is None:
+            sender.metrics = self.metrics
+        self.app.add_route(
+            jwks_path, sender.handle_jwks_endpoint, methods=['GET']
+        )
 
+    def _get_blob(self, request: Request) -> Response:
+        uri = BLOB_SCHEME + request.path_params['digest']
+        if uri not in self.blob_store:
+            return Response(status_code=404)
+        return FileResponse(
+            self.blob_store.path(self.blob_store.digest(uri)),
+            headers={'Cache-Control': 'public, max-age=31536000, immutable'},
+        )
 
-    async def _process_request(self, request: Request):
+    def _get_agent_card(self, request: Request) -> Response:
+        if self._agent_card_response is None:
+            return Response(status_code=404)
+        return self._agent_card_response.respond(request)
+
+    def register_method(
+        self,
+        request_type: type[JSONRPCRequest],
+        handler: MethodHandler,
+        streaming: bool = False,
+    ):
+        """Routes requests whose `method` matches request_type to handler.
+
+        The method name is taken from the default of the request type's
+        `method` field, and only that type is validated for those requests.
+        With the 'schema' validation engine, types the A2A JSON schema
+        defines are checked by the decoders generated from it instead of
+        by pydantic. Streaming methods answer with SSE and are refused
+        inside batches.
+        """
+        method = request_type.model_fields['method'].default
+        validator = None
+        if self.validation == 'schema':
+            validator = decoder_for(request_type)
+        self._methods[method] = (
+            validator or type_adapter(request_type),
+            handler,
+            streaming,
+        )
+        if self.metrics is not None:
+            self._method_metrics[method] = self.metrics.method(method)
+
+    def set_concurrency_limit(self, method: str, limit: ConcurrencyLimit):
+        """Caps the in-flight requests of one method.
+
+        Every method has its own limit, so a slow method such as tasks/send
+        cannot use up the capacity of cheap ones such as tasks/get. Streaming
+        requests keep their slot until the stream ends.
+        """
+        limit.method = method
+        self.concurrency_limits[method] = limit
+
+    async def dispatch_local(self, request: JSONRPCRequest) -> Any:
+        """Handles a request from a trusted client in the same process.
+
+        The request model goes to its handler as is, skipping the JSON
+        round trip and the validation that requests arriving over HTTP go
+        through, and the result comes back as is: a response, or an async
+        iterable of streamed responses. Admission limits and metrics apply
+        as usual. Results may share objects with the task manager, so
+        callers must not modify them.
+        """
+        entry = self._methods.get(request.method)
+        if entry is None:
+            return JSONRPCResponse(id=request.id, error=MethodNotFoundError())
+        _, handler, _ = entry
         try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_python(body)
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
+            return await self._dispatch(request.method, handler, request)
+        except Exception as e:
+            return JSONRPCResponse(
+                id=request.id, error=self._error_for_exception(e)
+            )
+
+    async def _dispatch(
+        self, method: str, handler: MethodHandler, request: JSONRPCRequest
+    ) -> Any:
+        limit = self.concurrency_limits.get(method)
+        acquired_at = await limit.acquire() if limit is not None else 0.0
+        stats = self._method_metrics.get(method)
+        started = stats.begin() if stats is not None else 0.0
+        try:
+            result = await handler(request)
+        except BaseException:
+            if stats is not None:
+                stats.end(started, error=True)
+            if limit is not None:
+                limit.release(acquired_at)
+            raise
+
+        if isinstance(result, AsyncIterable):
+            if stats is not None:
+                stats.observe(started, error=False)
+                result = stats.track(result)
+            if limit is not None:
+                result = limit.hold(result, acquired_at)
+            return result
+        if stats is not None:
+            stats.end(started, error=getattr(result, 'error', None) is not None)
+        if limit is not None:
+            limit.release(acquired_at)
+        return result
+
+    def _get_metrics(self, _request: Request) -> Response:
+        return Response(
+            self.metrics.render(),
+            media_type='text/plain; version=0.0.4; charset=utf-8',
+        )
+
+    def _collect_metrics(self) -> Iterable[str]:
+        yield '# TYPE a2a_sse_streams gauge'
+        yield f'a2a_sse_streams {len(self.sse_streams)}'
+        if self.concurrency_limits:
+            yield '# TYPE a2a_admission_waiting gauge'
+            for method, limit in self.concurrency_limits.items():
+                yield (
+                    f'a2a_admission_waiting{{method="{method}"}} '
+                    f'{limit.waiting}'
                 )
-            else:
-                logger.warning(
-                    f'Unexpected request type: {type(json_rpc_request)}'
+            yield '# TYPE a2a_admission_rejected_total counter'
+            for method, limit in self.concurrency_limits.items():
+                rejected = limit.rejected + limit.timed_out
+                yield (
+                    f'a2a_admission_rejected_total{{method="{method}"}} '
+                    f'{rejected}'
                 )
-                raise ValueError(f'Unexpected request type: {type(request)}')
+        yield from task_manager_metrics(self.task_manager)
+
+    def _task_manager_handler(self, handler_name: str) -> MethodHandler:
+        async def handler(request: JSONRPCRequest) -> Any:
+            return await getattr(self.task_manager, handler_name)(request)
+
+        return handler
+
+    async def _process_request(self, request: Request):
+        request_id = None
+        try:
+            body = await read_body(
+                request,
+                max_size=self.max_body_size,
+                spill_threshold=self.file_spill_threshold,
+                blob_store=self.blob_store,
+            )
+            # Parsed once: the request models validate the parsed values,
+            # and take DataPart content, typed Any, as it is.
+            payload = self.codec.loads(body)
+            if isinstance(payload, list):
+                return await self._process_batch(payload)
+            if not isinstance(payload, dict):
+                return self._error_response(None, InvalidRequestError())
+
+            method, request_id = payload.get('method'), payload.get('id')
+            if not isinstance(method, str):
+                return self._error_response(None, InvalidRequestError())
+
+            entry = self._methods.get(method)
+            if entry is None:
+                logger.warning(f'Unknown method: {method}')
+                return self._error_response(request_id, MethodNotFoundError())
 
+            adapter, handler, _ = entry
+            json_rpc_request = adapter.validate_python(payload)
+            if isinstance(json_rpc_request, TaskResubscriptionRequest):
+                _resume_from_last_event_id(json_rpc_request, request)
+            result = await self._dispatch(method, handler, json_rpc_request)
             return self._create_response(result)
 
+        except OverloadedError as e:
+            return self._busy_response(request_id, e)
+        except BodyTooLargeError as e:
+            response = JSONRPCResponse(
+                id=None, error=InvalidRequestError(message=str(e))
+            )
+            return self._json_response(response, status_code=413)
+        except InvalidFileContentError as e:
+            return self._error_response(
+                request_id, InvalidParamsError(message=str(e))
+            )
         except Exception as e:
             return self._handle_exception(e)
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
-        if isinstance(e, json.decoder.JSONDecodeError):
-            json_rpc_error = JSONParseError()
-        elif isinstance(e, ValidationError):
-            json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
-        else:
-            logger.error(f'Unhandled exception: {e}')
-            json_rpc_error = InternalError()
+    async def _process_batch(self, batch: list[Any]) -> Response:
+        """Dispatches a JSON-RPC batch concurrently and answers with an array."""
+        if not batch:
+            return self._error_response(None, InvalidRequestError())
 
-        response = JSONRPCResponse(id=None, error=json_rpc_error)
-        return JSONResponse(
-            response.model_dump(exclude_none=True), status_code=400
+        responses = await asyncio.gather(
+            *(self._process_batch_item(item) for item in batch)
+        )
+        return Response(
+            b'[' + b','.join(map(self.codec.encode, responses)) + b']',
+            media_type=self.codec.media_type,
         )
 
-    def _create_response(
-        self, result: Any
-    ) -> JSONResponse | EventSourceResponse:
-        if isinstance(result, AsyncIterable):
+    async def _process_batch_item(self, item: Any) -> JSONRPCResponse:
+        request_id = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(request_id, int | str):
+            request_id = None
+        try:
+            method = item.get('method') if isinstance(item, dict) else None
+            if not isinstance(method, str):
+                return JSONRPCResponse(id=None, error=InvalidRequestError())
+
+            entry = self._methods.get(method)
+            if entry is None:
+                return JSONRPCResponse(
+                    id=request_id, error=MethodNotFoundError()
+                )
 
-            async def event_generator(result) -> AsyncIterable[dict[str, str]]:
-                async for item in result:
-                    yield {'data': item.model_dump_json(exclude_none=True)}
+            adapter, handler, streaming = entry
+            if streaming:
+                return JSONRPCResponse(
+                    id=request_id,
+                    error=InvalidRequestError(
+                        message=f'{method} cannot be used in a batch request'
+                    ),
+                )
+
+            result = await self._dispatch(
+                method, handler, adapter.validate_python(item)
+            )
+            if not isinstance(result, JSONRPCResponse):
+                raise ValueError(f'Unexpected result type: {type(result)}')
+            return result
+
+        except Exception as e:
+            return JSONRPCResponse(
+                id=request_id, error=self._error_for_exception(e)
+            )
+
+    def _handle_exception(self, e: Exception) -> Response:
+        return self._error_response(None, self._error_for_exception(e))
+
+    def _error_for_exception(self, e: Exception) -> JSONRPCError:
+        if is_json_error(e):
+            return JSONParseError()
+        if isinstance(e, OverloadedError):
+            return ServerBusyError(data={'retryAfter': e.retry_after})
+        if isinstance(e, ValidationError):
+            return InvalidRequestError(data=json.loads(e.json()))
+        if isinstance(e, SchemaValidationError):
+            return InvalidRequestError(data=e.errors())
+        logger.error(f'Unhandled exception: {e}')
+        return InternalError()
+
+    def _error_response(self, request_id: Any, error: JSONRPCError) -> Response:
+        response = JSONRPCResponse(id=request_id, error=error)
+        return self._json_response(response, status_code=400)
+
+    def _busy_response(self, request_id: Any, e: OverloadedError) -> Response:
+        response = JSONRPCResponse(
+            id=request_id, error=self._error_for_exception(e)
+        )
+        return self._json_response(
+            response,
+            status_code=503,
+            headers={'Retry-After': str(e.retry_after)},
+        )
+
+    def _json_response(
+        self,
+        result: JSONRPCResponse,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        return Response(
+            self.codec.encode(result),
+            status_code=status_code,
+            headers=headers,
+            media_type=self.codec.media_type,
+        )
+
+    def _encode_stream_item(self, item: Any) -> bytes:
+        """Encodes a streamed response, serializing its event only once.
 
-            return EventSourceResponse(event_generator(result))
+        Task managers broadcast the same event object to every subscriber
+        of a task. Its JSON is cached on the event, and per subscriber only
+        the envelope carrying that subscriber's request id is encoded.
+        Events must not be modified once they have been streamed.
+        """
+        if type(item) is not SendTaskStreamingResponse or item.result is None:
+            return self.codec.encode(item)
+        event = item.result
+        encoded = event._json
+        if encoded is None:
+            encoded = event._json = self.codec.encode(event)
+        if item.id is None:
+            return b'{"jsonrpc":"2.0","result":%b}' % encoded
+        return b'{"jsonrpc":"2.0","id":%b,"result":%b}' % (
+            self.codec.dumps(item.id),
+            encoded,
+        )
+
+    def _create_response(self, result: Any) -> Response:
+        if isinstance(result, AsyncIterable):
+            stream = EventStream(
+                result,
+                self._encode_stream_item,
+                heartbeat_interval=self.sse_heartbeat_interval,
+            )
+            self.sse_streams.add(stream)
+            return SSEResponse(stream)
         if isinstance(result, JSONRPCResponse):
-            return JSONResponse(result.model_dump(exclude_none=True))
+            return self._json_response(result)
         logger.error(f'Unexpected result type: {type(result)}')
         raise ValueError(f'Unexpected result type: {type(result)}')
+
+
+def _resume_from_last_event_id(
+    json_rpc_request: TaskResubscriptionRequest, request: Request
+):
+    """Passes a Last-Event-ID header on to the task manager as metadata."""
+    last_event_id = request.headers.get('last-event-id')
+    if last_event_id is None:
+        return
+    params = json_rpc_request.params
+    metadata = dict(params.metadata or {})
+    metadata.setdefault('lastEventId', last_event_id)
+    params.metadata = metadata
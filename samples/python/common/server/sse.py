@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import Any
+
+from starlette.responses import StreamingResponse
+
+
+_END = object()
+
+
+class SSEStats:
+    """Counters for one SSE stream."""
+
+    __slots__ = (
+        'bytes',
+        'events',
+        'flush_latency_max',
+        'flush_latency_total',
+        'flushes',
+        'heartbeats',
+    )
+
+    def __init__(self):
+        self.events = 0
+        self.bytes = 0
+        self.flushes = 0
+        self.heartbeats = 0
+        self.flush_latency_total = 0.0
+        self.flush_latency_max = 0.0
+
+    @property
+    def flush_latency_avg(self) -> float:
+        return self.flush_latency_total / self.flushes if self.flushes else 0.0
+
+
+class EventStream:
+    """Turns an async iterable of items into Server-Sent Events frames.
+
+    Every event gets a monotonically increasing `id:`; items that carry an
+    `_event_id`, such as task events replayable through tasks/resubscribe,
+    use it so that clients can resume from Last-Event-ID. A comment line is
+    sent whenever the source stays quiet for heartbeat_interval seconds, so
+    idle connections are not cut by proxies. Events that are ready at the
+    same time are coalesced into a single write of at most max_batch frames.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[Any],
+        encode: Callable[[Any], bytes],
+        heartbeat_interval: float | None = 15.0,
+        max_batch: int = 64,
+        max_pending: int = 256,
+    ):
+        self.source = source
+        self.encode = encode
+        self.heartbeat_interval = heartbeat_interval
+        self.max_batch = max_batch
+        self.stats = SSEStats()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._next_id = 1
+
+    def frame(self, item: Any) -> bytes:
+        payload = self.encode(item)
+        if b'\n' in payload:
+            payload = b'\ndata: '.join(payload.splitlines())
+        event_id = getattr(item, '_event_id', None)
+        if event_id is None:
+            event_id = self._next_id
+        self._next_id = event_id + 1
+        return b'id: %d\ndata: %b\n\n' % (event_id, payload)
+
+    async def _produce(self):
+        try:
+            async for item in self.source:
+                await self._queue.put((self.frame(item), time.perf_counter()))
+        except Exception as e:
+            await self._queue.put(e)
+        else:
+            await self._queue.put(_END)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        producer = asyncio.create_task(self._produce())
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(self.heartbeat_interval):
+                        entry = await self._queue.get()
+                except TimeoutError:
+                    self.stats.heartbeats += 1
+                    yield b': ping\n\n'
+                    continue
+
+                frames = []
+                oldest = None
+                done = False
+                error = None
+                while True:
+                    if entry is _END:
+                        done = True
+                        break
+                    if isinstance(entry, Exception):
+                        error = entry
+                        break
+                    frame, enqueued_at = entry
+                    frames.append(frame)
+                    if oldest is None:
+                        oldest = enqueued_at
+                    if len(frames) >= self.max_batch or self._queue.empty():
+                        break
+                    entry = self._queue.get_nowait()
+
+                if frames:
+                    chunk = b''.join(frames)
+                    yield chunk
+                    latency = time.perf_counter() - oldest
+                    stats = self.stats
+                    stats.events += len(frames)
+                    stats.bytes += len(chunk)
+                    stats.flushes += 1
+                    stats.flush_latency_total += latency
+                    stats.flush_latency_max = max(
+                        stats.flush_latency_max, latency
+                    )
+                if error is not None:
+                    raise error
+                if done:
+                    return
+        finally:
+            producer.cancel()
+
+
+class SSEResponse(StreamingResponse):
+    """Streaming response that sends an EventStream as text/event-stream."""
+
+    def __init__(self, stream: EventStream, headers: dict | None = None):
+        super().__init__(
+            stream,
+            media_type='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
+                **(headers or {}),
+            },
+        )
+        self.stream = stream
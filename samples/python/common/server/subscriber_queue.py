@@ -0,0 +1,110 @@
+import asyncio
+
+from enum import Enum
+from typing import Any
+
+from common.types import InternalError, TaskStatusUpdateEvent
+
+
+class OverflowPolicy(str, Enum):
+    """What a full subscriber queue does with a new event.
+
+    DROP_OLDEST drops the oldest queued intermediate status update.
+    COALESCE replaces the newest queued status update when the new event is
+    a status update of the same task, keeping only the latest state.
+    DISCONNECT ends the stream of the subscriber with an error.
+
+    Artifact updates, final status updates and errors are never dropped or
+    coalesced; when there is nothing else left to give up, DROP_OLDEST and
+    COALESCE fall back to disconnecting the subscriber.
+    """
+
+    DROP_OLDEST = 'drop_oldest'
+    COALESCE = 'coalesce'
+    DISCONNECT = 'disconnect'
+
+
+class SubscriberStats:
+    """Overflow counters shared by the subscriber queues of a task manager."""
+
+    __slots__ = ('coalesced', 'disconnected', 'dropped')
+
+    def __init__(self):
+        self.dropped = 0
+        self.coalesced = 0
+        self.disconnected = 0
+
+
+def _is_droppable(entry: tuple[int | None, Any]) -> bool:
+    event = entry[1]
+    return isinstance(event, TaskStatusUpdateEvent) and not event.final
+
+
+class SubscriberQueue(asyncio.Queue):
+    """Event queue of one SSE subscriber, bounded by max_events.
+
+    Items are (sequence number, event) pairs. Producers call offer(), which
+    never blocks: once the queue is full the policy decides what gives.
+    After a disconnect the queue only holds an error event that ends the
+    stream, and further offers are ignored.
+    """
+
+    def __init__(
+        self,
+        max_events: int | None = 256,
+        policy: OverflowPolicy = OverflowPolicy.COALESCE,
+        stats: SubscriberStats | None = None,
+    ):
+        super().__init__()
+        self.max_events = max_events
+        self.policy = OverflowPolicy(policy)
+        self.stats = stats or SubscriberStats()
+        self.disconnected = False
+
+    def offer(self, event: Any, seq: int | None = None) -> bool:
+        """Queues event; returns False if the subscriber is disconnected."""
+        if self.disconnected:
+            return False
+        entry = (seq, event)
+        if self.max_events is None or self.qsize() < self.max_events:
+            self.put_nowait(entry)
+            return True
+
+        if self.policy == OverflowPolicy.COALESCE and self._coalesce(entry):
+            return True
+        if self.policy == OverflowPolicy.DROP_OLDEST:
+            if self._drop_oldest():
+                self.put_nowait(entry)
+                return True
+            if _is_droppable(entry):
+                self.stats.dropped += 1
+                return True
+        self.disconnect()
+        return False
+
+    def disconnect(self):
+        """Discards queued events and ends the stream with an error."""
+        self.disconnected = True
+        self.stats.disconnected += 1
+        self._queue.clear()
+        self.put_nowait(
+            (None, InternalError(message='SSE subscriber fell too far behind'))
+        )
+
+    def _coalesce(self, entry: tuple[int | None, Any]) -> bool:
+        if not (_is_droppable(entry) and self._queue):
+            return False
+        last = self._queue[-1]
+        if not _is_droppable(last) or last[1].id != entry[1].id:
+            return False
+        self._queue[-1] = entry
+        self.stats.coalesced += 1
+        return True
+
+    def _drop_oldest(self) -> bool:
+        for index, queued in enumerate(self._queue):
+            if _is_droppable(queued):
+                del self._queue[index]
+                self.stats.dropped += 1
+                return True
+        return False
@@ -0,0 +1,150 @@
+import time
+
+from bisect import bisect_left, bisect_right
+
+from common.types import Task, TaskState
+
+
+# Task id -> (update sequence number, session id, state).
+_Entry = tuple[int, str | None, TaskState]
+
+
+class _Postings:
+    """Update sequence numbers of the tasks sharing one key, oldest first.
+
+    A task that is updated again gets a new sequence number appended at the
+    end; the old one turns stale and stays until the list is compacted.
+    """
+
+    __slots__ = ('seqs', 'stale', 'times')
+
+    def __init__(self):
+        self.seqs: list[int] = []
+        self.times: list[float] = []
+        self.stale = 0
+
+    def append(self, seq: int, updated_at: float):
+        self.seqs.append(seq)
+        self.times.append(updated_at)
+
+    def retire(self, live: dict[int, str]) -> bool:
+        """Counts one stale entry; returns False once the list is empty."""
+        self.stale += 1
+        if self.stale * 2 > len(self.seqs):
+            kept = [i for i, seq in enumerate(self.seqs) if seq in live]
+            self.seqs = [self.seqs[i] for i in kept]
+            self.times = [self.times[i] for i in kept]
+            self.stale = 0
+        return bool(self.seqs)
+
+
+class TaskIndex:
+    """Secondary indexes over the tasks of a task manager.
+
+    Tasks are indexed by session id and by state, each index keeping the
+    tasks in the order of their last update, so listing the tasks of a
+    session or in a state costs about as much as the page returned, however
+    many tasks there are overall. Every update of a task moves it to the
+    front and leaves a stale entry behind; an index list is compacted once
+    more than half of it is stale, which keeps updates amortized O(1).
+
+    Pages are cut at update sequence numbers. A task updated while a client
+    pages through the results moves ahead of the pages already fetched, so
+    it shows up in none of the later ones rather than twice.
+    """
+
+    def __init__(self):
+        self._next_seq = 1
+        self._last_update = 0.0
+        self._entries: dict[str, _Entry] = {}
+        self._task_ids: dict[int, str] = {}
+        self._all = _Postings()
+        self._sessions: dict[str, _Postings] = {}
+        self._states: dict[TaskState, _Postings] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, task: Task):
+        """Records that task was created or updated just now."""
+        # Never goes backwards, so every index list stays sorted by time.
+        updated_at = max(time.time(), self._last_update)
+        self._last_update = updated_at
+        self.remove(task.id)
+        seq = self._next_seq
+        self._next_seq += 1
+        entry = (seq, task.sessionId, task.status.state)
+        self._entries[task.id] = entry
+        self._task_ids[seq] = task.id
+        self._all.append(seq, updated_at)
+        self._states.setdefault(entry[2], _Postings()).append(seq, updated_at)
+        if entry[1] is not None:
+            self._sessions.setdefault(entry[1], _Postings()).append(
+                seq, updated_at
+            )
+
+    def remove(self, task_id: str):
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return
+        seq, session_id, state = entry
+        del self._task_ids[seq]
+        self._all.retire(self._task_ids)
+        if not self._states[state].retire(self._task_ids):
+            del self._states[state]
+        if session_id is not None:
+            if not self._sessions[session_id].retire(self._task_ids):
+                del self._sessions[session_id]
+
+    def query(
+        self,
+        session_id: str | None = None,
+        state: TaskState | None = None,
+        updated_after: float | None = None,
+        updated_before: float | None = None,
+        before_seq: int | None = None,
+        limit: int = 50,
+    ) -> tuple[list[str], int | None]:
+        """Returns the ids of matching tasks, most recently updated first.
+
+        Only tasks last updated strictly between updated_after and
+        updated_before, and before the update numbered before_seq, are
+        considered. At most limit ids are returned, along with the
+        before_seq that fetches the next page, or None on the last page.
+        """
+        candidates = [self._all]
+        if session_id is not None:
+            candidates.append(self._sessions.get(session_id))
+        if state is not None:
+            candidates.append(self._states.get(state))
+        if None in candidates:
+            return [], None
+        # Walk the shortest list and check the other filters per task.
+        postings = min(candidates, key=lambda p: len(p.seqs))
+
+        seqs, times = postings.seqs, postings.times
+        hi = len(seqs)
+        if before_seq is not None:
+            hi = bisect_left(seqs, before_seq)
+        if updated_before is not None:
+            hi = bisect_left(times, updated_before, hi=hi)
+        lo = 0
+        if updated_after is not None:
+            lo = bisect_right(times, updated_after, hi=hi)
+
+        task_ids: list[str] = []
+        last_seq = None
+        for i in range(hi - 1, lo - 1, -1):
+            task_id = self._task_ids.get(seqs[i])
+            if task_id is None:
+                continue
+            _, task_session_id, task_state = self._entries[task_id]
+            if (session_id is not None and task_session_id != session_id) or (
+                state is not None and task_state != state
+            ):
+                continue
+            if len(task_ids) == limit:
+                return task_ids, last_seq
+            task_ids.append(task_id)
+            last_seq = seqs[i]
+        return task_ids, None
@@ -1,9 +1,27 @@
 import asyncio
+import inspect
 import logging
 
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterable
-
+from collections.abc import AsyncIterable, Awaitable, Callable, MutableMapping
+from datetime import datetime
+from typing import TypeVar
+
+from common.server.dedup import SendDeduplicator, send_key
+from common.server.event_log import STREAM_END, TaskEventLog, last_event_id
+from common.server.retention import TERMINAL_STATES, TaskRetention
+from common.server.subscriber_queue import (
+    OverflowPolicy,
+    SubscriberQueue,
+    SubscriberStats,
+)
+from common.server.task_index import TaskIndex
+from common.server.task_store import (
+    InMemoryTaskStore,
+    SQLiteModelStore,
+    SQLiteTaskStore,
+    TaskStore,
+)
 from common.server.utils import new_not_implemented_error
 from common.types import (
     Artifact,
@@ -14,8 +32,11 @@ from common.types import (
     GetTaskRequest,
     GetTaskResponse,
     InternalError,
+    InvalidParamsError,
     JSONRPCError,
     JSONRPCResponse,
+    ListTasksRequest,
+    ListTasksResponse,
     PushNotificationConfig,
     SendTaskRequest,
     SendTaskResponse,
@@ -25,6 +46,7 @@ from common.types import (
     SetTaskPushNotificationResponse,
     Task,
     TaskIdParams,
+    TaskList,
     TaskNotCancelableError,
     TaskNotFoundError,
     TaskPushNotificationConfig,
@@ -35,10 +57,17 @@ from common.types import (
     TaskStatus,
     TaskStatusUpdateEvent,
 )
+from common.utils.blob_store import BlobStore
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+
+class TaskCanceledError(Exception):
+    """Raised by run_task() when tasks/cancel stopped the work."""
+
 
 class TaskManager(ABC):
     @abstractmethod
@@ -79,28 +108,125 @@ class TaskManager(ABC):
     ) -> AsyncIterable[SendTaskResponse] | JSONRPCResponse:
         pass
 
+    async def on_list_tasks(
+        self, request: ListTasksRequest
+    ) -> ListTasksResponse | JSONRPCResponse:
+        return new_not_implemented_error(request.id)
+
 
 class InMemoryTaskManager(TaskManager):
-    def __init__(self):
-        self.tasks: dict[str, Task] = {}
-        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+    """Task manager that keeps tasks in process memory by default.
+
+    Passing ``store_path`` moves tasks and push notification configs into a
+    SQLite database instead, so the workers of a multi-process A2AServer all
+    see the same state; any other TaskStore can be passed as ``task_store``,
+    such as a CompactTaskStore to hold long histories in less memory.
+    SSE subscribers always stay local to the process that serves the stream.
+
+    Operations on a task hold the lock returned by task_lock(), one of
+    lock_stripes locks picked by hashing the task id, so unrelated tasks do
+    not wait on each other. The global `lock` only guards adding and
+    removing entries of the task index and is always taken after a task
+    lock, never before.
+
+    Without a ``retention`` policy tasks are kept forever. With one,
+    expired and least recently used tasks are dropped together with their
+    push notification config and SSE subscriber list. Tasks with
+    subscribers or running work are not evicted to stay within budget.
+
+    Each SSE subscriber gets a queue of at most sse_queue_size events;
+    sse_overflow_policy decides what happens when a slow client lets it
+    fill up, and subscriber_stats counts the outcome. The subscribers of a
+    task are kept in a tuple that is replaced, never mutated, when someone
+    joins or leaves, and events are delivered without awaiting, so fan-out
+    needs no lock and never waits on a slow or departing subscriber.
+
+    Every event passed to enqueue_events_for_sse is also appended to a
+    per-task TaskEventLog of up to event_log_size events, which lets
+    tasks/resubscribe replay what a client missed before attaching it to
+    the live stream. Streams handed to stream_task_events() run in the
+    background, so a dropped connection does not stop the task. Clients
+    resubscribing to a task that is not streamed get its final status
+    from update_store() if its runner is local, and its current status
+    right away otherwise.
+
+    The asyncio tasks doing the work of an A2A task, the stream producers
+    and whatever runs through run_task(), are registered under its id, so
+    tasks/cancel can stop them; tasks without a running one are not
+    cancelable.
+
+    tasks/list is answered from a TaskIndex kept up to date by retain(),
+    which covers the tasks this process has created or updated.
+
+    With a ``blob_store``, file content sent inline in messages and
+    artifacts is moved into the store before it reaches the task, which
+    then only holds blob uris.
+
+    Subclasses that route tasks/send through deduplicate_send() run a
+    retried request only once when given a ``send_dedup`` policy.
+    """
+
+    def __init__(
+        self,
+        store_path: str | None = None,
+        lock_stripes: int = 64,
+        task_store: TaskStore | None = None,
+        retention: TaskRetention | None = None,
+        sse_queue_size: int | None = 256,
+        sse_overflow_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+        event_log_size: int = 1000,
+        send_dedup: SendDeduplicator | None = None,
+        blob_store: BlobStore | None = None,
+    ):
+        self.tasks: TaskStore
+        self.push_notification_infos: MutableMapping[
+            str, PushNotificationConfig
+        ]
+        if store_path is None:
+            self.tasks = task_store or InMemoryTaskStore()
+            self.push_notification_infos = {}
+        else:
+            self.tasks = task_store or SQLiteTaskStore(store_path)
+            self.push_notification_infos = SQLiteModelStore(
+                store_path, 'push_notification_infos', PushNotificationConfig
+            )
         self.lock = asyncio.Lock()
-        self.task_sse_subscribers: dict[str, list[asyncio.Queue]] = {}
-        self.subscriber_lock = asyncio.Lock()
+        self._task_locks = [asyncio.Lock() for _ in range(lock_stripes)]
+        self.task_sse_subscribers: dict[str, tuple[SubscriberQueue, ...]] = {}
+        self.sse_queue_size = sse_queue_size
+        self.sse_overflow_policy = OverflowPolicy(sse_overflow_policy)
+        self.subscriber_stats = SubscriberStats()
+        self.event_log_size = event_log_size
+        self.event_logs: dict[str, TaskEventLog] = {}
+        self._runners: dict[str, asyncio.Task] = {}
+        self._archivers: set[asyncio.Task] = set()
+        self.send_dedup = send_dedup
+        self.retention = retention
+        self.task_index = TaskIndex()
+        self.blob_store = blob_store
+
+    def task_lock(self, task_id: str) -> asyncio.Lock:
+        """Returns the lock that serializes updates to task_id."""
+        return self._task_locks[hash(task_id) % len(self._task_locks)]
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f'Getting task {request.params.id}')
         task_query_params: TaskQueryParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_query_params.id)
-            if task is None:
-                return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+        if self.retention is not None:
+            if self.retention.has_expired():
+                await self.evict_tasks()
+            self.retention.touch(task_query_params.id)
 
-            task_result = self.append_task_history(
-                task, task_query_params.historyLength
-            )
+        # Nothing awaits between the lookup and the copy, so no update can
+        # interleave and no lock is needed.
+        task = self.tasks.get(task_query_params.id)
+        if task is None:
+            return GetTaskResponse(id=request.id, error=TaskNotFoundError())
 
+        task_result = self.append_task_history(
+            task, task_query_params.historyLength
+        )
         return GetTaskResponse(id=request.id, result=task_result)
 
     async def on_cancel_task(
@@ -108,15 +234,145 @@ class InMemoryTaskManager(TaskManager):
     ) -> CancelTaskResponse:
         logger.info(f'Cancelling task {request.params.id}')
         task_id_params: TaskIdParams = request.params
+        task_id = task_id_params.id
 
-        async with self.lock:
-            task = self.tasks.get(task_id_params.id)
+        async with self.task_lock(task_id):
+            # Checked under the lock, so the runner cannot finish the task
+            # between the check and the update.
+            task = self.tasks.get(task_id)
             if task is None:
                 return CancelTaskResponse(
                     id=request.id, error=TaskNotFoundError()
                 )
 
-        return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+            runner = self._runners.get(task_id)
+            if (
+                runner is None
+                or runner.done()
+                or task.status.state in TERMINAL_STATES
+            ):
+                return CancelTaskResponse(
+                    id=request.id, error=TaskNotCancelableError()
+                )
+
+            status = TaskStatus(state=TaskState.CANCELED)
+            task = self.tasks.update_task(task_id, status, None)
+            await self.enqueue_events_for_sse(
+                task_id,
+                TaskStatusUpdateEvent(id=task_id, status=status, final=True),
+            )
+            # Nothing awaited since the final event was published, so the
+            # runner cannot have published anything after it.
+            runner.cancel()
+
+        await self.retain(task)
+        return CancelTaskResponse(id=request.id, result=task)
+
+    async def on_list_tasks(
+        self, request: ListTasksRequest
+    ) -> ListTasksResponse:
+        params = request.params
+        filters = {
+            'session_id': params.sessionId,
+            'state': params.state,
+            'updated_after': _timestamp(params.updatedAfter),
+            'updated_before': _timestamp(params.updatedBefore),
+            'limit': params.pageSize,
+        }
+        # Stores shared between processes list what every process wrote;
+        # the task index only knows the tasks this process has updated.
+        query_tasks = getattr(self.tasks, 'query_tasks', None)
+        try:
+            if query_tasks is not None:
+                task_ids, next_cursor = query_tasks(
+                    cursor=params.cursor, **filters
+                )
+            else:
+                before_seq = int(params.cursor) if params.cursor else None
+                task_ids, next_seq = self.task_index.query(
+                    before_seq=before_seq, **filters
+                )
+                next_cursor = str(next_seq) if next_seq is not None else None
+        except ValueError:
+            return ListTasksResponse(
+                id=request.id, error=InvalidParamsError(message='Bad cursor')
+            )
+        tasks = []
+        for task_id in task_ids:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                tasks.append(
+                    self.append_task_history(task, params.historyLength)
+                )
+        return ListTasksResponse(
+            id=request.id, result=TaskList(tasks=tasks, nextCursor=next_cursor)
+        )
+
+    async def deduplicate_send(
+        self,
+        request: SendTaskRequest,
+        handle: Callable[[SendTaskRequest], Awaitable[SendTaskResponse]],
+    ) -> SendTaskResponse:
+        """Answers request with handle(), unless it repeats a recent one.
+
+        A retry of a tasks/send that is still running waits for its
+        response, and a retry of one that already succeeded gets the
+        stored response, both under the retry's own request id. Stored
+        responses only answer while the task is where they left it, and
+        responses asking for input are not stored: sending the same reply
+        again is then the next turn, not a retry.
+        """
+        if self.send_dedup is None:
+            return await handle(request)
+
+        task_id = request.params.id
+
+        def position() -> int | None:
+            task = self.tasks.get(task_id)
+            return None if task is None else len(task.history or ())
+
+        async def send() -> tuple[SendTaskResponse, int | None]:
+            response = await handle(request)
+            return response, position()
+
+        key = send_key(request.params)
+        response, _ = await self.send_dedup.run(
+            key, send, current=lambda stored: stored[1] == position()
+        )
+        if response.error is not None or (
+            response.result is not None
+            and response.result.status.state == TaskState.INPUT_REQUIRED
+        ):
+            self.send_dedup.forget(key)
+        if response.id != request.id:
+            response = response.model_copy(update={'id': request.id})
+        return response
+
+    def _register_runner(self, task_id: str, runner: asyncio.Task):
+        self._runners[task_id] = runner
+
+        def unregister(_):
+            if self._runners.get(task_id) is runner:
+                del self._runners[task_id]
+
+        runner.add_done_callback(unregister)
+
+    async def run_task(self, task_id: str, work: Awaitable[T]) -> T:
+        """Awaits work as the runner of task_id, so tasks/cancel can stop it.
+
+        Cancelling the task cancels work wherever it is waiting, including
+        in-flight HTTP requests made with async clients. Raises
+        TaskCanceledError in that case.
+        """
+        runner = asyncio.ensure_future(work)
+        self._register_runner(task_id, runner)
+        try:
+            return await runner
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if runner.cancelled() and not current.cancelling():
+                raise TaskCanceledError(task_id) from None
+            raise
 
     @abstractmethod
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
@@ -131,9 +387,8 @@ class InMemoryTaskManager(TaskManager):
     async def set_push_notification_info(
         self, task_id: str, notification_config: PushNotificationConfig
     ):
-        async with self.lock:
-            task = self.tasks.get(task_id)
-            if task is None:
+        async with self.task_lock(task_id):
+            if task_id not in self.tasks:
                 raise ValueError(f'Task not found for {task_id}')
 
             self.push_notification_infos[task_id] = notification_config
@@ -141,18 +396,14 @@ class InMemoryTaskManager(TaskManager):
     async def get_push_notification_info(
         self, task_id: str
     ) -> PushNotificationConfig:
-        async with self.lock:
-            task = self.tasks.get(task_id)
-            if task is None:
+        async with self.task_lock(task_id):
+            if task_id not in self.tasks:
                 raise ValueError(f'Task not found for {task_id}')
 
             return self.push_notification_infos[task_id]
 
-    
-
     async def has_push_notification_info(self, task_id: str) -> bool:
-        async with self.lock:
-            return task_id in self.push_notification_infos
+        return task_id in self.push_notification_infos
 
     async def on_set_task_push_notification(
         self, request: SetTaskPushNotificationRequest
@@ -206,7 +457,9 @@ class InMemoryTaskManager(TaskManager):
 
     async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
         logger.info(f'Upserting task {task_send_params.id}')
-        async with self.lock:
+        if self.blob_store is not None:
+            self.blob_store.externalize(task_send_params.message.parts)
+        async with self.task_lock(task_send_params.id):
             task = self.tasks.get(task_send_params.id)
             if task is None:
                 task = Task(
@@ -216,84 +469,284 @@ class InMemoryTaskManager(TaskManager):
                     status=TaskStatus(state=TaskState.SUBMITTED),
                     history=[task_send_params.message],
                 )
-                self.tasks[task_send_params.id] = task
+                async with self.lock:
+                    self.tasks.upsert(task)
             else:
-                task.history.append(task_send_params.message)
+                task = self.tasks.append_history(
+                    task_send_params.id, task_send_params.message
+                )
 
-            return task
+        await self.retain(task)
+        return task
 
     async def on_resubscribe_to_task(
         self, request: TaskResubscriptionRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        return new_not_implemented_error(request.id)
+        """Replays the events after `lastEventId`, then follows the stream.
+
+        The client passes the id of the last SSE event it received as
+        `lastEventId` in the request metadata (the server fills it in from
+        a Last-Event-ID header). Without one, every logged event is
+        replayed.
+        """
+        task_id = request.params.id
+        logger.info(f'Resubscribing to task {task_id}')
+        task = self.tasks.get(task_id)
+        if task is None:
+            return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+
+        since = last_event_id(request.params.metadata)
+        sse_event_queue = self._new_subscriber_queue()
+        # Nothing below awaits, so no event can be published between the
+        # replay and attaching to the live stream.
+        log = self.event_logs.get(task_id)
+        if log is not None:
+            for entry in log.since(since):
+                sse_event_queue.put_nowait(entry)
+        final = task.status.state in TERMINAL_STATES
+        if log is not None and (log.final or log.closed):
+            sse_event_queue.put_nowait((None, STREAM_END))
+        elif log is None and (final or task_id not in self._runners):
+            # Nothing streams this task here, and without a local runner,
+            # say on another worker, no update will reach this process;
+            # report where the task stands.
+            event = TaskStatusUpdateEvent(
+                id=task_id, status=task.status, final=final
+            )
+            sse_event_queue.put_nowait((None, event))
+            sse_event_queue.put_nowait((None, STREAM_END))
+        else:
+            # Streamed tasks publish their events; update_store() ends
+            # the subscription of the others when they finish.
+            self._subscribe(task_id, sse_event_queue)
+
+        return self.dequeue_events_for_sse(request.id, task_id, sse_event_queue)
+
+    async def stream_task_events(
+        self,
+        request_id,
+        task_id: str,
+        events: AsyncIterable[SendTaskStreamingResponse | JSONRPCResponse],
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        """Runs a task's response stream in the background.
+
+        The responses from events are published through
+        enqueue_events_for_sse, and the returned stream follows them like
+        any other subscriber. Closing it, for instance because the client
+        disconnected, leaves the task running; the client can come back
+        with tasks/resubscribe.
+        """
+        sse_event_queue = await self.setup_sse_consumer(task_id)
+        log = self.event_logs.get(task_id)
+        if log is None:
+            # Marks the task as streamed before its first event.
+            self.event_logs[task_id] = TaskEventLog(self.event_log_size)
+        else:
+            # Resubscribers follow this stream, not the end of the last one.
+            log.open()
+        producer = asyncio.create_task(self._publish(task_id, events))
+        self._register_runner(task_id, producer)
+        return self.dequeue_events_for_sse(request_id, task_id, sse_event_queue)
+
+    async def _publish(
+        self,
+        task_id: str,
+        events: AsyncIterable[SendTaskStreamingResponse | JSONRPCResponse],
+    ):
+        try:
+            async for response in events:
+                event = response.error or response.result
+                if event is not None:
+                    await self.enqueue_events_for_sse(task_id, event)
+        except Exception as e:
+            logger.error(f'Error while streaming task {task_id}: {e}')
+            await self.enqueue_events_for_sse(
+                task_id,
+                InternalError(
+                    message='An error occurred while streaming the response'
+                ),
+            )
+        finally:
+            log = self.event_logs.get(task_id)
+            if log is not None:
+                log.close()
+            for subscriber in self.task_sse_subscribers.get(task_id, ()):
+                subscriber.offer(STREAM_END)
 
     async def update_store(
         self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
     ) -> Task:
-        async with self.lock:
+        if self.blob_store is not None:
+            if status.message is not None:
+                self.blob_store.externalize(status.message.parts)
+            for artifact in artifacts or ():
+                self.blob_store.externalize(artifact.parts)
+        async with self.task_lock(task_id):
             try:
-                task = self.tasks[task_id]
+                task = self.tasks.update_task(task_id, status, artifacts)
             except KeyError:
                 logger.error(f'Task {task_id} not found for updating the task')
                 raise ValueError(f'Task {task_id} not found')
 
-            task.status = status
-
             if status.message is not None:
-                task.history.append(status.message)
-
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
+                task = self.tasks.append_history(task_id, status.message)
 
-            return task
+        if status.state in TERMINAL_STATES and task_id not in self.event_logs:
+            # Nothing streams this task, so tell its subscribers, such as
+            # clients of tasks/resubscribe, how it ended.
+            event = TaskStatusUpdateEvent(
+                id=task_id, status=task.status, final=True
+            )
+            for subscriber in self.task_sse_subscribers.get(task_id, ()):
+                subscriber.offer(event)
+        await self.retain(task)
+        return task
+
+    async def retain(self, task: Task):
+        """Records an update of task in the task index and retention policy.
+
+        Tasks that no longer fit the retention policy, if any, are evicted
+        right away. Subclasses that update self.tasks directly should call
+        this after every update.
+        """
+        self.task_index.update(task)
+        if self.retention is None:
+            return
+        self.retention.track(task)
+        if self.retention.over_budget() or self.retention.has_expired():
+            await self.evict_tasks()
+
+    async def evict_tasks(self) -> list[str]:
+        """Drops the tasks that fall outside the retention policy.
+
+        Returns the ids of the evicted tasks. They are handed to the
+        archive of the policy in the background; wait_archived() waits for
+        that to finish.
+        """
+        if self.retention is None:
+            return []
+        evicted = []
+        busy = self.task_sse_subscribers.keys() | self._runners.keys()
+        async with self.lock:
+            for task_id in self.retention.due(busy):
+                self.retention.forget(task_id)
+                self.task_index.remove(task_id)
+                task = self.tasks.pop(task_id, None)
+                self.push_notification_infos.pop(task_id, None)
+                self.task_sse_subscribers.pop(task_id, None)
+                self.event_logs.pop(task_id, None)
+                evicted.append((task_id, task))
+        archived = [task for _, task in evicted if task is not None]
+        if archived and self.retention.archive is not None:
+            # Archives may do I/O; task creation must not wait for them.
+            archiver = asyncio.create_task(self._archive(archived))
+            self._archivers.add(archiver)
+            archiver.add_done_callback(self._archivers.discard)
+        return [task_id for task_id, _ in evicted]
+
+    async def wait_archived(self):
+        """Waits until the tasks evicted so far have been archived."""
+        while self._archivers:
+            await asyncio.gather(*self._archivers)
+
+    async def _archive(self, tasks: list[Task]):
+        for task in tasks:
+            try:
+                result = self.retention.archive(task)
+                if inspect.isawaitable(result):
+                    await result
+                self.retention.archived += 1
+            except Exception as e:
+                self.retention.archive_errors += 1
+                logger.error(f'Error while archiving task {task.id}: {e}')
 
     def append_task_history(self, task: Task, historyLength: int | None):
-        new_task = task.model_copy()
-        if historyLength is not None and historyLength > 0:
-            new_task.history = new_task.history[-historyLength:]
-        else:
-            new_task.history = []
-
-        return new_task
+        """Returns task with only the last historyLength history messages.
+
+        An omitted historyLength keeps the whole history and 0 drops it.
+        The stored task is never modified: it is returned as is when
+        nothing has to be trimmed, otherwise a shallow copy carries the
+        trimmed list, so the cost depends on historyLength only and not on
+        how long the history has grown.
+        """
+        history = task.history
+        if historyLength is None or not history:
+            return task
+        if historyLength <= 0:
+            return task.model_copy(update={'history': []})
+        if historyLength >= len(history):
+            return task
+        return task.model_copy(update={'history': history[-historyLength:]})
 
     async def setup_sse_consumer(
         self, task_id: str, is_resubscribe: bool = False
     ):
-        async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                if is_resubscribe:
-                    raise ValueError('Task not found for resubscription')
-                self.task_sse_subscribers[task_id] = []
+        if is_resubscribe and task_id not in self.task_sse_subscribers:
+            raise ValueError('Task not found for resubscription')
+
+        sse_event_queue = self._new_subscriber_queue()
+        self._subscribe(task_id, sse_event_queue)
+        return sse_event_queue
+
+    def _new_subscriber_queue(self) -> SubscriberQueue:
+        return SubscriberQueue(
+            self.sse_queue_size,
+            self.sse_overflow_policy,
+            self.subscriber_stats,
+        )
 
-            sse_event_queue = asyncio.Queue(maxsize=0)  # <=0 is unlimited
-            self.task_sse_subscribers[task_id].append(sse_event_queue)
-            return sse_event_queue
+    def _subscribe(self, task_id: str, sse_event_queue: SubscriberQueue):
+        subscribers = self.task_sse_subscribers.get(task_id, ())
+        self.task_sse_subscribers[task_id] = (*subscribers, sse_event_queue)
+
+    def _unsubscribe(self, task_id: str, sse_event_queue: SubscriberQueue):
+        subscribers = tuple(
+            subscriber
+            for subscriber in self.task_sse_subscribers.get(task_id, ())
+            if subscriber is not sse_event_queue
+        )
+        if subscribers:
+            self.task_sse_subscribers[task_id] = subscribers
+        else:
+            self.task_sse_subscribers.pop(task_id, None)
 
     async def enqueue_events_for_sse(self, task_id, task_update_event):
-        async with self.subscriber_lock:
-            if task_id not in self.task_sse_subscribers:
-                return
+        log = self.event_logs.get(task_id)
+        if log is None:
+            log = self.event_logs[task_id] = TaskEventLog(self.event_log_size)
+        seq = log.append(task_update_event)
 
-            current_subscribers = self.task_sse_subscribers[task_id]
-            for subscriber in current_subscribers:
-                await subscriber.put(task_update_event)
+        # A snapshot: subscribers joining or leaving replace the tuple.
+        for subscriber in self.task_sse_subscribers.get(task_id, ()):
+            if not subscriber.offer(task_update_event, seq):
+                # Its stream ends with the error already queued.
+                self._unsubscribe(task_id, subscriber)
 
     async def dequeue_events_for_sse(
-        self, request_id, task_id, sse_event_queue: asyncio.Queue
+        self, request_id, task_id, sse_event_queue: SubscriberQueue
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
         try:
             while True:
-                event = await sse_event_queue.get()
-                if isinstance(event, JSONRPCError):
-                    yield SendTaskStreamingResponse(id=request_id, error=event)
+                seq, event = await sse_event_queue.get()
+                if event is STREAM_END:
                     break
-
-                yield SendTaskStreamingResponse(id=request_id, result=event)
-                if isinstance(event, TaskStatusUpdateEvent) and event.final:
+                if isinstance(event, JSONRPCError):
+                    response = SendTaskStreamingResponse(
+                        id=request_id, error=event
+                    )
+                else:
+                    response = SendTaskStreamingResponse(
+                        id=request_id, result=event
+                    )
+                response._event_id = seq
+                yield response
+                if response.error is not None or (
+                    isinstance(event, TaskStatusUpdateEvent) and event.final
+                ):
                     break
         finally:
-            async with self.subscriber_lock:
-                if task_id in self.task_sse_subscribers:
-                    self.task_sse_subscribers[task_id].remove(sse_event_queue)
+            self._unsubscribe(task_id, sse_event_queue)
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    return value.timestamp() if value is not None else None
@@ -0,0 +1,734 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from abc import abstractmethod
+from collections import Counter, OrderedDict
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from common.types import Artifact, Message, Task, TaskState, TaskStatus
+from common.utils import trusted
+
+
+M = TypeVar('M', bound=BaseModel)
+
+
+class SQLiteModelStore(MutableMapping[str, M], Generic[M]):
+    """A dict-like view of a SQLite table that holds pydantic models as JSON.
+
+    The database runs in WAL mode so several worker processes of a pre-forked
+    A2AServer can read and write the same file. Each process opens its own
+    connection lazily, which makes it safe to build the store before forking.
+    """
+
+    def __init__(self, path: str, table: str, model: type[M]):
+        self.path = path
+        self.table = table
+        self.model = model
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._pid != pid:
+            conn = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} '
+                '(id TEXT PRIMARY KEY, data TEXT NOT NULL)'
+            )
+            conn.commit()
+            self._conn = conn
+            self._pid = pid
+        return self._conn
+
+    def __getitem__(self, key: str) -> M:
+        row = (
+            self._connection()
+            .execute(f'SELECT data FROM {self.table} WHERE id = ?', (key,))
+            .fetchone()
+        )
+        if row is None:
+            raise KeyError(key)
+        return self.model.model_validate_json(row[0])
+
+    def __setitem__(self, key: str, value: M) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (id, data) VALUES (?, ?)',
+                (key, value.model_dump_json()),
+            )
+
+    def __delitem__(self, key: str) -> None:
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                f'DELETE FROM {self.table} WHERE id = ?', (key,)
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        row = (
+            self._connection()
+            .execute(f'SELECT 1 FROM {self.table} WHERE id = ?', (key,))
+            .fetchone()
+        )
+        return row is not None
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._connection().execute(f'SELECT id FROM {self.table}')
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return (
+            self._connection()
+            .execute(f'SELECT COUNT(*) FROM {self.table}')
+            .fetchone()[0]
+        )
+
+    def count_by(self, json_path: str) -> dict[Any, int]:
+        """Counts the stored models grouped by the value at json_path."""
+        rows = self._connection().execute(
+            f'SELECT json_extract(data, ?), COUNT(*) FROM {self.table} '
+            'GROUP BY 1',
+            (json_path,),
+        )
+        return dict(rows.fetchall())
+
+
+class TaskStore(MutableMapping[str, Task]):
+    """Storage for the tasks of a task manager.
+
+    Besides the mapping interface, which reads and replaces whole tasks,
+    stores implement the mutations task managers need so that backends can
+    apply them without rewriting more than necessary. Mutations return the
+    updated task and raise KeyError for unknown ids.
+    """
+
+    @abstractmethod
+    def upsert(self, task: Task) -> None:
+        """Inserts task, replacing any stored task with the same id."""
+
+    @abstractmethod
+    def update_task(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        artifacts: list[Artifact] | None = None,
+    ) -> Task:
+        """Sets the status of a task and appends artifacts to it."""
+
+    @abstractmethod
+    def append_history(self, task_id: str, message: Message) -> Task:
+        """Appends a message to the history of a task."""
+
+    @abstractmethod
+    def list_tasks(
+        self, state: TaskState | None = None, session_id: str | None = None
+    ) -> list[Task]:
+        """Returns the stored tasks, optionally filtered."""
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        self.upsert(task)
+
+    def flush(self) -> None:
+        """Writes pending changes through to durable storage."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _apply_update(
+    task: Task, status: TaskStatus, artifacts: list[Artifact] | None
+) -> Task:
+    task.status = status
+    if artifacts is not None:
+        if task.artifacts is None:
+            task.artifacts = []
+        task.artifacts.extend(artifacts)
+    return task
+
+
+def _matches(task: Task, state: TaskState | None, session_id: str | None):
+    return (state is None or task.status.state == state) and (
+        session_id is None or task.sessionId == session_id
+    )
+
+
+class InMemoryTaskStore(TaskStore):
+    """Keeps tasks in a dict; the objects handed out are the stored ones."""
+
+    def __init__(self):
+        self._tasks: dict[str, Task] = {}
+
+    def __getitem__(self, task_id: str) -> Task:
+        return self._tasks[task_id]
+
+    def __delitem__(self, task_id: str) -> None:
+        del self._tasks[task_id]
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tasks)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def upsert(self, task: Task) -> None:
+        self._tasks[task.id] = task
+
+    def update_task(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        artifacts: list[Artifact] | None = None,
+    ) -> Task:
+        return _apply_update(self._tasks[task_id], status, artifacts)
+
+    def append_history(self, task_id: str, message: Message) -> Task:
+        task = self._tasks[task_id]
+        if task.history is None:
+            task.history = []
+        task.history.append(message)
+        return task
+
+    def list_tasks(
+        self, state: TaskState | None = None, session_id: str | None = None
+    ) -> list[Task]:
+        return [
+            task
+            for task in self._tasks.values()
+            if _matches(task, state, session_id)
+        ]
+
+
+_ROLES = ('user', 'agent')
+_ROLE_CODES = {role: code for code, role in enumerate(_ROLES)}
+
+
+def _compact_message(message: Message) -> str | Message:
+    """A message made of a single plain text part becomes just its text."""
+    if message.metadata is None and len(message.parts) == 1:
+        part = message.parts[0]
+        if part.type == 'text' and part.metadata is None:
+            return part.text
+    return message
+
+
+def _expand_message(role: int, entry: str | Message) -> Message:
+    if type(entry) is not str:
+        return entry
+    return trusted.message(
+        role=_ROLES[role], parts=[trusted.text_part(text=entry)]
+    )
+
+
+class _CompactTask:
+    """The state of a task without the per-object cost of pydantic models.
+
+    Roles are stored as one byte per message and text-only messages as
+    their text; other messages, artifacts and metadata are kept as given.
+    """
+
+    __slots__ = (
+        'id',
+        'session_id',
+        'state',
+        'timestamp',
+        'status_role',
+        'status_message',
+        'artifacts',
+        'roles',
+        'history',
+        'metadata',
+    )
+
+    def __init__(self, task: Task):
+        self.id = task.id
+        self.session_id = task.sessionId
+        self.metadata = task.metadata
+        self.artifacts = (
+            None if task.artifacts is None else list(task.artifacts)
+        )
+        self.roles = None
+        self.history = None
+        if task.history is not None:
+            self.roles = bytearray(
+                _ROLE_CODES[message.role] for message in task.history
+            )
+            self.history = [
+                _compact_message(message) for message in task.history
+            ]
+        self.set_status(task.status)
+
+    def set_status(self, status: TaskStatus):
+        self.state = status.state
+        self.timestamp = status.timestamp
+        message = status.message
+        if message is None:
+            self.status_role = self.status_message = None
+        else:
+            self.status_role = _ROLE_CODES[message.role]
+            self.status_message = _compact_message(message)
+
+    def append_history(self, message: Message):
+        if self.history is None:
+            self.roles = bytearray()
+            self.history = []
+        self.roles.append(_ROLE_CODES[message.role])
+        self.history.append(_compact_message(message))
+
+    def to_task(self) -> Task:
+        message = None
+        if self.status_message is not None:
+            message = _expand_message(self.status_role, self.status_message)
+        history = None
+        if self.history is not None:
+            history = list(map(_expand_message, self.roles, self.history))
+        return trusted.task(
+            id=self.id,
+            sessionId=self.session_id,
+            status=trusted.task_status(
+                state=self.state, message=message, timestamp=self.timestamp
+            ),
+            artifacts=None if self.artifacts is None else list(self.artifacts),
+            history=history,
+            metadata=self.metadata,
+        )
+
+
+class CompactTaskStore(TaskStore):
+    """Keeps tasks in memory in a compact form instead of as models.
+
+    Long histories dominate the memory of an in-memory task manager, and as
+    pydantic models every message costs a Message, a TextPart, their dicts
+    and the parts list. Here a text-only message costs its string and a
+    byte for its role. Tasks are turned back into models when read, which
+    takes time proportional to their history.
+
+    The cache_size most recently updated tasks are also kept as models, so
+    the updates of running tasks are applied in place and not rebuilt
+    each time. Reads and iteration use cached models but leave the cache
+    as it is, so listing tasks does not push out those of running work.
+    As with SQLiteTaskStore, changes to a task must go through the store;
+    a task modified directly may lose the change once it drops out of
+    the cache.
+    """
+
+    def __init__(self, cache_size: int = 64):
+        self.cache_size = cache_size
+        self._records: dict[str, _CompactTask] = {}
+        self._cache: OrderedDict[str, Task] = OrderedDict()
+
+    def _remember(self, task: Task) -> Task:
+        self._cache[task.id] = task
+        self._cache.move_to_end(task.id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return task
+
+    def _load(self, task_id: str) -> Task:
+        task = self._cache.get(task_id)
+        if task is not None:
+            self._cache.move_to_end(task_id)
+            return task
+        return self._remember(self._records[task_id].to_task())
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self._cache.get(task_id)
+        if task is not None:
+            return task
+        return self._records[task_id].to_task()
+
+    def __delitem__(self, task_id: str) -> None:
+        del self._records[task_id]
+        self._cache.pop(task_id, None)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def upsert(self, task: Task) -> None:
+        self._records[task.id] = _CompactTask(task)
+        self._remember(task)
+
+    def update_task(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        artifacts: list[Artifact] | None = None,
+    ) -> Task:
+        record = self._records[task_id]
+        task = self._load(task_id)
+        record.set_status(status)
+        if artifacts is not None:
+            if record.artifacts is None:
+                record.artifacts = []
+            record.artifacts.extend(artifacts)
+        return _apply_update(task, status, artifacts)
+
+    def append_history(self, task_id: str, message: Message) -> Task:
+        record = self._records[task_id]
+        task = self._load(task_id)
+        record.append_history(message)
+        if task.history is None:
+            task.history = []
+        task.history.append(message)
+        return task
+
+    def list_tasks(
+        self, state: TaskState | None = None, session_id: str | None = None
+    ) -> list[Task]:
+        return [
+            self[record.id]
+            for record in self._records.values()
+            if (state is None or record.state == state)
+            and (session_id is None or record.session_id == session_id)
+        ]
+
+    def count_by(self, json_path: str) -> dict[Any, int]:
+        """Counts the stored tasks grouped by state.
+
+        Only '$.status.state' is supported; the states are read from the
+        compact records, without turning any task back into a model.
+        """
+        if json_path != '$.status.state':
+            raise ValueError(f'Cannot count tasks by {json_path}')
+        counts = Counter(record.state for record in self._records.values())
+        return {TaskState(state).value: n for state, n in counts.items()}
+
+
+class SQLiteTaskStore(TaskStore):
+    """Task store backed by a SQLite database in WAL mode.
+
+    Writes are applied to an in-process cache right away and written behind
+    by a background thread, which commits everything that changed during
+    the last flush_interval seconds in one transaction; repeated updates of
+    the same task are coalesced into a single row write. Call flush() to
+    write pending changes immediately.
+
+    Reads are served from an LRU cache of up to cache_size tasks. Every row
+    carries a version token; with validate_cache, a cached task is only
+    reused while its row still has the version this process last saw, so
+    the workers of a multi-process A2AServer pick up each other's writes
+    once they have been flushed. Rows also keep the session id, state and
+    update time of their task in indexed columns, which query_tasks() uses
+    to list tasks written by any process.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = 'tasks',
+        cache_size: int = 1024,
+        flush_interval: float = 0.01,
+        validate_cache: bool = True,
+    ):
+        self.path = path
+        self.table = table
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        self.validate_cache = validate_cache
+        self.commits = 0
+        self._last_update = 0.0
+        # Task id -> (task, version, update time).
+        self._cache: OrderedDict[str, tuple[Task, str, float]] = OrderedDict()
+        # As in _cache, or None for a pending delete.
+        self._dirty: dict[str, tuple[Task, str, float] | None] = {}
+        self._dirty_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._conn: sqlite3.Connection | None = None
+        self._writer: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} '
+            '(id TEXT PRIMARY KEY, data TEXT NOT NULL, version TEXT, '
+            'session_id TEXT, state TEXT, updated REAL)'
+        )
+        columns = {
+            row[1] for row in conn.execute(f'PRAGMA table_info({self.table})')
+        }
+        if 'updated' not in columns:
+            # Tables written before the listing columns existed.
+            conn.execute(f'ALTER TABLE {self.table} ADD COLUMN session_id TEXT')
+            conn.execute(f'ALTER TABLE {self.table} ADD COLUMN state TEXT')
+            conn.execute(f'ALTER TABLE {self.table} ADD COLUMN updated REAL')
+            conn.execute(
+                f'UPDATE {self.table} SET '
+                "session_id = json_extract(data, '$.sessionId'), "
+                "state = json_extract(data, '$.status.state'), updated = 0"
+            )
+        for column in ('updated', 'session_id, updated', 'state, updated'):
+            name = column.replace(', ', '_')
+            conn.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_{name} '
+                f'ON {self.table} ({column})'
+            )
+        conn.commit()
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._pid != pid:
+            # Threads do not survive fork(); each process gets its own
+            # connection and writer.
+            self._conn = self._connect()
+            self._pid = pid
+            self._cache.clear()
+            self._dirty = {}
+            self._dirty_lock = threading.Lock()
+            self._write_lock = threading.Lock()
+            self._wake = threading.Event()
+            self._writer = threading.Thread(
+                target=self._write_behind,
+                args=(self._connect(),),
+                name=f'{self.table}-writer',
+                daemon=True,
+            )
+            self._writer.start()
+        return self._conn
+
+    def _write_behind(self, conn: sqlite3.Connection):
+        while True:
+            self._wake.wait()
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            self._write_pending(conn)
+
+    def _write_pending(self, conn: sqlite3.Connection):
+        with self._write_lock:
+            with self._dirty_lock:
+                pending, self._dirty = self._dirty, {}
+            if not pending:
+                return
+            upserts = []
+            deletes = []
+            for task_id, entry in pending.items():
+                if entry is None:
+                    deletes.append((task_id,))
+                else:
+                    # Serialization holds the GIL throughout, so the event
+                    # loop cannot mutate the task halfway through.
+                    task, version, updated = entry
+                    upserts.append(
+                        (
+                            task_id,
+                            task.model_dump_json(),
+                            version,
+                            task.sessionId,
+                            task.status.state.value,
+                            updated,
+                        )
+                    )
+            with conn:
+                conn.executemany(
+                    f'INSERT INTO {self.table} '
+                    '(id, data, version, session_id, state, updated) '
+                    'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET '
+                    'data = excluded.data, version = excluded.version, '
+                    'session_id = excluded.session_id, '
+                    'state = excluded.state, updated = excluded.updated',
+                    upserts,
+                )
+                conn.executemany(
+                    f'DELETE FROM {self.table} WHERE id = ?', deletes
+                )
+            self.commits += 1
+
+    def flush(self) -> None:
+        self._write_pending(self._connection())
+
+    def _mark_dirty(self, task: Task) -> Task:
+        conn = self._connection()
+        # Strictly increasing, so updates in this process never tie.
+        self._last_update = max(time.time(), self._last_update + 1e-6)
+        entry = (task, uuid.uuid4().hex, self._last_update)
+        self._cache[task.id] = entry
+        self._cache.move_to_end(task.id)
+        with self._dirty_lock:
+            self._dirty[task.id] = entry
+        self._wake.set()
+        self._evict(conn)
+        return task
+
+    def _evict(self, conn: sqlite3.Connection):
+        while len(self._cache) > self.cache_size:
+            task_id, entry = self._cache.popitem(last=False)
+            if self._dirty.get(task_id) is entry:
+                # Not written yet; keep it until the writer catches up.
+                self._cache[task_id] = entry
+                break
+
+    def _load(self, task_id: str) -> Task | None:
+        conn = self._connection()
+        entry = self._cache.get(task_id)
+        if entry is not None:
+            if not self.validate_cache or task_id in self._dirty:
+                self._cache.move_to_end(task_id)
+                return entry[0]
+            row = conn.execute(
+                f'SELECT version FROM {self.table} WHERE id = ?', (task_id,)
+            ).fetchone()
+            if row is not None and row[0] == entry[1]:
+                self._cache.move_to_end(task_id)
+                return entry[0]
+        elif task_id in self._dirty:
+            # Deleted but not written yet.
+            return None
+
+        row = conn.execute(
+            f'SELECT data, version, updated FROM {self.table} WHERE id = ?',
+            (task_id,),
+        ).fetchone()
+        if row is None:
+            self._cache.pop(task_id, None)
+            return None
+        task = Task.model_validate_json(row[0])
+        self._cache[task_id] = (task, row[1], row[2])
+        self._evict(conn)
+        return task
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self._load(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def __contains__(self, task_id: object) -> bool:
+        return isinstance(task_id, str) and self._load(task_id) is not None
+
+    def __delitem__(self, task_id: str) -> None:
+        if self._load(task_id) is None:
+            raise KeyError(task_id)
+        self._cache.pop(task_id, None)
+        with self._dirty_lock:
+            self._dirty[task_id] = None
+        self._wake.set()
+
+    def __iter__(self) -> Iterator[str]:
+        self.flush()
+        rows = self._connection().execute(f'SELECT id FROM {self.table}')
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        self.flush()
+        return (
+            self._connection()
+            .execute(f'SELECT COUNT(*) FROM {self.table}')
+            .fetchone()[0]
+        )
+
+    def upsert(self, task: Task) -> None:
+        self._mark_dirty(task)
+
+    def update_task(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        artifacts: list[Artifact] | None = None,
+    ) -> Task:
+        return self._mark_dirty(_apply_update(self[task_id], status, artifacts))
+
+    def append_history(self, task_id: str, message: Message) -> Task:
+        task = self[task_id]
+        if task.history is None:
+            task.history = []
+        task.history.append(message)
+        return self._mark_dirty(task)
+
+    def list_tasks(
+        self, state: TaskState | None = None, session_id: str | None = None
+    ) -> list[Task]:
+        self.flush()
+        rows = self._connection().execute(f'SELECT id FROM {self.table}')
+        tasks = (self._load(task_id) for (task_id,) in rows.fetchall())
+        return [
+            task
+            for task in tasks
+            if task is not None and _matches(task, state, session_id)
+        ]
+
+    def query_tasks(
+        self,
+        session_id: str | None = None,
+        state: TaskState | None = None,
+        updated_after: float | None = None,
+        updated_before: float | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> tuple[list[str], str | None]:
+        """Returns the ids of matching tasks, most recently updated first.
+
+        Works like TaskIndex.query() over the rows of every process, with an
+        opaque cursor; a malformed cursor raises ValueError. Along with at
+        most limit ids comes the cursor of the next page, or None on the
+        last page.
+        """
+        conditions = []
+        args: list[Any] = []
+        if session_id is not None:
+            conditions.append('session_id = ?')
+            args.append(session_id)
+        if state is not None:
+            conditions.append('state = ?')
+            args.append(TaskState(state).value)
+        if updated_after is not None:
+            conditions.append('updated > ?')
+            args.append(updated_after)
+        if updated_before is not None:
+            conditions.append('updated < ?')
+            args.append(updated_before)
+        if cursor is not None:
+            updated, _, task_id = cursor.partition(' ')
+            conditions.append('(updated < ? OR (updated = ? AND id < ?))')
+            args.extend((float(updated), float(updated), task_id))
+        where = f'WHERE {" AND ".join(conditions)} ' if conditions else ''
+        self.flush()
+        rows = (
+            self._connection()
+            .execute(
+                f'SELECT id, updated FROM {self.table} {where}'
+                'ORDER BY updated DESC, id DESC LIMIT ?',
+                (*args, limit + 1),
+            )
+            .fetchall()
+        )
+        if len(rows) <= limit:
+            return [task_id for task_id, _ in rows], None
+        task_id, updated = rows[limit - 1]
+        return [
+            task_id for task_id, _ in rows[:limit]
+        ], f'{updated!r} {task_id}'
+
+    def count_by(self, json_path: str) -> dict[Any, int]:
+        """Counts the stored tasks grouped by the value at json_path."""
+        self.flush()
+        rows = self._connection().execute(
+            f'SELECT json_extract(data, ?), COUNT(*) FROM {self.table} '
+            'GROUP BY 1',
+            (json_path,),
+        )
+        return dict(rows.fetchall())
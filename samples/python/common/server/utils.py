@@ -1,3 +1,6 @@
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import Any
+
 from common.types import (
     ContentTypeNotSupportedError,
     JSONRPCResponse,
@@ -26,3 +29,37 @@ def new_incompatible_types_error(request_id):
 
 def new_not_implemented_error(request_id):
     return JSONRPCResponse(id=request_id, error=UnsupportedOperationError())
+
+
+class ReleasingStream(AsyncIterator[Any]):
+    """Iterates over stream and calls release once when it is done with.
+
+    That is when the stream ends or fails, or when the wrapper is closed or
+    garbage collected, including before its first item: a generator's
+    finally block never runs for a stream that was dropped unstarted.
+    """
+
+    def __init__(self, stream: AsyncIterable[Any], release: Callable[[], Any]):
+        self._iterator = aiter(stream)
+        self._release: Callable[[], Any] | None = release
+
+    async def __anext__(self) -> Any:
+        try:
+            return await anext(self._iterator)
+        except BaseException:
+            self._done()
+            raise
+
+    async def aclose(self):
+        self._done()
+        aclose = getattr(self._iterator, 'aclose', None)
+        if aclose is not None:
+            await aclose()
+
+    def _done(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __del__(self):
+        self._done()
@@ -7,6 +7,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    PrivateAttr,
     TypeAdapter,
     field_serializer,
     model_validator,
@@ -103,12 +104,16 @@ class TaskStatusUpdateEvent(BaseModel):
     status: TaskStatus
     final: bool = False
     metadata: dict[str, Any] | None = None
+    # Encoded once and shared by every SSE subscriber it is broadcast to.
+    _json: bytes | None = PrivateAttr(default=None)
 
 
 class TaskArtifactUpdateEvent(BaseModel):
     id: str
     artifact: Artifact
     metadata: dict[str, Any] | None = None
+    # Encoded once and shared by every SSE subscriber it is broadcast to.
+    _json: bytes | None = PrivateAttr(default=None)
 
 
 class AuthenticationInfo(BaseModel):
@@ -143,6 +148,22 @@ class TaskSendParams(BaseModel):
     metadata: dict[str, Any] | None = None
 
 
+class TaskListParams(BaseModel):
+    sessionId: str | None = None
+    state: TaskState | None = None
+    updatedAfter: datetime | None = None
+    updatedBefore: datetime | None = None
+    pageSize: int = Field(default=50, ge=1, le=1000)
+    cursor: str | None = None
+    historyLength: int | None = None
+    metadata: dict[str, Any] | None = None
+
+
+class TaskList(BaseModel):
+    tasks: list[Task]
+    nextCursor: str | None = None
+
+
 class TaskPushNotificationConfig(BaseModel):
     id: str
     pushNotificationConfig: PushNotificationConfig
@@ -188,6 +209,8 @@ class SendTaskStreamingRequest(JSONRPCRequest):
 
 class SendTaskStreamingResponse(JSONRPCResponse):
     result: TaskStatusUpdateEvent | TaskArtifactUpdateEvent | None = None
+    # Sequence number in the task's event log, sent as the SSE event id.
+    _event_id: int | None = PrivateAttr(default=None)
 
 
 class GetTaskRequest(JSONRPCRequest):
@@ -235,6 +258,15 @@ class TaskResubscriptionRequest(JSONRPCRequest):
     params: TaskIdParams
 
 
+class ListTasksRequest(JSONRPCRequest):
+    method: Literal['tasks/list',] = 'tasks/list'
+    params: TaskListParams = Field(default_factory=TaskListParams)
+
+
+class ListTasksResponse(JSONRPCResponse):
+    result: TaskList | None = None
+
+
 A2ARequest = TypeAdapter(
     Annotated[
         SendTaskRequest
@@ -243,7 +275,8 @@ A2ARequest = TypeAdapter(
         | SetTaskPushNotificationRequest
         | GetTaskPushNotificationRequest
         | TaskResubscriptionRequest
-        | SendTaskStreamingRequest,
+        | SendTaskStreamingRequest
+        | ListTasksRequest,
         Field(discriminator='method'),
     ]
 )
@@ -311,6 +344,12 @@ class ContentTypeNotSupportedError(JSONRPCError):
     data: None = None
 
 
+class ServerBusyError(JSONRPCError):
+    code: int = -32010
+    message: str = 'Server is busy, retry later'
+    data: Any | None = None
+
+
 class AgentProvider(BaseModel):
     organization: str
     url: str | None = None
@@ -0,0 +1,1820 @@
+"""Decoders for the A2A types, generated from the A2A JSON schema.
+
+Generated by common.utils.schema_codegen from specification/json/a2a.json.
+Do not edit; regenerate instead.
+"""
+
+# ruff: noqa
+
+import json
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import pydantic_core
+
+from pydantic import ValidationError
+
+from common import types
+from common.utils import trusted
+
+
+class SchemaValidationError(ValueError):
+    """Raised for a value that does not conform to the A2A JSON schema.
+
+    loc holds the path to the offending value, as keys and list indexes.
+    """
+
+    def __init__(self, message: str, loc: list[str | int] | None = None):
+        super().__init__(message)
+        self.message = message
+        self.loc = loc or []
+
+    def __str__(self) -> str:
+        if not self.loc:
+            return self.message
+        return '/'.join(map(str, self.loc)) + ': ' + self.message
+
+    def errors(self) -> list[dict[str, Any]]:
+        """The error in the shape of pydantic's ValidationError.errors()."""
+        return [{'type': 'schema', 'loc': self.loc, 'msg': self.message}]
+
+
+_MISSING = object()
+
+
+def _datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise SchemaValidationError('must be a date-time') from None
+
+
+def _failing_index(decode: Callable[[Any], Any], items: list) -> int:
+    for index, item in enumerate(items):
+        try:
+            decode(item)
+        except SchemaValidationError:
+            return index
+    return -1
+
+
+def _validated(model: type, data: dict) -> Any:
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        error = e.errors()[0]
+        raise SchemaValidationError(error['msg'], list(error['loc'])) from None
+
+
+_build_AgentAuthentication = trusted.builder(types.AgentAuthentication)
+_build_AgentCapabilities = trusted.builder(types.AgentCapabilities)
+_build_AgentCard = trusted.builder(types.AgentCard)
+_build_AgentProvider = trusted.builder(types.AgentProvider)
+_build_AgentSkill = trusted.builder(types.AgentSkill)
+_build_Artifact = trusted.builder(types.Artifact)
+_build_AuthenticationInfo = trusted.builder(types.AuthenticationInfo)
+_build_PushNotificationNotSupportedError = trusted.builder(
+    types.PushNotificationNotSupportedError
+)
+_build_CancelTaskRequest = trusted.builder(types.CancelTaskRequest)
+_build_CancelTaskResponse = trusted.builder(types.CancelTaskResponse)
+_build_DataPart = trusted.builder(types.DataPart)
+_build_FileContent = trusted.builder(types.FileContent)
+_build_FilePart = trusted.builder(types.FilePart)
+_build_GetTaskPushNotificationRequest = trusted.builder(
+    types.GetTaskPushNotificationRequest
+)
+_build_GetTaskPushNotificationResponse = trusted.builder(
+    types.GetTaskPushNotificationResponse
+)
+_build_GetTaskRequest = trusted.builder(types.GetTaskRequest)
+_build_GetTaskResponse = trusted.builder(types.GetTaskResponse)
+_build_InternalError = trusted.builder(types.InternalError)
+_build_InvalidParamsError = trusted.builder(types.InvalidParamsError)
+_build_InvalidRequestError = trusted.builder(types.InvalidRequestError)
+_build_JSONParseError = trusted.builder(types.JSONParseError)
+_build_JSONRPCError = trusted.builder(types.JSONRPCError)
+_build_JSONRPCMessage = trusted.builder(types.JSONRPCMessage)
+_build_JSONRPCRequest = trusted.builder(types.JSONRPCRequest)
+_build_JSONRPCResponse = trusted.builder(types.JSONRPCResponse)
+_build_Message = trusted.builder(types.Message)
+_build_MethodNotFoundError = trusted.builder(types.MethodNotFoundError)
+_build_PushNotificationConfig = trusted.builder(types.PushNotificationConfig)
+_build_SendTaskRequest = trusted.builder(types.SendTaskRequest)
+_build_SendTaskResponse = trusted.builder(types.SendTaskResponse)
+_build_SendTaskStreamingRequest = trusted.builder(
+    types.SendTaskStreamingRequest
+)
+_build_SendTaskStreamingResponse = trusted.builder(
+    types.SendTaskStreamingResponse
+)
+_build_SetTaskPushNotificationRequest = trusted.builder(
+    types.SetTaskPushNotificationRequest
+)
+_build_SetTaskPushNotificationResponse = trusted.builder(
+    types.SetTaskPushNotificationResponse
+)
+_build_Task = trusted.builder(types.Task)
+_build_TaskPushNotificationConfig = trusted.builder(
+    types.TaskPushNotificationConfig
+)
+_build_TaskNotCancelableError = trusted.builder(types.TaskNotCancelableError)
+_build_TaskNotFoundError = trusted.builder(types.TaskNotFoundError)
+_build_TaskIdParams = trusted.builder(types.TaskIdParams)
+_build_TaskQueryParams = trusted.builder(types.TaskQueryParams)
+_build_TaskSendParams = trusted.builder(types.TaskSendParams)
+_build_TaskStatus = trusted.builder(types.TaskStatus)
+_build_TaskResubscriptionRequest = trusted.builder(
+    types.TaskResubscriptionRequest
+)
+_build_TaskStatusUpdateEvent = trusted.builder(types.TaskStatusUpdateEvent)
+_build_TaskArtifactUpdateEvent = trusted.builder(types.TaskArtifactUpdateEvent)
+_build_TextPart = trusted.builder(types.TextPart)
+_build_UnsupportedOperationError = trusted.builder(
+    types.UnsupportedOperationError
+)
+
+
+def _AgentAuthentication(data: Any) -> types.AgentAuthentication:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('schemes', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['schemes'])
+    if not isinstance(value, list):
+        raise SchemaValidationError('must be an array', ['schemes'])
+    for index, item in enumerate(value):
+        if not isinstance(item, str):
+            raise SchemaValidationError('must be a string', ['schemes', index])
+    fields['schemes'] = value
+    value = data.get('credentials', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['credentials'])
+        fields['credentials'] = value
+    return _build_AgentAuthentication(**fields)
+
+
+def _AgentCapabilities(data: Any) -> types.AgentCapabilities:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('streaming', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not bool:
+            raise SchemaValidationError('must be a boolean', ['streaming'])
+        fields['streaming'] = value
+    value = data.get('pushNotifications', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not bool:
+            raise SchemaValidationError(
+                'must be a boolean', ['pushNotifications']
+            )
+        fields['pushNotifications'] = value
+    value = data.get('stateTransitionHistory', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not bool:
+            raise SchemaValidationError(
+                'must be a boolean', ['stateTransitionHistory']
+            )
+        fields['stateTransitionHistory'] = value
+    return _build_AgentCapabilities(**fields)
+
+
+def _AgentCard(data: Any) -> types.AgentCard:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('name', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['name'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['name'])
+    fields['name'] = value
+    value = data.get('description', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['description'])
+        fields['description'] = value
+    value = data.get('url', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['url'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['url'])
+    fields['url'] = value
+    value = data.get('provider', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _AgentProvider(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['provider']
+            raise
+        fields['provider'] = value
+    value = data.get('version', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['version'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['version'])
+    fields['version'] = value
+    value = data.get('documentationUrl', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError(
+                'must be a string', ['documentationUrl']
+            )
+        fields['documentationUrl'] = value
+    value = data.get('capabilities', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['capabilities'])
+    try:
+        value = _AgentCapabilities(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['capabilities']
+        raise
+    fields['capabilities'] = value
+    value = data.get('authentication', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _AgentAuthentication(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['authentication']
+            raise
+        fields['authentication'] = value
+    value = data.get('defaultInputModes', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError(
+                'must be an array', ['defaultInputModes']
+            )
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                raise SchemaValidationError(
+                    'must be a string', ['defaultInputModes', index]
+                )
+        fields['defaultInputModes'] = value
+    value = data.get('defaultOutputModes', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError(
+                'must be an array', ['defaultOutputModes']
+            )
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                raise SchemaValidationError(
+                    'must be a string', ['defaultOutputModes', index]
+                )
+        fields['defaultOutputModes'] = value
+    value = data.get('skills', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['skills'])
+    if not isinstance(value, list):
+        raise SchemaValidationError('must be an array', ['skills'])
+    try:
+        value = [_AgentSkill(item) for item in value]
+    except SchemaValidationError as e:
+        e.loc[:0] = ['skills', _failing_index(_AgentSkill, value)]
+        raise
+    fields['skills'] = value
+    return _build_AgentCard(**fields)
+
+
+def _AgentProvider(data: Any) -> types.AgentProvider:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('organization', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['organization'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['organization'])
+    fields['organization'] = value
+    value = data.get('url', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['url'])
+        fields['url'] = value
+    return _build_AgentProvider(**fields)
+
+
+def _AgentSkill(data: Any) -> types.AgentSkill:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('name', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['name'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['name'])
+    fields['name'] = value
+    value = data.get('description', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['description'])
+        fields['description'] = value
+    value = data.get('tags', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError('must be an array', ['tags'])
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                raise SchemaValidationError('must be a string', ['tags', index])
+        fields['tags'] = value
+    value = data.get('examples', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError('must be an array', ['examples'])
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                raise SchemaValidationError(
+                    'must be a string', ['examples', index]
+                )
+        fields['examples'] = value
+    value = data.get('inputModes', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError('must be an array', ['inputModes'])
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                raise SchemaValidationError(
+                    'must be a string', ['inputModes', index]
+                )
+        fields['inputModes'] = value
+    value = data.get('outputModes', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError('must be an array', ['outputModes'])
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                raise SchemaValidationError(
+                    'must be a string', ['outputModes', index]
+                )
+        fields['outputModes'] = value
+    return _build_AgentSkill(**fields)
+
+
+def _Artifact(data: Any) -> types.Artifact:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('name', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['name'])
+        fields['name'] = value
+    value = data.get('description', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['description'])
+        fields['description'] = value
+    value = data.get('parts', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['parts'])
+    if not isinstance(value, list):
+        raise SchemaValidationError('must be an array', ['parts'])
+    try:
+        value = [_Part(item) for item in value]
+    except SchemaValidationError as e:
+        e.loc[:0] = ['parts', _failing_index(_Part, value)]
+        raise
+    fields['parts'] = value
+    value = data.get('index', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not int:
+            raise SchemaValidationError('must be an integer', ['index'])
+        fields['index'] = value
+    value = data.get('append', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not bool:
+            raise SchemaValidationError('must be a boolean', ['append'])
+        fields['append'] = value
+    value = data.get('lastChunk', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not bool:
+            raise SchemaValidationError('must be a boolean', ['lastChunk'])
+        fields['lastChunk'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_Artifact(**fields)
+
+
+def _AuthenticationInfo(data: Any) -> types.AuthenticationInfo:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    value = data.get('schemes', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['schemes'])
+    if not isinstance(value, list):
+        raise SchemaValidationError('must be an array', ['schemes'])
+    for index, item in enumerate(value):
+        if not isinstance(item, str):
+            raise SchemaValidationError('must be a string', ['schemes', index])
+    value = data.get('credentials', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['credentials'])
+    return _validated(types.AuthenticationInfo, data)
+
+
+def _PushNotificationNotSupportedError(
+    data: Any,
+) -> types.PushNotificationNotSupportedError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32003:
+        raise SchemaValidationError('must be -32003', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Push Notification is not supported':
+        raise SchemaValidationError(
+            "must be 'Push Notification is not supported'", ['message']
+        )
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        fields['data'] = value
+    return _build_PushNotificationNotSupportedError(**fields)
+
+
+def _CancelTaskRequest(data: Any) -> types.CancelTaskRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    if value != 'tasks/cancel':
+        raise SchemaValidationError("must be 'tasks/cancel'", ['method'])
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['params'])
+    try:
+        value = _TaskIdParams(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['params']
+        raise
+    fields['params'] = value
+    return _build_CancelTaskRequest(**fields)
+
+
+def _CancelTaskResponse(data: Any) -> types.CancelTaskResponse:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('result', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _Task(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['result']
+            raise
+        fields['result'] = value
+    value = data.get('error', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _JSONRPCError(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['error']
+            raise
+        fields['error'] = value
+    return _build_CancelTaskResponse(**fields)
+
+
+def _DataPart(data: Any) -> types.DataPart:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('type', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['type'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['type'])
+    if value != 'data':
+        raise SchemaValidationError("must be 'data'", ['type'])
+    fields['type'] = value
+    value = data.get('data', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['data'])
+    if not isinstance(value, dict):
+        raise SchemaValidationError('must be an object', ['data'])
+    fields['data'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_DataPart(**fields)
+
+
+def _FileContent(data: Any) -> types.FileContent:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    value = data.get('name', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['name'])
+    value = data.get('mimeType', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['mimeType'])
+    value = data.get('bytes', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['bytes'])
+    value = data.get('uri', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['uri'])
+    return _validated(types.FileContent, data)
+
+
+def _FilePart(data: Any) -> types.FilePart:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('type', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['type'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['type'])
+    if value != 'file':
+        raise SchemaValidationError("must be 'file'", ['type'])
+    fields['type'] = value
+    value = data.get('file', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['file'])
+    try:
+        value = _FileContent(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['file']
+        raise
+    fields['file'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_FilePart(**fields)
+
+
+def _GetTaskPushNotificationRequest(
+    data: Any,
+) -> types.GetTaskPushNotificationRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    if value != 'tasks/pushNotification/get':
+        raise SchemaValidationError(
+            "must be 'tasks/pushNotification/get'", ['method']
+        )
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['params'])
+    try:
+        value = _TaskIdParams(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['params']
+        raise
+    fields['params'] = value
+    return _build_GetTaskPushNotificationRequest(**fields)
+
+
+def _GetTaskPushNotificationResponse(
+    data: Any,
+) -> types.GetTaskPushNotificationResponse:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('result', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _TaskPushNotificationConfig(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['result']
+            raise
+        fields['result'] = value
+    value = data.get('error', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _JSONRPCError(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['error']
+            raise
+        fields['error'] = value
+    return _build_GetTaskPushNotificationResponse(**fields)
+
+
+def _GetTaskRequest(data: Any) -> types.GetTaskRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    if value != 'tasks/get':
+        raise SchemaValidationError("must be 'tasks/get'", ['method'])
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['params'])
+    try:
+        value = _TaskQueryParams(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['params']
+        raise
+    fields['params'] = value
+    return _build_GetTaskRequest(**fields)
+
+
+def _GetTaskResponse(data: Any) -> types.GetTaskResponse:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('result', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _Task(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['result']
+            raise
+        fields['result'] = value
+    value = data.get('error', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _JSONRPCError(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['error']
+            raise
+        fields['error'] = value
+    return _build_GetTaskResponse(**fields)
+
+
+def _InternalError(data: Any) -> types.InternalError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32603:
+        raise SchemaValidationError('must be -32603', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Internal error':
+        raise SchemaValidationError("must be 'Internal error'", ['message'])
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['data'])
+        fields['data'] = value
+    return _build_InternalError(**fields)
+
+
+def _InvalidParamsError(data: Any) -> types.InvalidParamsError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32602:
+        raise SchemaValidationError('must be -32602', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Invalid parameters':
+        raise SchemaValidationError("must be 'Invalid parameters'", ['message'])
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['data'])
+        fields['data'] = value
+    return _build_InvalidParamsError(**fields)
+
+
+def _InvalidRequestError(data: Any) -> types.InvalidRequestError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32600:
+        raise SchemaValidationError('must be -32600', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Request payload validation error':
+        raise SchemaValidationError(
+            "must be 'Request payload validation error'", ['message']
+        )
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['data'])
+        fields['data'] = value
+    return _build_InvalidRequestError(**fields)
+
+
+def _JSONParseError(data: Any) -> types.JSONParseError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32700:
+        raise SchemaValidationError('must be -32700', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Invalid JSON payload':
+        raise SchemaValidationError(
+            "must be 'Invalid JSON payload'", ['message']
+        )
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['data'])
+        fields['data'] = value
+    return _build_JSONParseError(**fields)
+
+
+def _JSONRPCError(data: Any) -> types.JSONRPCError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['data'])
+        fields['data'] = value
+    return _build_JSONRPCError(**fields)
+
+
+def _JSONRPCMessage(data: Any) -> types.JSONRPCMessage:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    return _build_JSONRPCMessage(**fields)
+
+
+def _JSONRPCRequest(data: Any) -> types.JSONRPCRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['params'])
+        fields['params'] = value
+    return _build_JSONRPCRequest(**fields)
+
+
+def _JSONRPCResponse(data: Any) -> types.JSONRPCResponse:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('result', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['result'])
+        fields['result'] = value
+    value = data.get('error', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _JSONRPCError(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['error']
+            raise
+        fields['error'] = value
+    return _build_JSONRPCResponse(**fields)
+
+
+def _Message(data: Any) -> types.Message:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('role', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['role'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['role'])
+    if value not in ('user', 'agent'):
+        raise SchemaValidationError('must be one of user, agent', ['role'])
+    fields['role'] = value
+    value = data.get('parts', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['parts'])
+    if not isinstance(value, list):
+        raise SchemaValidationError('must be an array', ['parts'])
+    try:
+        value = [_Part(item) for item in value]
+    except SchemaValidationError as e:
+        e.loc[:0] = ['parts', _failing_index(_Part, value)]
+        raise
+    fields['parts'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_Message(**fields)
+
+
+def _MethodNotFoundError(data: Any) -> types.MethodNotFoundError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32601:
+        raise SchemaValidationError('must be -32601', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Method not found':
+        raise SchemaValidationError("must be 'Method not found'", ['message'])
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        fields['data'] = value
+    return _build_MethodNotFoundError(**fields)
+
+
+def _PushNotificationConfig(data: Any) -> types.PushNotificationConfig:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('url', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['url'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['url'])
+    fields['url'] = value
+    value = data.get('token', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['token'])
+        fields['token'] = value
+    value = data.get('authentication', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _AuthenticationInfo(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['authentication']
+            raise
+        fields['authentication'] = value
+    return _build_PushNotificationConfig(**fields)
+
+
+def _Part(data: Any) -> Any:
+    try:
+        decode = _PART_BY_TYPE[data['type']]
+    except (KeyError, TypeError):
+        raise SchemaValidationError(
+            'does not match any of TextPart, FilePart, DataPart'
+        ) from None
+    return decode(data)
+
+
+def _SendTaskRequest(data: Any) -> types.SendTaskRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    if value != 'tasks/send':
+        raise SchemaValidationError("must be 'tasks/send'", ['method'])
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['params'])
+    try:
+        value = _TaskSendParams(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['params']
+        raise
+    fields['params'] = value
+    return _build_SendTaskRequest(**fields)
+
+
+def _SendTaskResponse(data: Any) -> types.SendTaskResponse:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('result', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _Task(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['result']
+            raise
+        fields['result'] = value
+    value = data.get('error', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _JSONRPCError(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['error']
+            raise
+        fields['error'] = value
+    return _build_SendTaskResponse(**fields)
+
+
+def _SendTaskStreamingRequest(data: Any) -> types.SendTaskStreamingRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    if value != 'tasks/sendSubscribe':
+        raise SchemaValidationError("must be 'tasks/sendSubscribe'", ['method'])
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['params'])
+    try:
+        value = _TaskSendParams(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['params']
+        raise
+    fields['params'] = value
+    return _build_SendTaskStreamingRequest(**fields)
+
+
+def _union_1(data: Any) -> Any:
+    for decode in (_TaskStatusUpdateEvent, _TaskArtifactUpdateEvent):
+        try:
+            return decode(data)
+        except SchemaValidationError:
+            pass
+    raise SchemaValidationError(
+        'does not match any of TaskStatusUpdateEvent, TaskArtifactUpdateEvent'
+    )
+
+
+def _SendTaskStreamingResponse(data: Any) -> types.SendTaskStreamingResponse:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('result', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _union_1(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['result']
+            raise
+        fields['result'] = value
+    value = data.get('error', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _JSONRPCError(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['error']
+            raise
+        fields['error'] = value
+    return _build_SendTaskStreamingResponse(**fields)
+
+
+def _SetTaskPushNotificationRequest(
+    data: Any,
+) -> types.SetTaskPushNotificationRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    if value != 'tasks/pushNotification/set':
+        raise SchemaValidationError(
+            "must be 'tasks/pushNotification/set'", ['method']
+        )
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['params'])
+    try:
+        value = _TaskPushNotificationConfig(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['params']
+        raise
+    fields['params'] = value
+    return _build_SetTaskPushNotificationRequest(**fields)
+
+
+def _SetTaskPushNotificationResponse(
+    data: Any,
+) -> types.SetTaskPushNotificationResponse:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('result', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _TaskPushNotificationConfig(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['result']
+            raise
+        fields['result'] = value
+    value = data.get('error', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _JSONRPCError(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['error']
+            raise
+        fields['error'] = value
+    return _build_SetTaskPushNotificationResponse(**fields)
+
+
+def _Task(data: Any) -> types.Task:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('sessionId', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['sessionId'])
+        fields['sessionId'] = value
+    value = data.get('status', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['status'])
+    try:
+        value = _TaskStatus(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['status']
+        raise
+    fields['status'] = value
+    value = data.get('artifacts', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError('must be an array', ['artifacts'])
+        try:
+            value = [_Artifact(item) for item in value]
+        except SchemaValidationError as e:
+            e.loc[:0] = ['artifacts', _failing_index(_Artifact, value)]
+            raise
+        fields['artifacts'] = value
+    value = data.get('history', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, list):
+            raise SchemaValidationError('must be an array', ['history'])
+        try:
+            value = [_Message(item) for item in value]
+        except SchemaValidationError as e:
+            e.loc[:0] = ['history', _failing_index(_Message, value)]
+            raise
+        fields['history'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_Task(**fields)
+
+
+def _TaskPushNotificationConfig(data: Any) -> types.TaskPushNotificationConfig:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('pushNotificationConfig', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['pushNotificationConfig'])
+    try:
+        value = _PushNotificationConfig(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['pushNotificationConfig']
+        raise
+    fields['pushNotificationConfig'] = value
+    return _build_TaskPushNotificationConfig(**fields)
+
+
+def _TaskNotCancelableError(data: Any) -> types.TaskNotCancelableError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32002:
+        raise SchemaValidationError('must be -32002', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Task cannot be canceled':
+        raise SchemaValidationError(
+            "must be 'Task cannot be canceled'", ['message']
+        )
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        fields['data'] = value
+    return _build_TaskNotCancelableError(**fields)
+
+
+def _TaskNotFoundError(data: Any) -> types.TaskNotFoundError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32001:
+        raise SchemaValidationError('must be -32001', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'Task not found':
+        raise SchemaValidationError("must be 'Task not found'", ['message'])
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        fields['data'] = value
+    return _build_TaskNotFoundError(**fields)
+
+
+def _TaskIdParams(data: Any) -> types.TaskIdParams:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_TaskIdParams(**fields)
+
+
+def _TaskQueryParams(data: Any) -> types.TaskQueryParams:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('historyLength', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not int:
+            raise SchemaValidationError('must be an integer', ['historyLength'])
+        fields['historyLength'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_TaskQueryParams(**fields)
+
+
+def _TaskSendParams(data: Any) -> types.TaskSendParams:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('sessionId', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['sessionId'])
+        fields['sessionId'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    try:
+        value = _Message(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['message']
+        raise
+    fields['message'] = value
+    value = data.get('pushNotification', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _PushNotificationConfig(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['pushNotification']
+            raise
+        fields['pushNotification'] = value
+    value = data.get('historyLength', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not int:
+            raise SchemaValidationError('must be an integer', ['historyLength'])
+        fields['historyLength'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_TaskSendParams(**fields)
+
+
+_TASK_STATE_VALUES = {
+    'submitted': types.TaskState('submitted'),
+    'working': types.TaskState('working'),
+    'input-required': types.TaskState('input-required'),
+    'completed': types.TaskState('completed'),
+    'canceled': types.TaskState('canceled'),
+    'failed': types.TaskState('failed'),
+    'unknown': types.TaskState('unknown'),
+}
+
+
+def _TaskState(value: Any) -> Any:
+    try:
+        return _TASK_STATE_VALUES[value]
+    except (KeyError, TypeError):
+        raise SchemaValidationError(
+            'must be one of submitted, working, input-required, completed, canceled, failed, unknown',
+        ) from None
+
+
+def _TaskStatus(data: Any) -> types.TaskStatus:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('state', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['state'])
+    try:
+        value = _TaskState(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['state']
+        raise
+    fields['state'] = value
+    value = data.get('message', _MISSING)
+    if value is not _MISSING:
+        try:
+            value = _Message(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['message']
+            raise
+        fields['message'] = value
+    value = data.get('timestamp', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['timestamp'])
+        try:
+            value = _datetime(value)
+        except SchemaValidationError as e:
+            e.loc[:0] = ['timestamp']
+            raise
+        fields['timestamp'] = value
+    return _build_TaskStatus(**fields)
+
+
+def _TaskResubscriptionRequest(data: Any) -> types.TaskResubscriptionRequest:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('jsonrpc', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, str):
+            raise SchemaValidationError('must be a string', ['jsonrpc'])
+        if value != '2.0':
+            raise SchemaValidationError("must be '2.0'", ['jsonrpc'])
+        fields['jsonrpc'] = value
+    value = data.get('id', _MISSING)
+    if value is not _MISSING:
+        if not (type(value) is int or isinstance(value, str)):
+            raise SchemaValidationError('must be a integer or string', ['id'])
+        fields['id'] = value
+    value = data.get('method', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['method'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['method'])
+    if value != 'tasks/resubscribe':
+        raise SchemaValidationError("must be 'tasks/resubscribe'", ['method'])
+    fields['method'] = value
+    value = data.get('params', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['params'])
+    try:
+        value = _TaskQueryParams(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['params']
+        raise
+    fields['params'] = value
+    return _build_TaskResubscriptionRequest(**fields)
+
+
+def _TaskStatusUpdateEvent(data: Any) -> types.TaskStatusUpdateEvent:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('status', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['status'])
+    try:
+        value = _TaskStatus(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['status']
+        raise
+    fields['status'] = value
+    value = data.get('final', _MISSING)
+    if value is not _MISSING:
+        if type(value) is not bool:
+            raise SchemaValidationError('must be a boolean', ['final'])
+        fields['final'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_TaskStatusUpdateEvent(**fields)
+
+
+def _TaskArtifactUpdateEvent(data: Any) -> types.TaskArtifactUpdateEvent:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('id', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['id'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['id'])
+    fields['id'] = value
+    value = data.get('artifact', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['artifact'])
+    try:
+        value = _Artifact(value)
+    except SchemaValidationError as e:
+        e.loc[:0] = ['artifact']
+        raise
+    fields['artifact'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_TaskArtifactUpdateEvent(**fields)
+
+
+def _TextPart(data: Any) -> types.TextPart:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('type', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['type'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['type'])
+    if value != 'text':
+        raise SchemaValidationError("must be 'text'", ['type'])
+    fields['type'] = value
+    value = data.get('text', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['text'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['text'])
+    fields['text'] = value
+    value = data.get('metadata', _MISSING)
+    if value is not _MISSING:
+        if not isinstance(value, dict):
+            raise SchemaValidationError('must be an object', ['metadata'])
+        fields['metadata'] = value
+    return _build_TextPart(**fields)
+
+
+def _UnsupportedOperationError(data: Any) -> types.UnsupportedOperationError:
+    if not isinstance(data, dict):
+        raise SchemaValidationError('must be an object')
+    fields = {}
+    value = data.get('code', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['code'])
+    if type(value) is not int:
+        raise SchemaValidationError('must be an integer', ['code'])
+    if value != -32004:
+        raise SchemaValidationError('must be -32004', ['code'])
+    fields['code'] = value
+    value = data.get('message', _MISSING)
+    if value is _MISSING:
+        raise SchemaValidationError('is required', ['message'])
+    if not isinstance(value, str):
+        raise SchemaValidationError('must be a string', ['message'])
+    if value != 'This operation is not supported':
+        raise SchemaValidationError(
+            "must be 'This operation is not supported'", ['message']
+        )
+    fields['message'] = value
+    value = data.get('data', _MISSING)
+    if value is not _MISSING:
+        fields['data'] = value
+    return _build_UnsupportedOperationError(**fields)
+
+
+def _A2ARequest(data: Any) -> Any:
+    try:
+        decode = _A2A_REQUEST_BY_METHOD[data['method']]
+    except (KeyError, TypeError):
+        raise SchemaValidationError(
+            'does not match any of SendTaskRequest, GetTaskRequest, CancelTaskRequest, SetTaskPushNotificationRequest, GetTaskPushNotificationRequest, TaskResubscriptionRequest',
+        ) from None
+    return decode(data)
+
+
+_PART_BY_TYPE = {
+    'text': _TextPart,
+    'file': _FilePart,
+    'data': _DataPart,
+}
+
+_A2A_REQUEST_BY_METHOD = {
+    'tasks/send': _SendTaskRequest,
+    'tasks/get': _GetTaskRequest,
+    'tasks/cancel': _CancelTaskRequest,
+    'tasks/pushNotification/set': _SetTaskPushNotificationRequest,
+    'tasks/pushNotification/get': _GetTaskPushNotificationRequest,
+    'tasks/resubscribe': _TaskResubscriptionRequest,
+}
+
+
+DECODERS: dict[str, Callable[[Any], Any]] = {
+    'AgentAuthentication': _AgentAuthentication,
+    'AgentCapabilities': _AgentCapabilities,
+    'AgentCard': _AgentCard,
+    'AgentProvider': _AgentProvider,
+    'AgentSkill': _AgentSkill,
+    'Artifact': _Artifact,
+    'AuthenticationInfo': _AuthenticationInfo,
+    'PushNotificationNotSupportedError': _PushNotificationNotSupportedError,
+    'CancelTaskRequest': _CancelTaskRequest,
+    'CancelTaskResponse': _CancelTaskResponse,
+    'DataPart': _DataPart,
+    'FileContent': _FileContent,
+    'FilePart': _FilePart,
+    'GetTaskPushNotificationRequest': _GetTaskPushNotificationRequest,
+    'GetTaskPushNotificationResponse': _GetTaskPushNotificationResponse,
+    'GetTaskRequest': _GetTaskRequest,
+    'GetTaskResponse': _GetTaskResponse,
+    'InternalError': _InternalError,
+    'InvalidParamsError': _InvalidParamsError,
+    'InvalidRequestError': _InvalidRequestError,
+    'JSONParseError': _JSONParseError,
+    'JSONRPCError': _JSONRPCError,
+    'JSONRPCMessage': _JSONRPCMessage,
+    'JSONRPCRequest': _JSONRPCRequest,
+    'JSONRPCResponse': _JSONRPCResponse,
+    'Message': _Message,
+    'MethodNotFoundError': _MethodNotFoundError,
+    'PushNotificationConfig': _PushNotificationConfig,
+    'Part': _Part,
+    'SendTaskRequest': _SendTaskRequest,
+    'SendTaskResponse': _SendTaskResponse,
+    'SendTaskStreamingRequest': _SendTaskStreamingRequest,
+    'SendTaskStreamingResponse': _SendTaskStreamingResponse,
+    'SetTaskPushNotificationRequest': _SetTaskPushNotificationRequest,
+    'SetTaskPushNotificationResponse': _SetTaskPushNotificationResponse,
+    'Task': _Task,
+    'TaskPushNotificationConfig': _TaskPushNotificationConfig,
+    'TaskNotCancelableError': _TaskNotCancelableError,
+    'TaskNotFoundError': _TaskNotFoundError,
+    'TaskIdParams': _TaskIdParams,
+    'TaskQueryParams': _TaskQueryParams,
+    'TaskSendParams': _TaskSendParams,
+    'TaskState': _TaskState,
+    'TaskStatus': _TaskStatus,
+    'TaskResubscriptionRequest': _TaskResubscriptionRequest,
+    'TaskStatusUpdateEvent': _TaskStatusUpdateEvent,
+    'TaskArtifactUpdateEvent': _TaskArtifactUpdateEvent,
+    'TextPart': _TextPart,
+    'UnsupportedOperationError': _UnsupportedOperationError,
+    'A2ARequest': _A2ARequest,
+}
+
+
+class SchemaDecoder:
+    """Decodes one type of the schema, with the interface of a TypeAdapter."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._decode = DECODERS[name]
+
+    def validate_python(self, value: Any) -> Any:
+        return self._decode(value)
+
+    def validate_json(self, data: bytes | str) -> Any:
+        try:
+            value = pydantic_core.from_json(data)
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), '', 0) from e
+        return self._decode(value)
+
+
+def decoder_for(tp: Any) -> SchemaDecoder | None:
+    """Returns the decoder of a common.types type the schema defines."""
+    name = getattr(tp, '__name__', None)
+    if name not in DECODERS or getattr(types, name, None) is not tp:
+        return None
+    return SchemaDecoder(name)
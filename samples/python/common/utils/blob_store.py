@@ -0,0 +1,197 @@
+"""Content-addressed storage for the content of FileParts.
+
+Inline `file.bytes` values are base64 text kept in every message, history
+entry, artifact and event that carries them. A BlobStore keeps each distinct
+payload once, as a file named after its SHA-256 digest, and FileParts refer
+to it through a uri instead.
+"""
+
+import base64
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+
+from collections.abc import Iterable
+from pathlib import Path
+from urllib.parse import urlparse
+
+import httpx
+
+from common.types import FileContent, FilePart, Part
+
+
+BLOB_SCHEME = 'blob:sha256:'
+
+_DIGEST = re.compile(r'[0-9a-f]{64}')
+
+
+class BlobStore:
+    """Stores file payloads in a local directory, keyed by their digest.
+
+    Blob uris are `blob:sha256:<digest>`, or `<base_url>/<digest>` when a
+    base_url is given, for instance that of an A2AServer serving the store.
+    Storing a payload that is already present only counts it in
+    deduplicated. Blobs are read back through memory maps unless use_mmap
+    is off, so readers share the page cache rather than copies of the
+    payload. Files are written to a temporary name and renamed into place,
+    which makes the directory safe to share between processes. Blobs are
+    never deleted by the store.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        base_url: str | None = None,
+        use_mmap: bool = True,
+        inline_limit: int = 4096,
+    ):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.use_mmap = use_mmap
+        self.inline_limit = inline_limit
+        self.stored = 0
+        self.deduplicated = 0
+        (self.root / 'tmp').mkdir(parents=True, exist_ok=True)
+
+    def uri(self, digest: str) -> str:
+        if self.base_url is not None:
+            return f'{self.base_url}/{digest}'
+        return BLOB_SCHEME + digest
+
+    def digest(self, uri: str) -> str | None:
+        """Returns the digest uri refers to, or None if it is not a blob."""
+        if uri.startswith(BLOB_SCHEME):
+            digest = uri[len(BLOB_SCHEME) :]
+        elif self.base_url is not None and uri.startswith(self.base_url + '/'):
+            digest = uri[len(self.base_url) + 1 :]
+        else:
+            return None
+        return digest if _DIGEST.fullmatch(digest) else None
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def __contains__(self, uri: object) -> bool:
+        if not isinstance(uri, str):
+            return False
+        digest = self.digest(uri)
+        return digest is not None and self.path(digest).exists()
+
+    def put(self, data: bytes | memoryview) -> str:
+        """Stores data and returns its uri."""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.path(digest).exists():
+            self.deduplicated += 1
+            return self.uri(digest)
+        fd, path = self.temp_file()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return self.adopt(path, digest)
+
+    def put_base64(self, text: str) -> str:
+        """Decodes base64 text and stores the result."""
+        return self.put(base64.b64decode(text))
+
+    def temp_file(self) -> tuple[int, str]:
+        """Creates a file that adopt() can later move into the store."""
+        return tempfile.mkstemp(prefix='blob-', dir=self.root / 'tmp')
+
+    def adopt(self, path: str, digest: str) -> str:
+        """Moves the file at path, whose content has digest, into the store.
+
+        The file must be on the same filesystem as the store, such as one
+        made by temp_file().
+        """
+        target = self.path(digest)
+        if target.exists():
+            os.unlink(path)
+            self.deduplicated += 1
+        else:
+            target.parent.mkdir(exist_ok=True)
+            os.replace(path, target)
+            self.stored += 1
+        return self.uri(digest)
+
+    def open(self, uri: str) -> memoryview:
+        """Returns a read-only view of the blob uri refers to."""
+        digest = self.digest(uri)
+        if digest is None:
+            raise ValueError(f'Not a blob uri: {uri}')
+        if not self.use_mmap:
+            return memoryview(self.path(digest).read_bytes())
+        return map_file(self.path(digest))
+
+    def externalize(self, parts: Iterable[Part]):
+        """Moves large inline file content of parts into the store.
+
+        Values of at least inline_limit base64 characters are replaced, in
+        place, by the uri of the stored blob.
+        """
+        for part in parts:
+            if not isinstance(part, FilePart):
+                continue
+            file = part.file
+            if file.bytes is None or len(file.bytes) < self.inline_limit:
+                continue
+            part.file = FileContent(
+                name=file.name,
+                mimeType=file.mimeType,
+                uri=self.put_base64(file.bytes),
+            )
+
+
+def map_file(path: str | Path) -> memoryview:
+    """Maps a file into memory read-only."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def read_file_content(
+    file: FileContent, blob_store: BlobStore | None = None
+) -> bytes | memoryview:
+    """Returns the payload of a FileContent.
+
+    Inline base64 content is decoded once; blobs of blob_store are mapped
+    rather than read and come back as memoryviews. Any other uri raises
+    ValueError: file content usually comes from remote input, which must
+    not get to name local files.
+    """
+    if file.bytes is not None:
+        return base64.b64decode(file.bytes)
+    if blob_store is not None and blob_store.digest(file.uri) is not None:
+        return blob_store.open(file.uri)
+    raise ValueError(f'Cannot read file content from {file.uri}')
+
+
+async def fetch_blob(
+    uri: str, agent_url: str, client: httpx.AsyncClient | None = None
+) -> bytes:
+    """Downloads a blob served by the A2A server at agent_url.
+
+    Only http(s) uris on the origin of agent_url whose last path segment is
+    a SHA-256 digest are fetched, and the content has to match the digest,
+    so a remote agent cannot point its peers at other hosts or local files.
+    """
+    parsed = urlparse(uri)
+    agent = urlparse(agent_url)
+    digest = parsed.path.rsplit('/', 1)[-1]
+    if (
+        parsed.scheme not in ('http', 'https')
+        or (parsed.scheme, parsed.netloc) != (agent.scheme, agent.netloc)
+        or not _DIGEST.fullmatch(digest)
+    ):
+        raise ValueError(f'Not a blob of {agent_url}: {uri}')
+    if client is None:
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.get(uri)
+    else:
+        response = await client.get(uri)
+    response.raise_for_status()
+    data = response.content
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f'Content of {uri} does not match its digest')
+    return data
@@ -0,0 +1,90 @@
+"""JSON codecs that move A2A messages between bytes and pydantic models."""
+
+import json
+
+from typing import Any, TypeVar
+
+import pydantic_core
+
+from common.utils.serialization import type_adapter
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+T = TypeVar('T')
+
+
+class JSONCodec:
+    """Encodes and decodes JSON-RPC payloads straight from and to bytes.
+
+    Typed payloads are validated with `validate_json` and serialized with the
+    model's compiled serializer, so a Task is walked once in each direction
+    and no intermediate dict is built. Untyped values go through `loads` and
+    `dumps`, which subclasses may back with a faster JSON library.
+    """
+
+    name = 'pydantic'
+    media_type = 'application/json'
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return pydantic_core.from_json(data)
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), '', 0) from e
+
+    def dumps(self, value: Any) -> bytes:
+        return pydantic_core.to_json(value)
+
+    def decode(self, target: type[T] | TypeAdapter[T], data: bytes | str) -> T:
+        if isinstance(target, type) and issubclass(target, BaseModel):
+            return target.model_validate_json(data)
+        if isinstance(target, TypeAdapter) or not hasattr(
+            target, 'validate_python'
+        ):
+            return type_adapter(target).validate_json(data)
+        # Decoders of parsed values, such as the schema decoders.
+        return target.validate_python(self.loads(data))
+
+    def encode(self, model: BaseModel) -> bytes:
+        return model.__pydantic_serializer__.to_json(model, exclude_none=True)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSONCodec that uses orjson for untyped values."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires the orjson package')
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+
+def get_codec(name: str | None = None) -> JSONCodec:
+    """Returns the codec called name, or the fastest one installed."""
+    if name is None:
+        name = 'orjson' if orjson is not None else 'pydantic'
+    if name == 'orjson':
+        return OrjsonCodec()
+    if name == 'pydantic':
+        return JSONCodec()
+    raise ValueError(f'Unknown codec: {name}')
+
+
+def is_json_error(e: Exception) -> bool:
+    """Whether e was raised because the input was not valid JSON."""
+    if isinstance(e, json.JSONDecodeError):
+        return True
+    return isinstance(e, ValidationError) and any(
+        error['type'] == 'json_invalid' for error in e.errors()
+    )
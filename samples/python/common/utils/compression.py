@@ -0,0 +1,141 @@
+"""Content-Encoding support shared by the A2A server and client.
+
+gzip is always available. brotli (`br`) and zstandard (`zstd`) are used when
+their packages are installed.
+"""
+
+import gzip
+import zlib
+
+from collections.abc import Callable
+
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class StreamCompressor:
+    """Compresses a body chunk by chunk, flushing after every chunk.
+
+    Each call to compress() returns bytes the peer can decode right away,
+    which is what an SSE stream needs to deliver events without delay.
+    """
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+
+class GzipStreamCompressor(StreamCompressor):
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliStreamCompressor(StreamCompressor):
+    def __init__(self, quality: int = 4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdStreamCompressor(StreamCompressor):
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=4)
+
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+# Ordered by server preference, used to break ties between equal q-values.
+ENCODINGS: dict[str, tuple[Callable[[bytes], bytes], type[StreamCompressor]]]
+ENCODINGS = {}
+if zstandard is not None:
+    ENCODINGS['zstd'] = (_zstd, ZstdStreamCompressor)
+if brotli is not None:
+    ENCODINGS['br'] = (_brotli, BrotliStreamCompressor)
+ENCODINGS['gzip'] = (_gzip, GzipStreamCompressor)
+
+
+def available_encodings() -> list[str]:
+    return list(ENCODINGS)
+
+
+def accept_encoding_header() -> str:
+    """The Accept-Encoding value advertising every installed encoding."""
+    return ', '.join(available_encodings())
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Picks the encoding to use for a request's Accept-Encoding header.
+
+    Returns None when the client accepts none of the installed encodings.
+    """
+    weights: dict[str, float] = {}
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best = None
+    best_q = 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    return ENCODINGS[encoding][0](data)
+
+
+def stream_compressor(encoding: str) -> StreamCompressor:
+    return ENCODINGS[encoding][1]()
@@ -4,7 +4,7 @@ import logging
 import time
 import uuid
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import httpx
 import jwt
@@ -15,6 +15,10 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 
+if TYPE_CHECKING:
+    from common.server.metrics import ServerMetrics
+
+
 logger = logging.getLogger(__name__)
 AUTH_HEADER_PREFIX = 'Bearer '
 
@@ -36,9 +40,10 @@ class PushNotificationAuth:
 
 
 class PushNotificationSenderAuth(PushNotificationAuth):
-    def __init__(self):
+    def __init__(self, metrics: 'ServerMetrics | None' = None):
         self.public_keys = []
         self.private_key_jwk: PyJWK = None
+        self.metrics = metrics
 
     @staticmethod
     async def verify_push_notification_url(url: str) -> bool:
@@ -96,15 +101,22 @@ class PushNotificationSenderAuth(PushNotificationAuth):
     async def send_push_notification(self, url: str, data: dict[str, Any]):
         jwt_token = self._generate_jwt(data)
         headers = {'Authorization': f'Bearer {jwt_token}'}
+        started = time.perf_counter()
+        success = False
         async with httpx.AsyncClient(timeout=10) as client:
             try:
                 response = await client.post(url, json=data, headers=headers)
                 response.raise_for_status()
+                success = True
                 logger.info(f'Push-notification sent for URL: {url}')
             except Exception as e:
                 logger.warning(
                     f'Error during sending push-notification for URL {url}: {e}'
                 )
+        if self.metrics is not None:
+            self.metrics.observe_push_notification(
+                time.perf_counter() - started, success
+            )
 
 
 class PushNotificationReceiverAuth(PushNotificationAuth):
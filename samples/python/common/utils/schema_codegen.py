@@ -0,0 +1,529 @@
+"""Compiles the A2A JSON schema into a module of standalone decoders.
+
+For every definition in specification/json/a2a.json the generated module
+has a function that checks a parsed JSON value against the schema and
+builds the common.types model of the same name from it with the trusted
+builders, so every value is looked at exactly once. Models with
+validators of their own, and models whose required fields the schema does
+not describe, are validated by pydantic after the schema check.
+
+Regenerate the module after changing the schema or the models, from the
+samples/python directory:
+
+    uv run python -m common.utils.schema_codegen
+
+With --check, the module is left alone and the command fails if it is out
+of date.
+"""
+
+import argparse
+import json
+import re
+import sys
+
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from common import types
+from pydantic import BaseModel
+
+
+SCHEMA_PATH = Path(__file__).parents[4] / 'specification' / 'json' / 'a2a.json'
+OUTPUT_PATH = Path(__file__).with_name('a2a_schema.py')
+
+LINE_LENGTH = 80
+
+# Keywords that carry documentation only.
+_ANNOTATIONS = {'title', 'description', 'default', 'examples', '$schema'}
+
+_TYPE_CHECKS = {
+    'string': ('isinstance({0}, str)', 'must be a string'),
+    'integer': ('type({0}) is int', 'must be an integer'),
+    'boolean': ('type({0}) is bool', 'must be a boolean'),
+    'object': ('isinstance({0}, dict)', 'must be an object'),
+    'array': ('isinstance({0}, list)', 'must be an array'),
+}
+
+_HEADER = '''\
+"""Decoders for the A2A types, generated from the A2A JSON schema.
+
+Generated by common.utils.schema_codegen from specification/json/a2a.json.
+Do not edit; regenerate instead.
+"""
+
+# ruff: noqa
+
+import json
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import pydantic_core
+
+from pydantic import ValidationError
+
+from common import types
+from common.utils import trusted
+
+
+class SchemaValidationError(ValueError):
+    """Raised for a value that does not conform to the A2A JSON schema.
+
+    loc holds the path to the offending value, as keys and list indexes.
+    """
+
+    def __init__(self, message: str, loc: list[str | int] | None = None):
+        super().__init__(message)
+        self.message = message
+        self.loc = loc or []
+
+    def __str__(self) -> str:
+        if not self.loc:
+            return self.message
+        return '/'.join(map(str, self.loc)) + ': ' + self.message
+
+    def errors(self) -> list[dict[str, Any]]:
+        """The error in the shape of pydantic's ValidationError.errors()."""
+        return [{'type': 'schema', 'loc': self.loc, 'msg': self.message}]
+
+
+_MISSING = object()
+
+
+def _datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise SchemaValidationError('must be a date-time') from None
+
+
+def _failing_index(decode: Callable[[Any], Any], items: list) -> int:
+    for index, item in enumerate(items):
+        try:
+            decode(item)
+        except SchemaValidationError:
+            return index
+    return -1
+
+
+def _validated(model: type, data: dict) -> Any:
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        error = e.errors()[0]
+        raise SchemaValidationError(error['msg'], list(error['loc'])) from None
+'''
+
+_FOOTER = '''
+
+class SchemaDecoder:
+    """Decodes one type of the schema, with the interface of a TypeAdapter."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._decode = DECODERS[name]
+
+    def validate_python(self, value: Any) -> Any:
+        return self._decode(value)
+
+    def validate_json(self, data: bytes | str) -> Any:
+        try:
+            value = pydantic_core.from_json(data)
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), '', 0) from e
+        return self._decode(value)
+
+
+def decoder_for(tp: Any) -> SchemaDecoder | None:
+    """Returns the decoder of a common.types type the schema defines."""
+    name = getattr(tp, '__name__', None)
+    if name not in DECODERS or getattr(types, name, None) is not tp:
+        return None
+    return SchemaDecoder(name)
+'''
+
+
+def _constant(name: str) -> str:
+    return (
+        '_'
+        + re.sub(
+            r'(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])', '_', name
+        ).upper()
+    )
+
+
+def _fit(indent: int, head: str, args: list[str], tail: str) -> list[str]:
+    """Lays out a call the way ruff format does."""
+    pad = ' ' * indent
+    line = f'{pad}{head}{", ".join(args)}{tail}'
+    if len(line) <= LINE_LENGTH:
+        return [line]
+    inner = f'{pad}    {", ".join(args)}'
+    if len(inner) <= LINE_LENGTH:
+        return [f'{pad}{head}', inner, f'{pad}{tail}']
+    return (
+        [f'{pad}{head}']
+        + [f'{pad}    {arg},' for arg in args]
+        + [f'{pad}{tail}']
+    )
+
+
+def _negate(check: str) -> str:
+    if ' is ' in check:
+        return check.replace(' is ', ' is not ')
+    return f'not {check}'
+
+
+def _raise(indent: int, message: str, loc: list[str]) -> list[str]:
+    args = [repr(message)]
+    if loc:
+        args.append(f'[{", ".join(loc)}]')
+    return _fit(indent, 'raise SchemaValidationError(', args, ')')
+
+
+def _unsupported(node: dict[str, Any], supported: set[str]) -> None:
+    unknown = set(node) - supported - _ANNOTATIONS
+    if unknown:
+        raise NotImplementedError(f'Unsupported keywords: {sorted(unknown)}')
+
+
+class _Generator:
+    def __init__(self, schema: dict[str, Any]):
+        self.defs: dict[str, Any] = schema['$defs']
+        self.functions: list[list[str]] = []
+        self.tables: list[list[str]] = []
+        self.unions = 0
+
+    def generate(self) -> str:
+        builders = []
+        for name, node in self.defs.items():
+            if 'properties' in node:
+                builders += _fit(
+                    0,
+                    f'_build_{name} = trusted.builder(',
+                    [f'types.{name}'],
+                    ')',
+                )
+            self.functions.append(self._definition(name, node))
+        table = ['DECODERS: dict[str, Callable[[Any], Any]] = {']
+        table += [f'    {name!r}: _{name},' for name in self.defs]
+        table.append('}')
+        blocks = [
+            _HEADER.rstrip('\n'),
+            '\n'.join(builders),
+            *('\n'.join(lines) for lines in self.functions),
+            '\n\n'.join('\n'.join(lines) for lines in self.tables),
+            '\n'.join(table),
+        ]
+        return '\n\n\n'.join(blocks) + '\n' + _FOOTER
+
+    def _definition(self, name: str, node: dict[str, Any]) -> list[str]:
+        if 'properties' in node:
+            return self._object(name, node)
+        if 'enum' in node:
+            return self._enum(name, node)
+        if 'anyOf' in node or 'oneOf' in node:
+            return self._union(f'_{name}', node)
+        raise NotImplementedError(f'Unsupported definition: {name}')
+
+    def _object(self, name: str, node: dict[str, Any]) -> list[str]:
+        _unsupported(
+            node, {'type', 'properties', 'required', 'additionalProperties'}
+        )
+        if node.get('additionalProperties', {}) != {}:
+            raise NotImplementedError(f'Unsupported object: {name}')
+        model = getattr(types, name, None)
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            raise NotImplementedError(f'No model for definition: {name}')
+        properties = node['properties']
+        required = set(node.get('required', ()))
+        fields = model.model_fields
+        for field, info in fields.items():
+            if info.is_required() and field in properties:
+                # The model is stricter than the schema here.
+                required.add(field)
+        decorators = model.__pydantic_decorators__
+        # The builders drop extra fields and run no validators.
+        validated = (
+            model.model_config.get('extra') == 'allow'
+            or bool(decorators.model_validators or decorators.field_validators)
+        ) or any(
+            info.is_required() and field not in properties
+            for field, info in fields.items()
+        )
+
+        signature = [f'def _{name}(data: Any) -> types.{name}:']
+        if len(signature[0]) > LINE_LENGTH:
+            signature = [
+                f'def _{name}(',
+                '    data: Any,',
+                f') -> types.{name}:',
+            ]
+        lines = [
+            *signature,
+            '    if not isinstance(data, dict):',
+            *_raise(8, 'must be an object', []),
+        ]
+        if not validated:
+            lines.append('    fields = {}')
+        for key, prop in properties.items():
+            lines.append(f'    value = data.get({key!r}, _MISSING)')
+            indent = 4
+            if key in required:
+                lines.append('    if value is _MISSING:')
+                lines += _raise(8, 'is required', [repr(key)])
+            else:
+                lines.append('    if value is not _MISSING:')
+                indent = 8
+            body = self._value(prop, 'value', [repr(key)], indent)
+            if not validated and key in fields:
+                body.append(f'{" " * indent}fields[{key!r}] = value')
+            if not body and key not in required:
+                body = ['        pass']
+            lines += body
+        if validated:
+            lines.append(f'    return _validated(types.{name}, data)')
+        else:
+            lines.append(f'    return _build_{name}(**fields)')
+        return lines
+
+    def _enum(self, name: str, node: dict[str, Any]) -> list[str]:
+        _unsupported(node, {'type', 'enum'})
+        values = _constant(name) + '_VALUES'
+        convert = '{0!r}'
+        model = getattr(types, name, None)
+        if isinstance(model, type) and issubclass(model, Enum):
+            convert = f'types.{name}({{0!r}})'
+        lines = [f'{values} = {{']
+        lines += [
+            f'    {value!r}: {convert.format(value)},' for value in node['enum']
+        ]
+        lines += [
+            '}',
+            '',
+            '',
+            f'def _{name}(value: Any) -> Any:',
+            '    try:',
+            f'        return {values}[value]',
+            '    except (KeyError, TypeError):',
+        ]
+        message = 'must be one of ' + ', '.join(node['enum'])
+        lines += _fit(
+            8, 'raise SchemaValidationError(', [repr(message)], ') from None'
+        )
+        return lines
+
+    def _union(self, function: str, node: dict[str, Any]) -> list[str]:
+        _unsupported(node, {'anyOf', 'oneOf'})
+        one_of = 'oneOf' in node
+        names = []
+        for alternative in node['oneOf' if one_of else 'anyOf']:
+            if set(alternative) != {'$ref'}:
+                raise NotImplementedError(f'Unsupported union: {node}')
+            names.append(alternative['$ref'].rsplit('/', 1)[-1])
+        message = 'does not match any of ' + ', '.join(names)
+        signature = f'def {function}(data: Any) -> Any:'
+
+        key = self._discriminator(names)
+        if key is not None:
+            table = _constant(function.lstrip('_')) + '_BY_' + key.upper()
+            entries = [
+                f'    {self.defs[name]["properties"][key]["const"]!r}: _{name},'
+                for name in names
+            ]
+            # Emitted after the functions it refers to.
+            self.tables.append([f'{table} = {{', *entries, '}'])
+            return [
+                signature,
+                '    try:',
+                f'        decode = {table}[data[{key!r}]]',
+                '    except (KeyError, TypeError):',
+                *_fit(
+                    8,
+                    'raise SchemaValidationError(',
+                    [repr(message)],
+                    ') from None',
+                ),
+                '    return decode(data)',
+            ]
+
+        decoders = ', '.join(f'_{name}' for name in names)
+        if not one_of:
+            return [
+                signature,
+                f'    for decode in ({decoders}):',
+                '        try:',
+                '            return decode(data)',
+                '        except SchemaValidationError:',
+                '            pass',
+                *_raise(4, message, []),
+            ]
+        return [
+            signature,
+            '    matches = []',
+            f'    for decode in ({decoders}):',
+            '        try:',
+            '            matches.append(decode(data))',
+            '        except SchemaValidationError:',
+            '            pass',
+            '    if len(matches) != 1:',
+            *_raise(8, 'must match exactly one of ' + ', '.join(names), []),
+            '    return matches[0]',
+        ]
+
+    def _discriminator(self, names: list[str]) -> str | None:
+        """A required property with a distinct constant in every type."""
+        candidates = None
+        for name in names:
+            node = self.defs[name]
+            keys = {
+                key
+                for key, prop in node.get('properties', {}).items()
+                if 'const' in prop and key in node.get('required', ())
+            }
+            candidates = keys if candidates is None else candidates & keys
+        for key in sorted(candidates or ()):
+            consts = [
+                self.defs[name]['properties'][key]['const'] for name in names
+            ]
+            if len(set(consts)) == len(consts):
+                return key
+        return None
+
+    def _value(
+        self, node: dict[str, Any], var: str, loc: list[str], indent: int
+    ) -> list[str]:
+        """Statements that check var against node, converting it in place."""
+        pad = ' ' * indent
+        if '$ref' in node:
+            _unsupported(node, {'$ref'})
+            return self._call(
+                f'_{node["$ref"].rsplit("/", 1)[-1]}', var, loc, indent
+            )
+        if 'anyOf' in node or 'oneOf' in node:
+            alternatives = node.get('anyOf') or node['oneOf']
+            if all(set(alt) - _ANNOTATIONS == {'type'} for alt in alternatives):
+                checks = [_TYPE_CHECKS[alt['type']] for alt in alternatives]
+                condition = ' or '.join(
+                    check.format(var) for check, _ in checks
+                )
+                kinds = ' or '.join(alt['type'] for alt in alternatives)
+                return [
+                    f'{pad}if not ({condition}):',
+                    *_raise(indent + 4, f'must be a {kinds}', loc),
+                ]
+            self.unions += 1
+            function = f'_union_{self.unions}'
+            self.functions.append(self._union(function, node))
+            return self._call(function, var, loc, indent)
+
+        _unsupported(
+            node,
+            {
+                'type',
+                'const',
+                'enum',
+                'format',
+                'items',
+                'additionalProperties',
+            },
+        )
+        lines = []
+        kind = node.get('type')
+        if kind is not None:
+            check, message = _TYPE_CHECKS[kind]
+            lines += [
+                f'{pad}if {_negate(check.format(var))}:',
+                *_raise(indent + 4, message, loc),
+            ]
+        if 'const' in node:
+            lines += [
+                f'{pad}if {var} != {node["const"]!r}:',
+                *_raise(indent + 4, f'must be {node["const"]!r}', loc),
+            ]
+        if 'enum' in node:
+            values = ', '.join(map(repr, node['enum']))
+            message = 'must be one of ' + ', '.join(map(str, node['enum']))
+            lines += [
+                f'{pad}if {var} not in ({values}):',
+                *_raise(indent + 4, message, loc),
+            ]
+        if node.get('format') == 'date-time':
+            lines += self._call('_datetime', var, loc, indent)
+        if node.get('additionalProperties', {}) != {}:
+            raise NotImplementedError(f'Unsupported object: {node}')
+        if 'items' in node:
+            lines += self._items(node['items'], var, loc, indent)
+        return lines
+
+    def _items(
+        self, node: dict[str, Any], var: str, loc: list[str], indent: int
+    ) -> list[str]:
+        pad = ' ' * indent
+        if '$ref' not in node and (
+            'format' in node or 'anyOf' in node or 'oneOf' in node
+        ):
+            # Would have to convert items in place.
+            raise NotImplementedError(f'Unsupported items: {node}')
+        body = self._value(node, 'item', [*loc, 'index'], indent + 4)
+        if not body:
+            return []
+        if '$ref' not in node:
+            return [f'{pad}for index, item in enumerate({var}):', *body]
+        function = f'_{node["$ref"].rsplit("/", 1)[-1]}'
+        return [
+            f'{pad}try:',
+            f'{pad}    {var} = [{function}(item) for item in {var}]',
+            f'{pad}except SchemaValidationError as e:',
+            *_fit(
+                indent + 4,
+                'e.loc[:0] = [',
+                [*loc, f'_failing_index({function}, {var})'],
+                ']',
+            ),
+            f'{pad}    raise',
+        ]
+
+    def _call(
+        self, function: str, var: str, loc: list[str], indent: int
+    ) -> list[str]:
+        pad = ' ' * indent
+        return [
+            f'{pad}try:',
+            f'{pad}    {var} = {function}({var})',
+            f'{pad}except SchemaValidationError as e:',
+            *_fit(indent + 4, 'e.loc[:0] = [', loc, ']'),
+            f'{pad}    raise',
+        ]
+
+
+def generate(schema: dict[str, Any]) -> str:
+    """Returns the source of the decoder module for schema."""
+    return _Generator(schema).generate()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--schema', type=Path, default=SCHEMA_PATH)
+    parser.add_argument('--output', type=Path, default=OUTPUT_PATH)
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='fail if the output is not up to date instead of writing it',
+    )
+    args = parser.parse_args(argv)
+    source = generate(json.loads(args.schema.read_text()))
+    if args.check:
+        current = args.output.read_text() if args.output.exists() else ''
+        if current != source:
+            print(f'{args.output} is out of date', file=sys.stderr)
+            return 1
+        return 0
+    args.output.write_text(source)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Cached adapters and templated encoding for the A2A types on hot paths.
+
+Pydantic models carry a validator and serializer compiled when the class is
+created, and JSONCodec calls them directly. Anything else, such as a union
+of request types or a list of tasks, needs a TypeAdapter, which compiles a
+schema every time one is built; type_adapter() builds each of them once.
+
+Streams also repeat the same status update over and over, typically the
+WORKING update carrying an agent's constant processing message. A
+StatusUpdateTemplate encodes such an event once and afterwards only splices
+in the task id and timestamp.
+"""
+
+import functools
+
+from datetime import datetime
+from typing import Any
+
+import pydantic_core
+
+from pydantic import TypeAdapter
+
+from common.types import (
+    GetTaskResponse,
+    Message,
+    SendTaskResponse,
+    SendTaskStreamingResponse,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.utils import trusted
+
+
+HOT_TYPES = (
+    SendTaskStreamingResponse,
+    SendTaskResponse,
+    GetTaskResponse,
+    TaskStatusUpdateEvent,
+    TaskArtifactUpdateEvent,
+    Task,
+)
+
+
+@functools.cache
+def type_adapter(tp: Any) -> TypeAdapter:
+    """Returns the TypeAdapter of tp, building it on first use only."""
+    if isinstance(tp, TypeAdapter):
+        return tp
+    return TypeAdapter(tp)
+
+
+for _tp in HOT_TYPES:
+    type_adapter(_tp)
+
+
+def to_json(model: Any) -> bytes:
+    """Encodes a model with its compiled serializer, leaving out nulls."""
+    return model.__pydantic_serializer__.to_json(model, exclude_none=True)
+
+
+# Stand-ins that cannot occur in real events, replaced on rendering.
+_TASK_ID = 'a2a-template-task-id-2c1f0b'
+_TIMESTAMP = datetime(1, 1, 1, microsecond=7)
+
+
+class StatusUpdateTemplate:
+    """A TaskStatusUpdateEvent encoded once, for a fixed state and message.
+
+    event() returns an event for a given task and time together with its
+    JSON, which the A2AServer then sends without serializing the event.
+    All events of a template share its message object, which must not be
+    modified.
+    """
+
+    def __init__(
+        self, state: TaskState, message: Message | None, final: bool = False
+    ):
+        self.state = state
+        self.message = message
+        self.final = final
+        sample = trusted.status_update(
+            id=_TASK_ID,
+            status=trusted.task_status(
+                state=state, message=message, timestamp=_TIMESTAMP
+            ),
+            final=final,
+        )
+        encoded = to_json(sample)
+        task_id = pydantic_core.to_json(_TASK_ID)
+        timestamp = _TIMESTAMP.isoformat().encode()
+        # The event id comes before its status, and so before the timestamp.
+        self._head, rest = encoded.split(task_id)
+        self._middle, self._tail = rest.split(timestamp)
+
+    def event(
+        self, task_id: str, timestamp: datetime | None = None
+    ) -> TaskStatusUpdateEvent:
+        timestamp = timestamp or datetime.now()
+        event = trusted.status_update(
+            id=task_id,
+            status=trusted.task_status(
+                state=self.state, message=self.message, timestamp=timestamp
+            ),
+            final=self.final,
+        )
+        event._json = b''.join(
+            (
+                self._head,
+                pydantic_core.to_json(task_id),
+                self._middle,
+                timestamp.isoformat().encode(),
+                self._tail,
+            )
+        )
+        return event
+
+
+@functools.lru_cache(maxsize=256)
+def status_template(
+    state: TaskState, text: str | None = None, final: bool = False
+) -> StatusUpdateTemplate:
+    """Returns the template of status updates with an optional agent text."""
+    message = None
+    if text is not None:
+        message = Message(role='agent', parts=[TextPart(text=text)])
+    return StatusUpdateTemplate(state, message, final)
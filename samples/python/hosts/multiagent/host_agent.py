@@ -1,4 +1,3 @@
-import base64
 import json
 import uuid
 
@@ -13,6 +12,7 @@ from common.types import (
     TaskState,
     TextPart,
 )
+from common.utils.blob_store import fetch_blob, read_file_content
 from google.adk import Agent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.readonly_context import ReadonlyContext
@@ -204,22 +204,28 @@ Current agent: {current_agent['active_agent']}
         if task.status.message:
             # Assume the information is in the task message.
             response.extend(
-                convert_parts(task.status.message.parts, tool_context)
+                await convert_parts(
+                    task.status.message.parts, tool_context, card.url
+                )
             )
         if task.artifacts:
             for artifact in task.artifacts:
-                response.extend(convert_parts(artifact.parts, tool_context))
+                response.extend(
+                    await convert_parts(artifact.parts, tool_context, card.url)
+                )
         return response
 
 
-def convert_parts(parts: list[Part], tool_context: ToolContext):
+async def convert_parts(
+    parts: list[Part], tool_context: ToolContext, agent_url: str
+):
     rval = []
     for p in parts:
-        rval.append(convert_part(p, tool_context))
+        rval.append(await convert_part(p, tool_context, agent_url))
     return rval
 
 
-def convert_part(part: Part, tool_context: ToolContext):
+async def convert_part(part: Part, tool_context: ToolContext, agent_url: str):
     if part.type == 'text':
         return part.text
     if part.type == 'data':
@@ -228,7 +234,11 @@ def convert_part(part: Part, tool_context: ToolContext):
         # Repackage A2A FilePart to google.genai Blob
         # Currently not considering plain text as files
         file_id = part.file.name
-        file_bytes = base64.b64decode(part.file.bytes)
+        if part.file.uri is not None:
+            # Only blobs the remote agent serves itself are fetched.
+            file_bytes = await fetch_blob(part.file.uri, agent_url)
+        else:
+            file_bytes = read_file_content(part.file)
         file_part = types.Part(
             inline_data=types.Blob(
                 mime_type=part.file.mimeType, data=file_bytes
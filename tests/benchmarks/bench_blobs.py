@@ -0,0 +1,84 @@
+"""Memory held by tasks that exchange image attachments.
+
+Every turn of every task sends the same image inline and gets it back in an
+artifact, as in flows that pass a chart around. Without a blob store each
+copy stays in the task as base64 text; with one the tasks only hold uris
+and the store keeps a single file.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_blobs.py
+"""
+
+import asyncio
+import base64
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench_utils import EchoTaskManager
+from common.types import (
+    Artifact,
+    FileContent,
+    FilePart,
+    Message,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+)
+from common.utils.blob_store import BlobStore
+
+
+TASKS = 50
+TURNS = 4
+IMAGE_SIZE = 256 * 1024
+
+
+def image_part(encoded: str) -> FilePart:
+    return FilePart(
+        file=FileContent(name='chart.png', mimeType='image/png', bytes=encoded)
+    )
+
+
+async def run(blob_store: BlobStore | None) -> tuple[float, int]:
+    manager = EchoTaskManager(blob_store=blob_store)
+    encoded = base64.b64encode(os.urandom(IMAGE_SIZE)).decode()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(TASKS):
+        for _ in range(TURNS):
+            # Every request and response decodes into its own string, as it
+            # would off the wire.
+            message = Message(
+                role='user', parts=[image_part(encoded.encode().decode())]
+            )
+            params = TaskSendParams(id=f't{i}', message=message)
+            await manager.upsert_task(params)
+            await manager.update_store(
+                f't{i}',
+                TaskStatus(state=TaskState.INPUT_REQUIRED),
+                [Artifact(parts=[image_part(encoded.encode().decode())])],
+            )
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, current
+
+
+async def main():
+    print(
+        f'{TASKS} tasks x {TURNS} turns, {IMAGE_SIZE // 1024} KiB image in'
+        ' and out per turn'
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, blob_store in (('inline', None), ('blobs', BlobStore(tmp))):
+            elapsed, held = await run(blob_store)
+            print(
+                f'{name:<7} {elapsed:6.2f}s'
+                f'  {held / TASKS / 2**20:7.2f} MiB held per task'
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
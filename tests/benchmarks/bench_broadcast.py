@@ -0,0 +1,82 @@
+"""One producer broadcasting task events to 1k SSE subscribers.
+
+Measures fan-out through enqueue_events_for_sse and the cost of encoding
+every delivered event for the wire, once with a full serialization per
+subscriber and once with the event JSON shared between subscribers.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_broadcast.py
+"""
+
+import asyncio
+import time
+
+from bench_utils import EchoTaskManager, make_agent_card
+from common.server import A2AServer
+from common.types import (
+    Artifact,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+SUBSCRIBERS = 1_000
+EVENTS = 200
+
+
+def make_events():
+    return [
+        TaskArtifactUpdateEvent(
+            id='t1',
+            artifact=Artifact(parts=[TextPart(text='price ' * 100)]),
+        )
+        if i % 2
+        else TaskStatusUpdateEvent(
+            id='t1', status=TaskStatus(state=TaskState.WORKING)
+        )
+        for i in range(EVENTS)
+    ]
+
+
+async def run(encode) -> tuple[float, float]:
+    manager = EchoTaskManager(sse_queue_size=None)
+    queues = [
+        await manager.setup_sse_consumer('t1') for _ in range(SUBSCRIBERS)
+    ]
+    start = time.perf_counter()
+    for event in make_events():
+        await manager.enqueue_events_for_sse('t1', event)
+    fan_out = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for request_id, queue in enumerate(queues):
+        while not queue.empty():
+            _, event = queue.get_nowait()
+            encode(SendTaskStreamingResponse(id=request_id, result=event))
+    return fan_out, time.perf_counter() - start
+
+
+async def main():
+    server = A2AServer(
+        agent_card=make_agent_card(), task_manager=EchoTaskManager()
+    )
+    deliveries = SUBSCRIBERS * EVENTS
+    print(f'{EVENTS} events to {SUBSCRIBERS} subscribers')
+    for name, encode in (
+        ('per subscriber', server.codec.encode),
+        ('shared', server._encode_stream_item),
+    ):
+        fan_out, encoding = await run(encode)
+        print(
+            f'{name:<15} fan-out {deliveries / fan_out:12,.0f} deliveries/s'
+            f'  encode {deliveries / encoding:10,.0f} events/s'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Memory held per 1k-message task, by InMemoryTaskStore and CompactTaskStore.
+
+Each task gets its history the way InMemoryTaskManager builds it, one
+appended message per turn, with messages validated from the JSON a client
+would send. Memory is what tracemalloc sees allocated once the messages
+themselves are no longer referenced by anything but the store; the text
+of the messages is counted in both cases.
+
+Also reports how long CompactTaskStore takes to turn a stored task back
+into a Task model when it is not cached, and to count its tasks by state
+as /metrics does.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_compact_store.py
+"""
+
+import gc
+import time
+import tracemalloc
+
+from common.server.task_store import (
+    CompactTaskStore,
+    InMemoryTaskStore,
+    TaskStore,
+)
+from common.types import Message, Task, TaskState, TaskStatus
+
+
+TASKS = 20
+MESSAGES = 1000
+
+
+def message_json(i: int) -> bytes:
+    role = 'user' if i % 2 == 0 else 'agent'
+    text = (
+        f'Turn {i}: the RSI for AAPL closed at {40 + i % 30} '
+        'and the MACD histogram turned positive.'
+    )
+    return b'{"role":"%b","parts":[{"type":"text","text":"%b"}]}' % (
+        role.encode(),
+        text.encode(),
+    )
+
+
+def fill(store: TaskStore):
+    for t in range(TASKS):
+        task_id = f'task-{t}'
+        store.upsert(
+            Task(
+                id=task_id,
+                sessionId='session',
+                status=TaskStatus(state=TaskState.WORKING),
+                history=[],
+            )
+        )
+        for i in range(MESSAGES):
+            message = Message.model_validate_json(message_json(i))
+            store.append_history(task_id, message)
+
+
+def measure(make_store) -> tuple[TaskStore, float]:
+    gc.collect()
+    tracemalloc.start()
+    store = make_store()
+    fill(store)
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, used / TASKS
+
+
+def main():
+    print(f'{TASKS} tasks of {MESSAGES} text messages each')
+    _, in_memory = measure(InMemoryTaskStore)
+    print(f'  InMemoryTaskStore        {in_memory / 1024:>8,.0f} KiB/task')
+    store, compact = measure(lambda: CompactTaskStore(cache_size=0))
+    print(
+        f'  CompactTaskStore         {compact / 1024:>8,.0f} KiB/task '
+        f'({in_memory / compact:.1f}x less)'
+    )
+
+    start = time.perf_counter()
+    for t in range(TASKS):
+        store[f'task-{t}']
+    elapsed = (time.perf_counter() - start) / TASKS
+    print(f'  uncached read of one task {elapsed * 1000:>7.2f} ms')
+
+    start = time.perf_counter()
+    store.count_by('$.status.state')
+    elapsed = time.perf_counter() - start
+    print(f'  count of tasks by state   {elapsed * 1000:>7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Bytes on the wire and CPU cost of each response Content-Encoding.
+
+Covers large GetTaskResponse payloads (long history, a 250-day daily_data
+DataPart, a base64 FilePart) and an SSE stream compressed per event.
+
+    uv run python benchmarks/bench_compression.py
+"""
+
+import gzip
+import time
+
+from payloads import get_task_responses
+
+from common.types import (
+    SendTaskStreamingResponse,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+)
+from common.utils.codec import get_codec
+from common.utils.compression import (
+    available_encodings,
+    brotli,
+    compress,
+    stream_compressor,
+    zstandard,
+)
+
+
+DECOMPRESS = {'gzip': gzip.decompress}
+if brotli is not None:
+    DECOMPRESS['br'] = brotli.decompress
+if zstandard is not None:
+    DECOMPRESS['zstd'] = zstandard.ZstdDecompressor().decompress
+
+
+def timed(func, *args, repeat: int = 20) -> float:
+    """Best wall time of func(*args) in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_responses():
+    codec = get_codec()
+    print(
+        f'{"payload":24} {"encoding":8} {"bytes":>10} {"ratio":>6}'
+        f' {"encode ms":>10} {"decode ms":>10}'
+    )
+    for name, response in get_task_responses().items():
+        body = codec.encode(response)
+        print(f'{name:24} {"identity":8} {len(body):>10,} {1:>6.2f}')
+        for encoding in available_encodings():
+            compressed = compress(body, encoding)
+            print(
+                f'{"":24} {encoding:8} {len(compressed):>10,}'
+                f' {len(body) / len(compressed):>6.2f}'
+                f' {timed(compress, body, encoding):>10.3f}'
+                f' {timed(DECOMPRESS[encoding], compressed):>10.3f}'
+            )
+
+
+def bench_sse(events: int = 500):
+    codec = get_codec()
+    frames = []
+    for i in range(events):
+        response = SendTaskStreamingResponse(
+            id=1,
+            result=TaskStatusUpdateEvent(
+                id='task',
+                status=TaskStatus(state=TaskState.WORKING),
+                final=i == events - 1,
+            ),
+        )
+        frames.append(b'id: %d\ndata: %b\n\n' % (i, codec.encode(response)))
+    identity = sum(map(len, frames))
+    print(f'\nSSE, {events} status events flushed one by one')
+    print(f'{"encoding":8} {"bytes":>10} {"ratio":>6} {"us/event":>9}')
+    print(f'{"identity":8} {identity:>10,} {1:>6.2f}')
+    for encoding in available_encodings():
+        start = time.perf_counter()
+        compressor = stream_compressor(encoding)
+        size = sum(len(compressor.compress(frame)) for frame in frames)
+        size += len(compressor.finish())
+        per_event = (time.perf_counter() - start) / events * 1e6
+        print(
+            f'{encoding:8} {size:>10,} {identity / size:>6.2f}'
+            f' {per_event:>9.1f}'
+        )
+
+
+if __name__ == '__main__':
+    bench_responses()
+    bench_sse()
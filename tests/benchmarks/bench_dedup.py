@@ -0,0 +1,86 @@
+"""Agent invocations when clients retry tasks/send before it answers.
+
+Every task is sent RETRIES times in quick succession, as a client with a
+short timeout would. Without deduplication each retry runs the agent again
+and appends its message to the history once more; with a SendDeduplicator
+the retries wait for the first run.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_dedup.py
+"""
+
+import asyncio
+import time
+
+from bench_utils import EchoTaskManager
+from common.server.dedup import SendDeduplicator
+from common.types import (
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+TASKS = 200
+RETRIES = 4
+AGENT_LATENCY = 0.05
+
+
+class SlowTaskManager(EchoTaskManager):
+    def __init__(self, send_dedup: SendDeduplicator | None):
+        super().__init__(send_dedup=send_dedup)
+        self.invocations = 0
+
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        return await self.deduplicate_send(request, self._send_task)
+
+    async def _send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        self.invocations += 1
+        await self.upsert_task(request.params)
+        await asyncio.sleep(AGENT_LATENCY)
+        task = await self.update_store(
+            request.params.id, TaskStatus(state=TaskState.COMPLETED), None
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+
+async def run(send_dedup: SendDeduplicator | None) -> tuple[float, int, int]:
+    manager = SlowTaskManager(send_dedup)
+    message = Message(role='user', parts=[TextPart(text='hello')])
+
+    async def client(task_id: str):
+        params = TaskSendParams(id=task_id, message=message)
+        attempts = []
+        for attempt in range(RETRIES):
+            request = SendTaskRequest(id=attempt, params=params)
+            attempts.append(asyncio.create_task(manager.on_send_task(request)))
+            await asyncio.sleep(AGENT_LATENCY / RETRIES)
+        await asyncio.gather(*attempts)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(f't{i}') for i in range(TASKS)))
+    elapsed = time.perf_counter() - start
+    history = sum(len(task.history) for task in manager.tasks.values())
+    return elapsed, manager.invocations, history
+
+
+async def main():
+    print(f'{TASKS} tasks, each sent {RETRIES} times')
+    for name, send_dedup in (
+        ('none', None),
+        ('dedup', SendDeduplicator()),
+    ):
+        elapsed, invocations, history = await run(send_dedup)
+        print(
+            f'{name:<6} {elapsed:6.2f}s  {invocations:5} agent runs'
+            f'  {history:5} history messages'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""Requests/sec of A2AServer dispatch before and after the method table.
+
+The "union" path is the original dispatcher: validate the body against the
+whole A2ARequest union, then walk an isinstance chain. The "table" path parses
+the body once, looks up `method` and validates only the matching request
+type. Validation is timed on request bytes, including a tasks/send carrying
+a large daily_data DataPart.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_dispatch.py
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from bench_utils import (
+    EchoTaskManager,
+    arate,
+    get_task_body,
+    make_agent_card,
+    rate,
+    send_task_body,
+)
+from common.server import A2AServer
+from common.server.request_body import read_body
+from common.types import (
+    A2ARequest,
+    CancelTaskRequest,
+    GetTaskPushNotificationRequest,
+    GetTaskRequest,
+    SendTaskRequest,
+    SendTaskStreamingRequest,
+    SetTaskPushNotificationRequest,
+    TaskResubscriptionRequest,
+)
+from payloads import daily_data
+from starlette.requests import Request
+
+
+def union_dispatch(task_manager, request):
+    if isinstance(request, GetTaskRequest):
+        return task_manager.on_get_task(request)
+    if isinstance(request, SendTaskRequest):
+        return task_manager.on_send_task(request)
+    if isinstance(request, SendTaskStreamingRequest):
+        return task_manager.on_send_task_subscribe(request)
+    if isinstance(request, CancelTaskRequest):
+        return task_manager.on_cancel_task(request)
+    if isinstance(request, SetTaskPushNotificationRequest):
+        return task_manager.on_set_task_push_notification(request)
+    if isinstance(request, GetTaskPushNotificationRequest):
+        return task_manager.on_get_task_push_notification(request)
+    if isinstance(request, TaskResubscriptionRequest):
+        return task_manager.on_resubscribe_to_task(request)
+    raise ValueError(f'Unexpected request type: {type(request)}')
+
+
+class UnionServer(A2AServer):
+    """A2AServer that parses and routes requests the original way."""
+
+    async def _process_request(self, request: Request):
+        body = await read_body(request, max_size=self.max_body_size)
+        json_rpc_request = A2ARequest.validate_json(body)
+        result = await self._dispatch(
+            json_rpc_request.method,
+            lambda r: union_dispatch(self.task_manager, r),
+            json_rpc_request,
+        )
+        return self._create_response(result)
+
+
+def daily_data_body(task_id: str) -> dict:
+    body = send_task_body(task_id)
+    parts = body['params']['message']['parts']
+    parts.append({'type': 'data', 'data': daily_data(days=1250)})
+    return body
+
+
+def bench_validation():
+    """Parsing, validation and routing of request bytes, without HTTP."""
+    server = A2AServer(agent_card=make_agent_card())
+    bodies = {
+        'tasks/get': get_task_body('t1'),
+        'tasks/send': send_task_body('t1'),
+        'daily_data': daily_data_body('t1'),
+    }
+    print('parse + validation + routing (ops/sec)')
+    for name, body in bodies.items():
+        data = json.dumps(body).encode()
+        union = rate(lambda data=data: A2ARequest.validate_json(data))
+
+        def table(data=data):
+            # What A2AServer does with a request body.
+            payload = server.codec.loads(data)
+            adapter = server._methods[payload['method']][0]
+            return adapter.validate_python(payload)
+
+        print(
+            f'  {name:12} {len(data) // 1024:>5} KiB'
+            f'   union {union:>10,.0f}   table {rate(table):>10,.0f}'
+        )
+
+
+async def bench_http():
+    """Full requests through the ASGI app with an echo task manager."""
+    apps = {
+        'union': UnionServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        ).app,
+        'table': A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        ).app,
+    }
+    results = {}
+    for name, app in apps.items():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url='http://bench'
+        ) as client:
+            await client.post('/', json=send_task_body('t1'))
+            counter = iter(range(10**9))
+            results[name, 'tasks/send'] = await arate(
+                lambda client=client, counter=counter: client.post(
+                    '/', json=send_task_body(f'task-{next(counter)}')
+                )
+            )
+            results[name, 'tasks/get'] = await arate(
+                lambda client=client: client.post('/', json=get_task_body('t1'))
+            )
+    print('ASGI round trip (requests/sec)')
+    for method in ('tasks/get', 'tasks/send'):
+        print(
+            f'  {method:12} union {results["union", method]:>10,.0f}'
+            f'   table {results["table", method]:>10,.0f}'
+        )
+
+
+if __name__ == '__main__':
+    bench_validation()
+    asyncio.run(bench_http())
@@ -0,0 +1,56 @@
+"""tasks/get latency against the length of the task history.
+
+Measures on_get_task plus serialization of the response for tasks with
+growing histories, asking for the last 10 messages, none and all of them.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_history.py
+"""
+
+import asyncio
+
+from bench_utils import EchoTaskManager, arate
+from common.types import (
+    GetTaskRequest,
+    Message,
+    TaskQueryParams,
+    TaskSendParams,
+    TextPart,
+)
+from common.utils.codec import get_codec
+
+
+HISTORY_LENGTHS = (10, 1_000, 10_000)
+
+
+async def main():
+    codec = get_codec()
+    manager = EchoTaskManager()
+    for length in HISTORY_LENGTHS:
+        for i in range(length):
+            message = Message(role='user', parts=[TextPart(text=f'turn {i}')])
+            await manager.upsert_task(
+                TaskSendParams(id=f't{length}', message=message)
+            )
+
+    print('history   historyLength  requests/s')
+    for length in HISTORY_LENGTHS:
+        for history_length in (10, 0, None):
+            request = GetTaskRequest(
+                params=TaskQueryParams(
+                    id=f't{length}', historyLength=history_length
+                )
+            )
+
+            async def get(request=request):
+                codec.encode(await manager.on_get_task(request))
+
+            print(
+                f'{length:7}   {history_length!s:>13}'
+                f'  {await arate(get):10,.0f}'
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""tasks/list latency against a store holding a million tasks.
+
+Lists one session's tasks, and one page of the tasks in a rare state,
+through the secondary indexes behind tasks/list, and compares that with
+filtering the store by scanning it with TaskStore.list_tasks().
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_list_tasks.py
+"""
+
+import asyncio
+import time
+
+from bench_utils import EchoTaskManager
+from common.types import ListTasksRequest, Task, TaskState, TaskStatus
+
+
+TASKS = 1_000_000
+TASKS_PER_SESSION = 20
+QUERIES = 1000
+
+
+def populate(manager: EchoTaskManager):
+    working = TaskStatus(state=TaskState.WORKING)
+    failed = TaskStatus(state=TaskState.FAILED)
+    for i in range(TASKS):
+        task = Task.model_construct(
+            id=f't{i}',
+            sessionId=f's{i // TASKS_PER_SESSION}',
+            status=failed if i % 10_000 == 0 else working,
+        )
+        manager.tasks.upsert(task)
+        manager.task_index.update(task)
+
+
+async def time_list(manager: EchoTaskManager, params: dict) -> float:
+    request = ListTasksRequest(id=1, params=params)
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        await manager.on_list_tasks(request)
+    return (time.perf_counter() - start) / QUERIES
+
+
+def time_scan(manager: EchoTaskManager, **filters) -> float:
+    runs = 3
+    start = time.perf_counter()
+    for _ in range(runs):
+        manager.tasks.list_tasks(**filters)
+    return (time.perf_counter() - start) / runs
+
+
+async def main():
+    manager = EchoTaskManager()
+    start = time.perf_counter()
+    populate(manager)
+    elapsed = time.perf_counter() - start
+    print(f'{TASKS:,} tasks stored and indexed in {elapsed:.1f}s')
+
+    session = f's{TASKS // TASKS_PER_SESSION // 2}'
+    for name, params, filters in (
+        ('session', {'sessionId': session}, {'session_id': session}),
+        ('failed', {'state': 'failed'}, {'state': TaskState.FAILED}),
+    ):
+        indexed = await time_list(manager, params)
+        scanned = time_scan(manager, **filters)
+        print(
+            f'{name:<8} tasks/list {indexed * 1e6:8.1f} us'
+            f'   scan {scanned * 1e3:8.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""Per-request cost of the A2AServer metrics instrumentation.
+
+Times the dispatch of a tasks/get request with metrics on and off, and the
+bare MethodMetrics bookkeeping on its own.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_metrics.py
+"""
+
+import asyncio
+
+from bench_utils import EchoTaskManager, arate, make_agent_card, rate
+from common.server import A2AServer
+from common.server.metrics import MethodMetrics
+from common.types import GetTaskRequest, TaskQueryParams
+
+
+def bookkeeping_ns() -> float:
+    stats = MethodMetrics()
+
+    def request():
+        stats.end(stats.begin(), error=False)
+
+    return 1e9 / rate(request)
+
+
+async def dispatch_ns(metrics: bool) -> float:
+    server = A2AServer(
+        agent_card=make_agent_card(),
+        task_manager=EchoTaskManager(),
+        metrics=metrics,
+    )
+    method, handler, request = (
+        'tasks/get',
+        server._methods['tasks/get'][1],
+        GetTaskRequest(id=1, params=TaskQueryParams(id='missing')),
+    )
+    return 1e9 / await arate(lambda: server._dispatch(method, handler, request))
+
+
+async def main():
+    print(f'MethodMetrics begin+end: {bookkeeping_ns():8.0f} ns/request')
+    off = await dispatch_ns(False)
+    on = await dispatch_ns(True)
+    print(f'dispatch, metrics off:   {off:8.0f} ns/request')
+    print(f'dispatch, metrics on:    {on:8.0f} ns/request')
+    print(f'overhead:                {on - off:8.0f} ns/request')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""Cost of tasks/resubscribe against the number of missed events.
+
+A task has streamed LOG_SIZE status updates; a client reconnects having
+missed the last N of them. Replay walks the log back from its newest
+event, so reconnecting costs O(N) no matter how long the log is.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_resubscribe.py
+"""
+
+import asyncio
+
+from bench_utils import EchoTaskManager, arate
+from common.types import (
+    Message,
+    TaskIdParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+LOG_SIZES = (1_000, 100_000)
+MISSED = (1, 10, 100, 1_000)
+
+
+async def main():
+    print('log size   missed  reconnects/s')
+    for log_size in LOG_SIZES:
+        manager = EchoTaskManager(event_log_size=log_size)
+        await manager.upsert_task(
+            TaskSendParams(
+                id='t1',
+                message=Message(role='user', parts=[TextPart(text='hi')]),
+            )
+        )
+        event = TaskStatusUpdateEvent(
+            id='t1', status=TaskStatus(state=TaskState.WORKING)
+        )
+        for _ in range(log_size):
+            await manager.enqueue_events_for_sse('t1', event)
+
+        for missed in MISSED:
+            request = TaskResubscriptionRequest(
+                params=TaskIdParams(
+                    id='t1', metadata={'lastEventId': log_size - missed}
+                )
+            )
+
+            async def reconnect(request=request, missed=missed):
+                stream = await manager.on_resubscribe_to_task(request)
+                for _ in range(missed):
+                    await anext(stream)
+                await stream.aclose()
+
+            print(f'{log_size:8}   {missed:6}  {await arate(reconnect):12,.0f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
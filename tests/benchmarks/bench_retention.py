@@ -0,0 +1,65 @@
+"""Memory held by InMemoryTaskManager after many short-lived tasks.
+
+Each task is created and completed, as in a long-running simulation. Without
+retention every finished task stays in memory; with a TTL and count budget
+the task index stays bounded.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_retention.py
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from bench_utils import EchoTaskManager
+from common.server.retention import TaskRetention
+from common.types import (
+    Message,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+TASKS = 50_000
+
+
+async def run(retention: TaskRetention | None) -> tuple[float, int, int]:
+    manager = EchoTaskManager(retention=retention)
+    message = Message(role='user', parts=[TextPart(text='hello ' * 20)])
+    done = TaskStatus(
+        state=TaskState.COMPLETED,
+        message=Message(role='agent', parts=[TextPart(text='done ' * 20)]),
+    )
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(TASKS):
+        await manager.upsert_task(TaskSendParams(id=f't{i}', message=message))
+        await manager.update_store(f't{i}', done, None)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return TASKS / elapsed, len(manager.tasks), peak
+
+
+async def main():
+    print(f'{TASKS} tasks created and completed')
+    policies = {
+        'none': None,
+        'ttl=0.1s': TaskRetention(ttl=0.1),
+        'max_tasks=1000': TaskRetention(max_tasks=1000),
+        'max_bytes=1MB': TaskRetention(max_bytes=1 << 20),
+    }
+    for name, retention in policies.items():
+        throughput, kept, peak = await run(retention)
+        print(
+            f'{name:<15} {throughput:8,.0f} tasks/s  {kept:6} kept'
+            f'  peak {peak / 2**20:6.1f} MiB'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
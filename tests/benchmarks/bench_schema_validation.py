@@ -0,0 +1,126 @@
+"""Throughput of the generated schema decoders against the pydantic path.
+
+Decode: bytes to a validated model. For "pydantic" the request model
+validates the JSON itself; for "schema" the codec parses it and the decoder
+generated from specification/json/a2a.json checks and builds the model.
+"jsonschema" only validates the parsed value against the schema, for
+reference.
+
+HTTP: tasks/get and tasks/send through an A2AServer with each validation
+engine.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_schema_validation.py
+"""
+
+import asyncio
+import json
+
+from pathlib import Path
+
+import httpx
+
+from bench_utils import (
+    EchoTaskManager,
+    arate,
+    get_task_body,
+    make_agent_card,
+    rate,
+    send_task_body,
+)
+from common.server import A2AServer
+from common.types import GetTaskRequest, GetTaskResponse, SendTaskRequest
+from common.utils.a2a_schema import decoder_for
+from common.utils.codec import get_codec
+from jsonschema import Draft7Validator
+from payloads import daily_data, history_task
+
+
+SCHEMA = json.loads(
+    (Path(__file__).parents[2] / 'specification/json/a2a.json').read_text()
+)
+
+
+def payloads() -> dict[str, tuple[type, bytes]]:
+    data_body = send_task_body('t1')
+    data_body['params']['message']['parts'].append(
+        {'type': 'data', 'data': daily_data()}
+    )
+    history = GetTaskResponse(id=1, result=history_task())
+    return {
+        'tasks/get': (GetTaskRequest, json.dumps(get_task_body('t1')).encode()),
+        'tasks/send': (
+            SendTaskRequest,
+            json.dumps(send_task_body('t1')).encode(),
+        ),
+        'tasks/send + daily_data': (
+            SendTaskRequest,
+            json.dumps(data_body).encode(),
+        ),
+        'GetTaskResponse, 200 messages': (
+            GetTaskResponse,
+            history.model_dump_json(exclude_none=True).encode(),
+        ),
+    }
+
+
+def bench_decode():
+    codec = get_codec()
+    print(f'decode (ops/sec, {codec.name} codec)')
+    print(f'  {"":32} {"pydantic":>10} {"schema":>10} {"jsonschema":>10}')
+    for name, (model, data) in payloads().items():
+        decoder = decoder_for(model)
+        validator = Draft7Validator(
+            {'$ref': f'#/$defs/{model.__name__}', '$defs': SCHEMA['$defs']}
+        )
+        pydantic = rate(
+            lambda model=model, data=data: codec.decode(model, data)
+        )
+        schema = rate(
+            lambda decoder=decoder, data=data: codec.decode(decoder, data)
+        )
+        reference = rate(
+            lambda validator=validator, data=data: validator.validate(
+                codec.loads(data)
+            )
+        )
+        print(
+            f'  {name:32} {pydantic:>10,.0f} {schema:>10,.0f}'
+            f' {reference:>10,.0f}'
+        )
+
+
+async def bench_http():
+    results = {}
+    for validation in ('pydantic', 'schema'):
+        server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=EchoTaskManager(),
+            validation=validation,
+        )
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://bench',
+        ) as client:
+            await client.post('/', json=send_task_body('t1'))
+            counter = iter(range(10**9))
+            results[validation, 'tasks/send'] = await arate(
+                lambda client=client, counter=counter: client.post(
+                    '/', json=send_task_body(f'task-{next(counter)}')
+                )
+            )
+            results[validation, 'tasks/get'] = await arate(
+                lambda client=client: client.post('/', json=get_task_body('t1'))
+            )
+    print('ASGI round trip (requests/sec)')
+    for method in ('tasks/get', 'tasks/send'):
+        print(
+            f'  {method:12} pydantic {results["pydantic", method]:>10,.0f}'
+            f'   schema {results["schema", method]:>10,.0f}'
+        )
+
+
+if __name__ == '__main__':
+    bench_decode()
+    asyncio.run(bench_http())
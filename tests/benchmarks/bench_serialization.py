@@ -0,0 +1,117 @@
+"""Encode and decode cost of the A2A response types on hot paths.
+
+Encode: the constant WORKING update that agents stream while they work,
+serialized with `model_dump_json`, with the compiled serializer and from a
+StatusUpdateTemplate; an artifact update carrying the 250 day daily_data
+DataPart of StockIndicatorAgent; and tasks/get responses.
+
+Decode: the same responses parsed the way clients commonly do it, with
+`json.loads` and keyword construction, and straight from bytes with
+`model_validate_json` and a cached TypeAdapter.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_serialization.py
+"""
+
+import json
+
+from bench_utils import rate
+from common.types import (
+    Artifact,
+    DataPart,
+    GetTaskResponse,
+    Message,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.utils.serialization import status_template, to_json, type_adapter
+from payloads import daily_data, get_task_responses
+
+
+PROCESSING = 'Processing the stock indicator request...'
+
+
+def working_event() -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(
+        id='task-1',
+        status=TaskStatus(
+            state=TaskState.WORKING,
+            message=Message(role='agent', parts=[TextPart(text=PROCESSING)]),
+        ),
+    )
+
+
+def daily_data_event() -> TaskArtifactUpdateEvent:
+    return TaskArtifactUpdateEvent(
+        id='task-1', artifact=Artifact(parts=[DataPart(data=daily_data())])
+    )
+
+
+def report(name: str, per_second: float) -> None:
+    print(f'  {name:<60} {per_second:>12,.0f}/s')
+
+
+def bench_encode() -> None:
+    print('encode')
+    event = working_event()
+    template = status_template(TaskState.WORKING, PROCESSING)
+    report(
+        'WORKING update, model_dump_json',
+        rate(lambda: event.model_dump_json(exclude_none=True)),
+    )
+    report('WORKING update, compiled serializer', rate(lambda: to_json(event)))
+    report(
+        'WORKING update, template (event and JSON)',
+        rate(lambda: template.event('task-1')),
+    )
+
+    event = daily_data_event()
+    report(
+        'daily_data artifact, model_dump_json',
+        rate(lambda: event.model_dump_json(exclude_none=True)),
+    )
+    report(
+        'daily_data artifact, compiled serializer', rate(lambda: to_json(event))
+    )
+    for name, response in get_task_responses().items():
+        report(f'tasks/get {name}', rate(lambda: to_json(response)))
+
+
+def bench_decode() -> None:
+    print('decode')
+    cases = {
+        'WORKING update': (
+            SendTaskStreamingResponse,
+            SendTaskStreamingResponse(id=1, result=working_event()),
+        ),
+        'daily_data artifact': (
+            SendTaskStreamingResponse,
+            SendTaskStreamingResponse(id=1, result=daily_data_event()),
+        ),
+        **{
+            f'tasks/get {name}': (GetTaskResponse, response)
+            for name, response in get_task_responses().items()
+        },
+    }
+    for name, (cls, response) in cases.items():
+        data = to_json(response)
+        adapter = type_adapter(cls)
+        report(f'{name}, json.loads', rate(lambda: cls(**json.loads(data))))
+        report(
+            f'{name}, model_validate_json',
+            rate(lambda: cls.model_validate_json(data)),
+        )
+        report(
+            f'{name}, TypeAdapter.validate_json',
+            rate(lambda: adapter.validate_json(data)),
+        )
+
+
+if __name__ == '__main__':
+    bench_encode()
+    bench_decode()
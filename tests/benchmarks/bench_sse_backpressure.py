@@ -0,0 +1,72 @@
+"""Producer throughput and memory with a stalled SSE subscriber.
+
+One subscriber never reads while the producer publishes status and artifact
+updates. With an unbounded queue its backlog grows with every event; with a
+bounded queue the overflow policy keeps it in check.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_sse_backpressure.py
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from bench_utils import EchoTaskManager
+from common.server.subscriber_queue import OverflowPolicy
+from common.types import (
+    Artifact,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+EVENTS = 100_000
+ARTIFACT_EVERY = 50
+
+
+async def run(size: int | None, policy: OverflowPolicy):
+    manager = EchoTaskManager(sse_queue_size=size, sse_overflow_policy=policy)
+    queue = await manager.setup_sse_consumer('t1')
+    events = [
+        TaskArtifactUpdateEvent(
+            id='t1', artifact=Artifact(parts=[TextPart(text='x' * 200)])
+        )
+        if i % ARTIFACT_EVERY == 0
+        else TaskStatusUpdateEvent(
+            id='t1', status=TaskStatus(state=TaskState.WORKING)
+        )
+        for i in range(EVENTS)
+    ]
+    tracemalloc.start()
+    start = time.perf_counter()
+    for event in events:
+        await manager.enqueue_events_for_sse('t1', event)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return EVENTS / elapsed, queue.qsize(), peak, manager.subscriber_stats
+
+
+async def main():
+    print(f'{EVENTS} events, one artifact every {ARTIFACT_EVERY}')
+    cases = [(None, OverflowPolicy.COALESCE)] + [
+        (256, policy) for policy in OverflowPolicy
+    ]
+    for size, policy in cases:
+        throughput, depth, peak, stats = await run(size, policy)
+        name = 'unbounded' if size is None else f'{size} {policy.value}'
+        print(
+            f'{name:<16} {throughput:9,.0f} events/s  depth {depth:6}'
+            f'  peak {peak / 1024:7.0f} KiB  dropped {stats.dropped}'
+            f'  coalesced {stats.coalesced}'
+            f'  disconnected {stats.disconnected}'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
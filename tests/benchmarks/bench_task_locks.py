@@ -0,0 +1,94 @@
+"""Concurrent updates and reads of 10k tasks in InMemoryTaskManager.
+
+Each update holds its task lock across a short await, as a task manager
+does when it writes through to an external store. With lock_stripes=1 every
+task shares one lock, which is how the manager behaved before striping.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_task_locks.py
+"""
+
+import asyncio
+import random
+import time
+
+from bench_utils import EchoTaskManager
+from common.types import (
+    GetTaskRequest,
+    Message,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+TASKS = 10_000
+WORKERS = 500
+UPDATES_PER_TASK = 2
+READS_PER_UPDATE = 4
+IO_DELAY = 0.0002
+
+
+class WriteThroughTaskManager(EchoTaskManager):
+    async def update_task(self, task_id: str, state: TaskState):
+        async with self.task_lock(task_id):
+            task = self.tasks[task_id]
+            task.status = TaskStatus(state=state)
+            await asyncio.sleep(IO_DELAY)
+            self.tasks[task_id] = task
+
+
+async def run(lock_stripes: int) -> tuple[float, float]:
+    manager = WriteThroughTaskManager(lock_stripes=lock_stripes)
+    message = Message(role='user', parts=[TextPart(text='hello')])
+    for i in range(TASKS):
+        await manager.upsert_task(TaskSendParams(id=f't{i}', message=message))
+
+    ops = [
+        (f't{i}', state)
+        for i in range(TASKS)
+        for state in (TaskState.WORKING, TaskState.COMPLETED)[:UPDATES_PER_TASK]
+    ]
+    random.Random(0).shuffle(ops)
+    read_latencies = []
+
+    async def worker(jobs):
+        rng = random.Random(len(jobs))
+        for task_id, state in jobs:
+            await manager.update_task(task_id, state)
+            for _ in range(READS_PER_UPDATE):
+                start = time.perf_counter()
+                await manager.on_get_task(
+                    GetTaskRequest(
+                        params=TaskQueryParams(id=f't{rng.randrange(TASKS)}')
+                    )
+                )
+                read_latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(ops[w::WORKERS]) for w in range(WORKERS)))
+    elapsed = time.perf_counter() - start
+    total = len(ops) * (1 + READS_PER_UPDATE)
+    read_latencies.sort()
+    p99 = read_latencies[int(len(read_latencies) * 0.99)]
+    return total / elapsed, p99
+
+
+async def main():
+    print(
+        f'{TASKS} tasks, {WORKERS} workers, {UPDATES_PER_TASK} updates and '
+        f'{UPDATES_PER_TASK * READS_PER_UPDATE} reads per task'
+    )
+    for stripes in (1, 64, 1024):
+        throughput, p99 = await run(stripes)
+        print(
+            f'lock_stripes={stripes:<5} {throughput:10,.0f} ops/s'
+            f'  read p99 {p99 * 1e6:8.0f} us'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
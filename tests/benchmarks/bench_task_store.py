@@ -0,0 +1,84 @@
+"""Task-state updates against the SQLite-backed task stores.
+
+Compares the write-through SQLiteModelStore that InMemoryTaskManager used
+for store_path before, which commits on every update, with the write-behind
+SQLiteTaskStore, which coalesces updates to the same task and commits them
+in batches.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_task_store.py
+"""
+
+import tempfile
+import time
+
+from pathlib import Path
+
+from common.server.task_store import SQLiteModelStore, SQLiteTaskStore
+from common.types import Task, TaskState, TaskStatus
+
+
+TASKS = 200
+UPDATES_PER_TASK = 20
+
+
+def statuses():
+    for n in range(UPDATES_PER_TASK):
+        state = TaskState.WORKING if n % 2 else TaskState.INPUT_REQUIRED
+        yield TaskStatus(state=state)
+    yield TaskStatus(state=TaskState.COMPLETED)
+
+
+def new_task(i: int) -> Task:
+    return Task(
+        id=f't{i}', status=TaskStatus(state=TaskState.SUBMITTED), history=[]
+    )
+
+
+def run_write_through(path: str) -> float:
+    store = SQLiteModelStore(path, 'tasks', Task)
+    for i in range(TASKS):
+        store[f't{i}'] = new_task(i)
+    start = time.perf_counter()
+    for status in statuses():
+        for i in range(TASKS):
+            task = store[f't{i}']
+            task.status = status
+            store[f't{i}'] = task
+    return time.perf_counter() - start
+
+
+def run_write_behind(path: str) -> tuple[float, int]:
+    store = SQLiteTaskStore(path)
+    for i in range(TASKS):
+        store.upsert(new_task(i))
+    store.flush()
+    commits = store.commits
+    start = time.perf_counter()
+    for status in statuses():
+        for i in range(TASKS):
+            store.update_task(f't{i}', status)
+    store.flush()
+    elapsed = time.perf_counter() - start
+    return elapsed, store.commits - commits
+
+
+def main():
+    updates = TASKS * (UPDATES_PER_TASK + 1)
+    print(f'{TASKS} tasks, {updates} status updates')
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed = run_write_through(str(Path(tmp) / 'through.db'))
+        print(
+            f'write-through {updates / elapsed:10,.0f} updates/s'
+            f'  {updates:6} commits'
+        )
+        elapsed, commits = run_write_behind(str(Path(tmp) / 'behind.db'))
+        print(
+            f'write-behind  {updates / elapsed:10,.0f} updates/s'
+            f'  {commits:6} commits'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Events per second on the streaming path, validated and trusted.
+
+Construction: building one streamed status update the way the ADK task
+managers do, with validation, with `model_construct`, and with the trusted
+builders of common.utils.trusted.
+
+Delivery: streaming events from a task manager to a client. Over HTTP every
+event is encoded by the server and validated again by the client; a client
+given the server as local_server receives the event objects themselves.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_trusted.py
+"""
+
+import asyncio
+import time
+
+from bench_utils import EchoTaskManager, make_agent_card, rate
+from common.client import A2AClient
+from common.server import A2AServer
+from common.types import (
+    Message,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.utils import trusted
+from common.utils.codec import get_codec
+
+
+EVENTS = 20_000
+
+
+def validated():
+    status = TaskStatus(
+        state=TaskState.WORKING,
+        message=Message(
+            role='agent', parts=[{'type': 'text', 'text': 'Working...'}]
+        ),
+    )
+    return SendTaskStreamingResponse(
+        id=1, result=TaskStatusUpdateEvent(id='t1', status=status)
+    )
+
+
+def constructed():
+    status = TaskStatus.model_construct(
+        state=TaskState.WORKING,
+        message=Message.model_construct(
+            role='agent', parts=[TextPart.model_construct(text='Working...')]
+        ),
+    )
+    return SendTaskStreamingResponse.model_construct(
+        id=1,
+        result=TaskStatusUpdateEvent.model_construct(id='t1', status=status),
+    )
+
+
+def built():
+    status = trusted.task_status(
+        state=TaskState.WORKING,
+        message=trusted.message(
+            role='agent', parts=[trusted.text_part(text='Working...')]
+        ),
+    )
+    return trusted.streaming_response(
+        id=1, result=trusted.status_update(id='t1', status=status)
+    )
+
+
+class ChattyTaskManager(EchoTaskManager):
+    async def on_send_task_subscribe(self, request: SendTaskStreamingRequest):
+        await self.upsert_task(request.params)
+        return await self.stream_task_events(
+            request.id, request.params.id, self._events(request)
+        )
+
+    async def _events(self, request: SendTaskStreamingRequest):
+        for i in range(EVENTS):
+            status = trusted.task_status(
+                state=TaskState.WORKING,
+                message=trusted.message(
+                    role='agent', parts=[trusted.text_part(text=f'step {i}')]
+                ),
+            )
+            yield trusted.streaming_response(
+                id=request.id,
+                result=trusted.status_update(
+                    id=request.params.id, status=status
+                ),
+            )
+            if i % 100 == 0:
+                # Let the consumer drain the subscriber queue.
+                await asyncio.sleep(0)
+
+
+async def deliver(local: bool) -> float:
+    server = A2AServer(
+        agent_card=make_agent_card(),
+        task_manager=ChattyTaskManager(sse_queue_size=None),
+    )
+    codec = get_codec()
+    params = TaskSendParams(
+        id='t1', message=Message(role='user', parts=[TextPart(text='go')])
+    )
+    start = time.perf_counter()
+    if local:
+        client = A2AClient(local_server=server)
+        received = 0
+        async for _ in client.send_task_streaming(params):
+            received += 1
+    else:
+        stream = await server.dispatch_local(
+            SendTaskStreamingRequest(id=1, params=params)
+        )
+        received = 0
+        async for item in stream:
+            # What the SSE response writes and the client parses back.
+            codec.decode(
+                SendTaskStreamingResponse, server._encode_stream_item(item)
+            )
+            received += 1
+    return received / (time.perf_counter() - start)
+
+
+async def main():
+    print('construction (events/s)')
+    for name, func in (
+        ('validated', validated),
+        ('model_construct', constructed),
+        ('trusted', built),
+    ):
+        print(f'  {name:<16} {rate(func):12,.0f}')
+
+    print(f'delivery of {EVENTS} events (events/s)')
+    for name, local in (('http encode+validate', False), ('local', True)):
+        print(f'  {name:<21} {await deliver(local):10,.0f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
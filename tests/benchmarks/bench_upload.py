@@ -0,0 +1,82 @@
+"""Peak memory of A2AServer while receiving a large FilePart upload.
+
+Streams a tasks/send request carrying a 50 MB file through the ASGI app in
+64 KiB chunks, with file spilling into a BlobStore on and off, and reports
+the peak of Python allocations traced while the request is handled.
+
+Run from the tests directory:
+
+    uv run python benchmarks/bench_upload.py
+"""
+
+import asyncio
+import base64
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import httpx
+
+from bench_utils import EchoTaskManager, make_agent_card, send_task_body
+from common.server import A2AServer
+from common.utils.blob_store import BlobStore
+
+
+FILE_SIZE = 50 * 1024 * 1024
+CHUNK = 48 * 1024
+
+
+async def upload_body():
+    body = send_task_body('upload')
+    body['params']['message']['parts'] = [
+        {'type': 'file', 'file': {'name': 'data.bin', 'bytes': '@'}}
+    ]
+    head, tail = json.dumps(body).encode().split(b'"@"')
+    yield head + b'"'
+    block = os.urandom(CHUNK)
+    for _ in range(FILE_SIZE // CHUNK):
+        yield base64.b64encode(block)
+    yield b'"' + tail
+
+
+async def measure(spill_threshold: int | None, blob_dir: str):
+    server = A2AServer(
+        agent_card=make_agent_card(),
+        task_manager=EchoTaskManager(),
+        file_spill_threshold=spill_threshold,
+        blob_store=BlobStore(blob_dir),
+        metrics=False,
+    )
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=server.app),
+        base_url='http://bench',
+        timeout=None,
+    ) as client:
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = await client.post('/', content=upload_body())
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert response.status_code == 200, response.text
+    return peak, elapsed
+
+
+async def main():
+    print(f'{FILE_SIZE // 2**20} MB attachment, {CHUNK // 1024} KiB chunks')
+    with tempfile.TemporaryDirectory() as blob_dir:
+        for label, threshold in (
+            ('buffered', None),
+            ('spilled', 1024 * 1024),
+        ):
+            peak, elapsed = await measure(threshold, blob_dir)
+            print(
+                f'{label:9} peak traced memory {peak / 2**20:8.1f} MiB'
+                f'  {elapsed:6.2f} s'
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
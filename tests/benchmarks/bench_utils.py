@@ -0,0 +1,93 @@
+"""Helpers shared by the benchmark scripts in this directory."""
+
+import time
+
+from collections.abc import AsyncIterable, Callable
+
+from common.server import InMemoryTaskManager
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    JSONRPCResponse,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskState,
+    TaskStatus,
+)
+
+
+class EchoTaskManager(InMemoryTaskManager):
+    """Completes every task immediately so only server overhead is measured."""
+
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        await self.upsert_task(request.params)
+        task = await self.update_store(
+            request.params.id, TaskStatus(state=TaskState.COMPLETED), None
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        pass
+
+
+def make_agent_card() -> AgentCard:
+    return AgentCard(
+        name='Benchmark Agent',
+        url='http://localhost:5000/',
+        version='1.0.0',
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[],
+    )
+
+
+def send_task_body(task_id: str, request_id: int = 1) -> dict:
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': 'tasks/send',
+        'params': {
+            'id': task_id,
+            'sessionId': 'session',
+            'message': {
+                'role': 'user',
+                'parts': [{'type': 'text', 'text': 'Analyze AAPL for 2024'}],
+            },
+        },
+    }
+
+
+def get_task_body(task_id: str, request_id: int = 1) -> dict:
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': 'tasks/get',
+        'params': {'id': task_id, 'historyLength': 10},
+    }
+
+
+def rate(func: Callable[[], object], seconds: float = 1.0) -> float:
+    """Returns how many times per second func can be called."""
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            func()
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+async def arate(func: Callable[[], object], seconds: float = 1.0) -> float:
+    """Returns how many times per second the coroutine func can be awaited."""
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(50):
+            await func()
+        count += 50
+    return count / (time.perf_counter() - start)
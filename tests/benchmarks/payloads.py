@@ -0,0 +1,118 @@
+"""Realistic A2A payloads shared by the benchmark scripts."""
+
+import base64
+import os
+import random
+
+from datetime import date, timedelta
+
+from common.types import (
+    Artifact,
+    DataPart,
+    FileContent,
+    FilePart,
+    GetTaskResponse,
+    Message,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+def daily_data(days: int = 250) -> dict:
+    """An indicator series shaped like StockIndicatorAgent.analyze_indicators."""
+    rng = random.Random(42)
+    start = date(2024, 1, 2)
+    close = 180.0
+    series = {}
+    for day in range(days):
+        close *= 1 + rng.gauss(0, 0.015)
+        series[(start + timedelta(days=day)).isoformat()] = {
+            'close': round(close, 2),
+            'sma_14': round(close * 0.99, 2),
+            'rsi_14': round(rng.uniform(20, 80), 2),
+            'macd': round(rng.gauss(0, 1), 3),
+            'macd_signal': round(rng.gauss(0, 1), 3),
+            'macd_hist': round(rng.gauss(0, 0.5), 3),
+            'boll_middle': round(close, 2),
+            'boll_upper': round(close * 1.04, 2),
+            'boll_lower': round(close * 0.96, 2),
+            'volatility': round(rng.uniform(1, 6), 2),
+            'garch_vol': round(rng.uniform(0.8, 3), 4),
+            'news_sentiment': [
+                {
+                    'title': f'AAPL headline {day}-{n}',
+                    'overall_sentiment_score': round(rng.uniform(-1, 1), 4),
+                    'overall_sentiment_label': 'Somewhat-Bullish',
+                }
+                for n in range(3)
+            ],
+        }
+    return {
+        'status': 'success',
+        'symbol': 'AAPL',
+        'start_date': '2024-01-02',
+        'end_date': (start + timedelta(days=days - 1)).isoformat(),
+        'daily_data': series,
+    }
+
+
+def history_task(messages: int = 200) -> Task:
+    history = [
+        Message(
+            role='user' if i % 2 == 0 else 'agent',
+            parts=[
+                TextPart(
+                    text=f'Turn {i}: the RSI for AAPL closed at {40 + i % 30} '
+                    'and the MACD histogram turned positive.'
+                )
+            ],
+        )
+        for i in range(messages)
+    ]
+    return Task(
+        id='history-task',
+        sessionId='session',
+        status=TaskStatus(state=TaskState.COMPLETED),
+        history=history,
+    )
+
+
+def daily_data_task(days: int = 250) -> Task:
+    part = DataPart(data=daily_data(days))
+    return Task(
+        id='indicator-task',
+        sessionId='session',
+        status=TaskStatus(
+            state=TaskState.COMPLETED,
+            message=Message(role='agent', parts=[part]),
+        ),
+        artifacts=[Artifact(parts=[part])],
+    )
+
+
+def file_task(size: int = 256 * 1024) -> Task:
+    part = FilePart(
+        file=FileContent(
+            name='chart.png',
+            mimeType='image/png',
+            bytes=base64.b64encode(os.urandom(size)).decode(),
+        )
+    )
+    return Task(
+        id='file-task',
+        sessionId='session',
+        status=TaskStatus(state=TaskState.COMPLETED),
+        artifacts=[Artifact(parts=[part])],
+    )
+
+
+def get_task_responses() -> dict[str, GetTaskResponse]:
+    return {
+        'history (200 messages)': GetTaskResponse(id=1, result=history_task()),
+        'daily_data (250 days)': GetTaskResponse(
+            id=1, result=daily_data_task()
+        ),
+        'FilePart (256 KiB)': GetTaskResponse(id=1, result=file_task()),
+    }
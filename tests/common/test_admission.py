@@ -0,0 +1,161 @@
+import asyncio
+import unittest
+
+import httpx
+
+from common.server import A2AServer
+from common.server.admission import ConcurrencyLimit, OverloadedError
+from common.types import (
+    SendTaskRequest,
+    SendTaskResponse,
+    TaskState,
+    TaskStatus,
+)
+from test_server import EchoTaskManager, make_agent_card, send_task_body
+
+
+class TestConcurrencyLimit(unittest.IsolatedAsyncioTestCase):
+    async def test_rejects_when_queue_is_full(self):
+        limit = ConcurrencyLimit(max_concurrent=1, max_queue=0)
+        acquired_at = await limit.acquire()
+        with self.assertRaises(OverloadedError) as cm:
+            await limit.acquire()
+        self.assertGreaterEqual(cm.exception.retry_after, 1)
+        self.assertEqual(limit.rejected, 1)
+        limit.release(acquired_at)
+        self.assertEqual(limit.active, 0)
+
+    async def test_waiters_are_served_in_order(self):
+        limit = ConcurrencyLimit(max_concurrent=1, max_queue=2)
+        first = await limit.acquire()
+        order = []
+
+        async def wait(name):
+            acquired_at = await limit.acquire()
+            order.append(name)
+            limit.release(acquired_at)
+
+        tasks = [asyncio.create_task(wait(n)) for n in ('a', 'b')]
+        await asyncio.sleep(0)
+        self.assertEqual(limit.waiting, 2)
+        limit.release(first)
+        await asyncio.gather(*tasks)
+        self.assertEqual(order, ['a', 'b'])
+        self.assertEqual(limit.active, 0)
+
+    async def test_queue_timeout(self):
+        limit = ConcurrencyLimit(max_concurrent=1, max_queue=1, queue_timeout=0)
+        await limit.acquire()
+        with self.assertRaises(OverloadedError):
+            await limit.acquire()
+        self.assertEqual(limit.timed_out, 1)
+        self.assertEqual(limit.waiting, 0)
+
+    async def test_hold_releases_when_stream_ends(self):
+        limit = ConcurrencyLimit(max_concurrent=1)
+
+        async def stream():
+            yield 1
+            yield 2
+
+        held = limit.hold(stream(), await limit.acquire())
+        self.assertEqual(limit.active, 1)
+        self.assertEqual([item async for item in held], [1, 2])
+        self.assertEqual(limit.active, 0)
+
+    async def test_hold_releases_streams_dropped_unstarted(self):
+        limit = ConcurrencyLimit(max_concurrent=1)
+
+        async def stream():
+            yield 1
+
+        held = limit.hold(stream(), await limit.acquire())
+        await held.aclose()
+        self.assertEqual(limit.active, 0)
+
+        held = limit.hold(stream(), await limit.acquire())
+        del held
+        self.assertEqual(limit.active, 0)
+        await limit.acquire()
+
+
+class SlowTaskManager(EchoTaskManager):
+    def __init__(self):
+        super().__init__()
+        self.gate = asyncio.Event()
+
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        await self.upsert_task(request.params)
+        await self.gate.wait()
+        task = await self.update_store(
+            request.params.id, TaskStatus(state=TaskState.COMPLETED), None
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+
+class TestServerAdmission(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.task_manager = SlowTaskManager()
+        self.server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=self.task_manager,
+            concurrency_limits={
+                'tasks/send': ConcurrencyLimit(max_concurrent=1, max_queue=0)
+            },
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.server.app),
+            base_url='http://test',
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_over_limit_request_is_rejected(self):
+        first = asyncio.create_task(
+            self.client.post('/', json=send_task_body('t1', 1))
+        )
+        while not self.server.concurrency_limits['tasks/send'].active:
+            await asyncio.sleep(0)
+
+        response = await self.client.post('/', json=send_task_body('t2', 2))
+        self.assertEqual(response.status_code, 503)
+        self.assertGreaterEqual(int(response.headers['retry-after']), 1)
+        self.assertEqual(response.json()['id'], 2)
+        self.assertEqual(response.json()['error']['code'], -32010)
+        self.assertIn('retryAfter', response.json()['error']['data'])
+
+        # Other methods have their own limits and are not starved.
+        response = await self.client.post(
+            '/',
+            json={
+                'jsonrpc': '2.0',
+                'id': 3,
+                'method': 'tasks/get',
+                'params': {'id': 't1'},
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.task_manager.gate.set()
+        response = await first
+        self.assertEqual(response.json()['result']['id'], 't1')
+        self.assertEqual(self.server.concurrency_limits['tasks/send'].active, 0)
+
+    async def test_batch_items_are_limited(self):
+        batch = asyncio.create_task(
+            self.client.post(
+                '/', json=[send_task_body('t1', 1), send_task_body('t2', 2)]
+            )
+        )
+        while not self.server.concurrency_limits['tasks/send'].rejected:
+            await asyncio.sleep(0)
+        self.task_manager.gate.set()
+        response = await batch
+        results = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted('result' in item for item in results), [False, True]
+        )
+        busy = next(item for item in results if 'error' in item)
+        self.assertEqual(busy['error']['code'], -32010)
@@ -0,0 +1,227 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import httpx
+
+from common.server import A2AServer
+from common.server.request_body import FileSpiller
+from common.types import (
+    Artifact,
+    FileContent,
+    FilePart,
+    Message,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from common.utils.blob_store import BlobStore, fetch_blob, read_file_content
+from starlette.testclient import TestClient
+from test_request_body import file_body
+from test_server import EchoTaskManager, make_agent_card
+
+
+def file_part(data: bytes) -> FilePart:
+    return FilePart(
+        file=FileContent(
+            name='chart.png',
+            mimeType='image/png',
+            bytes=base64.b64encode(data).decode(),
+        )
+    )
+
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = BlobStore(self.tmp.name, inline_limit=100)
+
+    def test_put_and_open(self):
+        data = os.urandom(5000)
+        uri = self.store.put(data)
+        digest = hashlib.sha256(data).hexdigest()
+        self.assertEqual(uri, f'blob:sha256:{digest}')
+        self.assertIn(uri, self.store)
+        self.assertEqual(self.store.open(uri), data)
+
+        self.store.use_mmap = False
+        self.assertEqual(self.store.open(uri), data)
+        self.assertEqual(self.store.open(self.store.put(b'')), b'')
+
+    def test_identical_payloads_are_stored_once(self):
+        data = os.urandom(1000)
+        uris = {self.store.put(data) for _ in range(3)}
+        self.assertEqual(len(uris), 1)
+        self.assertEqual((self.store.stored, self.store.deduplicated), (1, 2))
+        blobs = [p for p in Path(self.tmp.name).rglob('*') if p.is_file()]
+        self.assertEqual(len(blobs), 1)
+
+    def test_base_url(self):
+        store = BlobStore(self.tmp.name, base_url='http://agent/blobs/')
+        uri = store.put(b'data')
+        self.assertTrue(uri.startswith('http://agent/blobs/'))
+        self.assertEqual(store.open(uri), b'data')
+        self.assertIsNone(store.digest('http://agent/blobs/../secret'))
+        self.assertNotIn('http://elsewhere/x', store)
+
+    def test_externalize(self):
+        data = os.urandom(1000)
+        parts = [TextPart(text='hi'), file_part(data), file_part(b'tiny')]
+        self.store.externalize(parts)
+        self.assertEqual(parts[0].text, 'hi')
+        self.assertIsNone(parts[1].file.bytes)
+        self.assertEqual(parts[1].file.name, 'chart.png')
+        self.assertEqual(read_file_content(parts[1].file, self.store), data)
+        self.assertEqual(
+            parts[2].file.bytes, base64.b64encode(b'tiny').decode()
+        )
+
+    def test_read_file_content(self):
+        data = os.urandom(100)
+        self.assertEqual(read_file_content(file_part(data).file), data)
+        path = Path(self.tmp.name, 'spilled.bin')
+        path.write_bytes(data)
+        with self.assertRaises(ValueError):
+            read_file_content(FileContent(uri=path.as_uri()))
+        uri = self.store.put(data)
+        with self.assertRaises(ValueError):
+            read_file_content(FileContent(uri=uri))
+        with self.assertRaises(ValueError):
+            read_file_content(FileContent(uri='https://example.com/x.png'))
+
+    def test_spill_into_store(self):
+        data = os.urandom(10_000)
+        for chunk_size in (7, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                spiller = FileSpiller(1000, self.store)
+                body = file_body(data)
+                for i in range(0, len(body), chunk_size):
+                    spiller.feed(body[i : i + chunk_size])
+                result = json.loads(spiller.finish())
+                uri = result['params']['message']['parts'][0]['file']['uri']
+                self.assertEqual(self.store.open(uri), data)
+        self.assertEqual(os.listdir(Path(self.tmp.name, 'tmp')), [])
+
+
+class TestTaskManagerBlobs(unittest.IsolatedAsyncioTestCase):
+    async def test_task_holds_uris(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = BlobStore(tmp, inline_limit=100)
+            manager = EchoTaskManager(blob_store=store)
+            data = os.urandom(1000)
+            message = Message(role='user', parts=[file_part(data)])
+            await manager.upsert_task(TaskSendParams(id='t1', message=message))
+            await manager.upsert_task(
+                TaskSendParams(
+                    id='t1',
+                    message=Message(role='user', parts=[file_part(data)]),
+                )
+            )
+            task = await manager.update_store(
+                't1',
+                TaskStatus(
+                    state=TaskState.COMPLETED,
+                    message=Message(role='agent', parts=[file_part(data)]),
+                ),
+                [Artifact(parts=[file_part(data)])],
+            )
+            files = [
+                part.file
+                for part in task.history[0].parts
+                + task.history[-1].parts
+                + task.artifacts[0].parts
+            ]
+            self.assertTrue(all(file.bytes is None for file in files))
+            self.assertEqual(len({file.uri for file in files}), 1)
+            self.assertEqual(store.stored, 1)
+
+
+class TestBlobEndpoint(unittest.TestCase):
+    def test_serves_blobs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = BlobStore(tmp)
+            server = A2AServer(
+                agent_card=make_agent_card(),
+                task_manager=EchoTaskManager(),
+                blob_store=store,
+            )
+            client = TestClient(server.app)
+            data = os.urandom(2000)
+            digest = store.digest(store.put(data))
+            response = client.get(f'/blobs/{digest}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, data)
+            self.assertEqual(client.get('/blobs/..%2Fsecret').status_code, 404)
+            self.assertEqual(client.get(f'/blobs/{"0" * 64}').status_code, 404)
+
+
+class TestFetchBlob(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = BlobStore(tmp.name, base_url='http://agent/blobs')
+        server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=EchoTaskManager(),
+            blob_store=self.store,
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://agent',
+        )
+        self.addAsyncCleanup(self.client.aclose)
+
+    async def test_fetches_blobs_of_the_agent(self):
+        data = os.urandom(2000)
+        uri = self.store.put(data)
+        self.assertEqual(
+            await fetch_blob(uri, 'http://agent/', self.client), data
+        )
+
+    async def test_rejects_other_locations(self):
+        digest = self.store.digest(self.store.put(b'data'))
+        for uri in (
+            f'http://elsewhere/blobs/{digest}',
+            f'https://agent/blobs/{digest}',
+            'http://agent/blobs/secret',
+            f'file:///tmp/{digest}',
+        ):
+            with self.subTest(uri=uri), self.assertRaises(ValueError):
+                await fetch_blob(uri, 'http://agent/', self.client)
+
+    async def test_server_gives_blobs_its_own_url(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = BlobStore(tmp.name)
+        server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=EchoTaskManager(),
+            blob_store=store,
+        )
+        data = os.urandom(2000)
+        uri = store.put(data)
+        self.assertTrue(uri.startswith('http://localhost:5000/blobs/'))
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url='http://localhost:5000',
+        ) as client:
+            self.assertEqual(
+                await fetch_blob(uri, 'http://localhost:5000/', client), data
+            )
+        with self.assertRaises(ValueError):
+            A2AServer(
+                task_manager=EchoTaskManager(), blob_store=BlobStore(tmp.name)
+            )
+
+    async def test_rejects_content_not_matching_digest(self):
+        uri = self.store.put(b'data')
+        self.store.path(self.store.digest(uri)).write_bytes(b'other')
+        with self.assertRaises(ValueError):
+            await fetch_blob(uri, 'http://agent/', self.client)
@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+
+from common.server.task_manager import TaskCanceledError
+from common.types import (
+    CancelTaskRequest,
+    TaskIdParams,
+    TaskNotCancelableError,
+    TaskNotFoundError,
+    TaskState,
+    TaskStatus,
+)
+from test_event_log import StreamingTaskManager, subscribe_request
+
+
+def cancel_request(task_id='t1'):
+    return CancelTaskRequest(id='c1', params=TaskIdParams(id=task_id))
+
+
+class TestCancellation(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = StreamingTaskManager()
+        await self.manager.upsert_task(subscribe_request().params)
+
+    async def test_unknown_task(self):
+        response = await self.manager.on_cancel_task(cancel_request('nope'))
+        self.assertIsInstance(response.error, TaskNotFoundError)
+
+    async def test_task_without_runner(self):
+        response = await self.manager.on_cancel_task(cancel_request())
+        self.assertIsInstance(response.error, TaskNotCancelableError)
+
+    async def test_cancel_run_task(self):
+        started = asyncio.Event()
+        stopped = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+        running = asyncio.create_task(self.manager.run_task('t1', work()))
+        await started.wait()
+
+        response = await self.manager.on_cancel_task(cancel_request())
+        self.assertIsNone(response.error)
+        self.assertEqual(response.result.status.state, TaskState.CANCELED)
+        with self.assertRaises(TaskCanceledError):
+            await running
+        self.assertTrue(stopped.is_set())
+        self.assertNotIn('t1', self.manager._runners)
+
+        response = await self.manager.on_cancel_task(cancel_request())
+        self.assertIsInstance(response.error, TaskNotCancelableError)
+
+    async def test_runner_finishing_while_cancel_waits(self):
+        manager = StreamingTaskManager(lock_stripes=1)
+        await manager.upsert_task(subscribe_request().params)
+        finish = asyncio.Event()
+
+        async def work():
+            await finish.wait()
+            return await manager.update_store(
+                't1', TaskStatus(state=TaskState.COMPLETED), None
+            )
+
+        running = asyncio.create_task(manager.run_task('t1', work()))
+        lock = manager.task_lock('t1')
+        await lock.acquire()
+        finish.set()
+        await asyncio.sleep(0)
+        cancel = asyncio.create_task(manager.on_cancel_task(cancel_request()))
+        await asyncio.sleep(0)
+        lock.release()
+
+        response = await cancel
+        self.assertIsInstance(response.error, TaskNotCancelableError)
+        self.assertEqual((await running).status.state, TaskState.COMPLETED)
+        self.assertEqual(manager.tasks['t1'].status.state, TaskState.COMPLETED)
+
+    async def test_run_task_result(self):
+        async def work():
+            return 42
+
+        self.assertEqual(await self.manager.run_task('t1', work()), 42)
+        self.assertNotIn('t1', self.manager._runners)
+
+    async def test_cancel_stream_notifies_subscribers(self):
+        stream = await self.manager.on_send_task_subscribe(subscribe_request())
+        await anext(stream)
+        await anext(stream)
+        runner = self.manager._runners['t1']
+
+        response = await self.manager.on_cancel_task(cancel_request())
+        self.assertEqual(response.result.status.state, TaskState.CANCELED)
+
+        rest = [r async for r in stream]
+        self.assertEqual(len(rest), 1)
+        self.assertTrue(rest[0].result.final)
+        self.assertEqual(rest[0].result.status.state, TaskState.CANCELED)
+        await asyncio.sleep(0)
+        self.assertTrue(runner.cancelled())
+        self.assertEqual(
+            self.manager.tasks['t1'].status.state, TaskState.CANCELED
+        )
@@ -0,0 +1,72 @@
+import pytest
+
+from common.types import (
+    DataPart,
+    GetTaskResponse,
+    Message,
+    SendTaskRequest,
+    Task,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+)
+from common.utils.codec import JSONCodec, OrjsonCodec, get_codec, is_json_error
+from pydantic import TypeAdapter
+
+
+CODECS = [JSONCodec()]
+try:
+    CODECS.append(OrjsonCodec())
+except ImportError:
+    pass
+
+
+@pytest.fixture(params=CODECS, ids=lambda codec: codec.name)
+def codec(request):
+    return request.param
+
+
+def make_task():
+    series = {
+        f'2024-01-{day:02d}': {'close': 100.0 + day} for day in range(1, 29)
+    }
+    message = Message(
+        role='agent', parts=[DataPart(data={'daily_data': series})]
+    )
+    return Task(
+        id='t1',
+        status=TaskStatus(state=TaskState.COMPLETED, message=message),
+        history=[message],
+    )
+
+
+def test_model_round_trip(codec):
+    response = GetTaskResponse(id=1, result=make_task())
+    data = codec.encode(response)
+    assert isinstance(data, bytes)
+    assert b'null' not in data
+    assert codec.decode(GetTaskResponse, data) == response
+
+
+def test_decode_with_type_adapter(codec):
+    adapter = TypeAdapter(GetTaskResponse)
+    response = GetTaskResponse(id=1, result=make_task())
+    assert codec.decode(adapter, codec.encode(response)) == response
+
+
+def test_untyped_values(codec):
+    value = {'jsonrpc': '2.0', 'id': 1, 'result': [1, 'two', None]}
+    assert codec.loads(codec.dumps(value)) == value
+
+
+def test_invalid_json_is_detected(codec):
+    with pytest.raises(Exception) as excinfo:
+        codec.loads(b'{not json')
+    assert is_json_error(excinfo.value)
+
+
+def test_get_codec():
+    assert get_codec('pydantic').name == 'pydantic'
+    assert get_codec().name in ('pydantic', 'orjson')
+    with pytest.raises(ValueError):
+        get_codec('unknown')
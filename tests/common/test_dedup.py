@@ -0,0 +1,176 @@
+import asyncio
+import unittest
+
+from common.server.dedup import SendDeduplicator, send_key
+from common.server.metrics import task_manager_metrics
+from common.types import (
+    InternalError,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from test_server import EchoTaskManager
+
+
+def send_request(request_id, text='hello', task_id='t1'):
+    return SendTaskRequest(
+        id=request_id,
+        params=TaskSendParams(
+            id=task_id,
+            message=Message(role='user', parts=[TextPart(text=text)]),
+        ),
+    )
+
+
+class CountingTaskManager(EchoTaskManager):
+    """Counts agent invocations, each taking until `release` is set."""
+
+    def __init__(self, **kwargs):
+        super().__init__(send_dedup=SendDeduplicator(), **kwargs)
+        self.invocations = 0
+        self.release = asyncio.Event()
+        self.fail = False
+        self.state = TaskState.COMPLETED
+
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        return await self.deduplicate_send(request, self._send_task)
+
+    async def _send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        self.invocations += 1
+        await self.upsert_task(request.params)
+        await self.release.wait()
+        if self.fail:
+            return SendTaskResponse(id=request.id, error=InternalError())
+        task = await self.update_store(
+            request.params.id, TaskStatus(state=self.state), None
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+
+class TestSendKey(unittest.TestCase):
+    def test_same_message_same_key(self):
+        self.assertEqual(
+            send_key(send_request(1).params), send_key(send_request(2).params)
+        )
+        self.assertNotEqual(
+            send_key(send_request(1).params),
+            send_key(send_request(1, text='other').params),
+        )
+        self.assertNotEqual(
+            send_key(send_request(1).params),
+            send_key(send_request(1, task_id='t2').params),
+        )
+
+
+class TestSendDeduplication(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = CountingTaskManager()
+
+    async def test_retry_joins_running_request(self):
+        first = asyncio.create_task(self.manager.on_send_task(send_request(1)))
+        second = asyncio.create_task(self.manager.on_send_task(send_request(2)))
+        await asyncio.sleep(0)
+        self.manager.release.set()
+        responses = await asyncio.gather(first, second)
+
+        self.assertEqual(self.manager.invocations, 1)
+        self.assertEqual([r.id for r in responses], [1, 2])
+        self.assertEqual(responses[1].result.status.state, TaskState.COMPLETED)
+        self.assertEqual(len(self.manager.tasks['t1'].history), 1)
+        self.assertEqual(self.manager.send_dedup.joined, 1)
+
+    async def test_retry_of_finished_request_is_cached(self):
+        self.manager.release.set()
+        await self.manager.on_send_task(send_request(1))
+        response = await self.manager.on_send_task(send_request(2))
+        self.assertEqual(self.manager.invocations, 1)
+        self.assertEqual(response.id, 2)
+        self.assertEqual(self.manager.send_dedup.hits, 1)
+
+        await self.manager.on_send_task(send_request(3, text='next turn'))
+        self.assertEqual(self.manager.invocations, 2)
+
+    async def test_same_reply_to_input_request_is_the_next_turn(self):
+        self.manager.state = TaskState.INPUT_REQUIRED
+        self.manager.release.set()
+        await self.manager.on_send_task(send_request(1, text='yes'))
+        await self.manager.on_send_task(send_request(2, text='yes'))
+        self.assertEqual(self.manager.invocations, 2)
+        self.assertEqual(len(self.manager.tasks['t1'].history), 2)
+
+    async def test_stored_response_is_dropped_once_the_task_moves_on(self):
+        self.manager.release.set()
+        await self.manager.on_send_task(send_request(1))
+        await self.manager.on_send_task(send_request(2, text='next turn'))
+        await self.manager.on_send_task(send_request(3))
+        self.assertEqual(self.manager.invocations, 3)
+        self.assertEqual(self.manager.send_dedup.hits, 0)
+
+    async def test_window_expires(self):
+        self.manager.send_dedup.window = 0
+        self.manager.release.set()
+        await self.manager.on_send_task(send_request(1))
+        await self.manager.on_send_task(send_request(2))
+        self.assertEqual(self.manager.invocations, 2)
+
+    async def test_errors_are_not_cached(self):
+        self.manager.fail = True
+        self.manager.release.set()
+        await self.manager.on_send_task(send_request(1))
+        await self.manager.on_send_task(send_request(2))
+        self.assertEqual(self.manager.invocations, 2)
+
+    async def test_exceptions_propagate_to_joined_requests(self):
+        dedup = SendDeduplicator()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            raise RuntimeError('boom')
+
+        first = asyncio.create_task(dedup.run(('t1', 'm'), work))
+        second = asyncio.create_task(dedup.run(('t1', 'm'), work))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(len(dedup), 0)
+
+    async def test_first_request_giving_up(self):
+        first = asyncio.create_task(self.manager.on_send_task(send_request(1)))
+        second = asyncio.create_task(self.manager.on_send_task(send_request(2)))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        self.manager.release.set()
+
+        response = await second
+        self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.manager.invocations, 1)
+
+        response = await self.manager.on_send_task(send_request(3))
+        self.assertEqual(response.id, 3)
+        self.assertEqual(self.manager.send_dedup.hits, 1)
+
+    async def test_max_entries(self):
+        dedup = SendDeduplicator(max_entries=2)
+
+        async def work():
+            return 1
+
+        for i in range(5):
+            await dedup.run((f't{i}', 'm'), work)
+        self.assertEqual(len(dedup), 2)
+
+    async def test_metrics(self):
+        self.manager.release.set()
+        await self.manager.on_send_task(send_request(1))
+        await self.manager.on_send_task(send_request(2))
+        lines = list(task_manager_metrics(self.manager))
+        self.assertIn('a2a_send_dedup_total{outcome="cached"} 1', lines)
+        self.assertIn('a2a_send_dedup_total{outcome="executed"} 1', lines)
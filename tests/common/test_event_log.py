@@ -0,0 +1,311 @@
+import asyncio
+import unittest
+
+from collections.abc import AsyncIterable
+
+from starlette.testclient import TestClient
+
+from common.server import A2AServer
+from common.server.event_log import TaskEventLog, last_event_id
+from common.types import (
+    Artifact,
+    InternalError,
+    JSONRPCResponse,
+    Message,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskIdParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from test_server import EchoTaskManager, make_agent_card
+
+
+def status(state=TaskState.WORKING, final=False, task_id='t1'):
+    return TaskStatusUpdateEvent(
+        id=task_id, status=TaskStatus(state=state), final=final
+    )
+
+
+def artifact(text='a', task_id='t1'):
+    return TaskArtifactUpdateEvent(
+        id=task_id, artifact=Artifact(parts=[TextPart(text=text)])
+    )
+
+
+def events_of(task_id='t1'):
+    return [
+        status(task_id=task_id),
+        artifact(task_id=task_id),
+        status(TaskState.WORKING, task_id=task_id),
+        status(TaskState.COMPLETED, final=True, task_id=task_id),
+    ]
+
+
+class StreamingTaskManager(EchoTaskManager):
+    """Streams the events of events_of(), waiting for `gate` halfway."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.gate = asyncio.Event()
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        await self.upsert_task(request.params)
+        return await self.stream_task_events(
+            request.id, request.params.id, self._events(request)
+        )
+
+    async def _events(self, request):
+        for i, event in enumerate(events_of(request.params.id)):
+            if i == 2:
+                await self.gate.wait()
+            yield SendTaskStreamingResponse(id=request.id, result=event)
+
+
+def subscribe_request(task_id='t1'):
+    return SendTaskStreamingRequest(
+        id='r1',
+        params=TaskSendParams(
+            id=task_id,
+            message=Message(role='user', parts=[TextPart(text='hi')]),
+        ),
+    )
+
+
+def resubscribe_request(task_id='t1', last_id=None):
+    metadata = None if last_id is None else {'lastEventId': last_id}
+    return TaskResubscriptionRequest(
+        id='r2', params=TaskIdParams(id=task_id, metadata=metadata)
+    )
+
+
+class TestTaskEventLog(unittest.TestCase):
+    def test_sequence_numbers(self):
+        log = TaskEventLog()
+        self.assertEqual([log.append(e) for e in events_of()[:3]], [1, 2, 3])
+        self.assertEqual([seq for seq, _ in log.since(1)], [2, 3])
+        self.assertEqual([seq for seq, _ in log.since(None)], [1, 2, 3])
+        self.assertEqual(log.since(3), [])
+
+    def test_bounded(self):
+        log = TaskEventLog(max_events=3)
+        for _ in range(10):
+            log.append(status())
+        self.assertEqual([seq for seq, _ in log.since(None)], [8, 9, 10])
+        self.assertEqual([seq for seq, _ in log.since(2)], [8, 9, 10])
+
+    def test_compacted_when_final(self):
+        log = TaskEventLog()
+        for event in events_of():
+            log.append(event)
+        self.assertTrue(log.final)
+        self.assertEqual([seq for seq, _ in log.since(None)], [2, 4])
+        self.assertEqual(log.next_seq, 5)
+
+    def test_last_event_id(self):
+        self.assertEqual(last_event_id({'lastEventId': '7'}), 7)
+        self.assertEqual(last_event_id({'lastEventId': 3}), 3)
+        self.assertIsNone(last_event_id({'lastEventId': 'x'}))
+        self.assertIsNone(last_event_id(None))
+
+
+class TestResubscribe(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = StreamingTaskManager()
+
+    async def collect(self, stream):
+        return [
+            (response._event_id, response.result or response.error)
+            async for response in stream
+        ]
+
+    async def test_stream_survives_disconnect(self):
+        stream = await self.manager.on_send_task_subscribe(subscribe_request())
+        first = await anext(stream)
+        self.assertEqual(first._event_id, 1)
+        await stream.aclose()
+
+        self.manager.gate.set()
+        await asyncio.gather(*self.manager._runners.values())
+        self.assertIn('t1', self.manager.event_logs)
+
+        replay = await self.collect(
+            await self.manager.on_resubscribe_to_task(
+                resubscribe_request(last_id=1)
+            )
+        )
+        self.assertEqual([seq for seq, _ in replay], [2, 4])
+        self.assertTrue(replay[-1][1].final)
+
+    async def test_replay_then_live(self):
+        stream = await self.manager.on_send_task_subscribe(subscribe_request())
+        await anext(stream)
+        await anext(stream)
+        await stream.aclose()
+
+        resubscribed = await self.manager.on_resubscribe_to_task(
+            resubscribe_request(last_id=1)
+        )
+        self.assertEqual((await anext(resubscribed))._event_id, 2)
+        self.manager.gate.set()
+        rest = await self.collect(resubscribed)
+        self.assertEqual([seq for seq, _ in rest], [3, 4])
+
+    async def test_stream_end_without_final_event(self):
+        await self.manager.upsert_task(subscribe_request().params)
+
+        async def events():
+            yield SendTaskStreamingResponse(
+                id='r1', result=status(TaskState.INPUT_REQUIRED)
+            )
+
+        stream = await self.manager.stream_task_events('r1', 't1', events())
+        self.assertEqual(len(await self.collect(stream)), 1)
+        replay = await self.collect(
+            await self.manager.on_resubscribe_to_task(resubscribe_request())
+        )
+        self.assertEqual([seq for seq, _ in replay], [1])
+
+    async def test_next_turn_after_final_event(self):
+        await self.manager.upsert_task(subscribe_request().params)
+
+        async def first_turn():
+            yield SendTaskStreamingResponse(
+                id='r1', result=status(TaskState.INPUT_REQUIRED, final=True)
+            )
+
+        stream = await self.manager.stream_task_events('r1', 't1', first_turn())
+        self.assertEqual(len(await self.collect(stream)), 1)
+
+        async def second_turn():
+            yield SendTaskStreamingResponse(id='r3', result=status())
+            await self.manager.gate.wait()
+            yield SendTaskStreamingResponse(
+                id='r3', result=status(TaskState.COMPLETED, final=True)
+            )
+
+        await self.manager.stream_task_events('r3', 't1', second_turn())
+        resubscribed = await self.manager.on_resubscribe_to_task(
+            resubscribe_request(last_id=1)
+        )
+        self.manager.gate.set()
+        replay = await asyncio.wait_for(self.collect(resubscribed), 1)
+        self.assertEqual([seq for seq, _ in replay], [2, 3])
+        self.assertEqual(replay[-1][1].status.state, TaskState.COMPLETED)
+
+    async def test_producer_error(self):
+        await self.manager.upsert_task(subscribe_request().params)
+
+        async def events():
+            raise RuntimeError('boom')
+            yield
+
+        stream = await self.manager.stream_task_events('r1', 't1', events())
+        responses = await self.collect(stream)
+        self.assertIsInstance(responses[-1][1], InternalError)
+
+    async def test_finished_task_without_log(self):
+        await self.manager.upsert_task(subscribe_request().params)
+        await self.manager.update_store(
+            't1', TaskStatus(state=TaskState.COMPLETED), None
+        )
+        replay = await self.collect(
+            await self.manager.on_resubscribe_to_task(resubscribe_request())
+        )
+        self.assertEqual(len(replay), 1)
+        self.assertEqual(replay[0][1].status.state, TaskState.COMPLETED)
+
+    async def test_unstreamed_task_in_progress(self):
+        await self.manager.upsert_task(subscribe_request().params)
+        done = asyncio.Event()
+
+        async def work():
+            await done.wait()
+            await self.manager.update_store(
+                't1', TaskStatus(state=TaskState.COMPLETED), None
+            )
+
+        runner = asyncio.create_task(self.manager.run_task('t1', work()))
+        await asyncio.sleep(0)
+        stream = await self.manager.on_resubscribe_to_task(
+            resubscribe_request()
+        )
+        done.set()
+        replay = await asyncio.wait_for(self.collect(stream), 1)
+        await runner
+        self.assertEqual(len(replay), 1)
+        self.assertEqual(replay[0][1].status.state, TaskState.COMPLETED)
+        self.assertTrue(replay[0][1].final)
+
+    async def test_unstreamed_task_without_local_runner(self):
+        await self.manager.upsert_task(subscribe_request().params)
+        replay = await asyncio.wait_for(
+            self.collect(
+                await self.manager.on_resubscribe_to_task(resubscribe_request())
+            ),
+            1,
+        )
+        self.assertEqual(len(replay), 1)
+        self.assertEqual(replay[0][1].status.state, TaskState.SUBMITTED)
+        self.assertFalse(replay[0][1].final)
+
+
+class TestResubscribeOverHTTP(unittest.TestCase):
+    def setUp(self):
+        self.manager = StreamingTaskManager()
+        self.manager.gate.set()
+        server = A2AServer(
+            agent_card=make_agent_card(), task_manager=self.manager
+        )
+        self.client = TestClient(server.app)
+
+    def post(self, request, headers=None):
+        return self.client.post(
+            '/', content=request.model_dump_json(), headers=headers
+        )
+
+    def test_event_ids_are_sequence_numbers(self):
+        response = self.post(subscribe_request())
+        self.assertEqual(
+            [
+                line
+                for line in response.text.splitlines()
+                if line.startswith('id:')
+            ],
+            ['id: 1', 'id: 2', 'id: 3', 'id: 4'],
+        )
+
+        response = self.post(
+            resubscribe_request(), headers={'Last-Event-ID': '2'}
+        )
+        self.assertEqual(response.text.count('data: '), 1)
+        self.assertIn('id: 4', response.text)
+
+    def test_shared_event_encoding(self):
+        manager = StreamingTaskManager()
+        server = A2AServer(agent_card=make_agent_card(), task_manager=manager)
+        event = status()
+        first = server._encode_stream_item(
+            SendTaskStreamingResponse(id='a', result=event)
+        )
+        second = server._encode_stream_item(
+            SendTaskStreamingResponse(id=2, result=event)
+        )
+        self.assertEqual(
+            first,
+            server.codec.encode(
+                SendTaskStreamingResponse(id='a', result=event)
+            ),
+        )
+        self.assertEqual(
+            second,
+            server.codec.encode(SendTaskStreamingResponse(id=2, result=event)),
+        )
+        self.assertIsNotNone(event._json)
@@ -0,0 +1,155 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from common.server import A2AServer
+from common.server.metrics import Histogram, MethodMetrics, ServerMetrics
+from common.utils.push_notification_auth import PushNotificationSenderAuth
+from starlette.testclient import TestClient
+from test_server import EchoTaskManager, make_agent_card, send_task_body
+
+
+def parse(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, _, value = line.rpartition(' ')
+            samples[name] = float(value)
+    return samples
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        lines = list(histogram.render('latency', 'method="m"'))
+        self.assertEqual(
+            lines[:3],
+            [
+                'latency_bucket{method="m",le="0.1"} 2',
+                'latency_bucket{method="m",le="1.0"} 3',
+                'latency_bucket{method="m",le="+Inf"} 4',
+            ],
+        )
+        self.assertEqual(lines[-1], 'latency_count{method="m"} 4')
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        )
+        self.client = TestClient(self.server.app)
+
+    def scrape(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['content-type'].startswith('text/'))
+        return parse(response.text)
+
+    def test_request_metrics(self):
+        self.client.post('/', json=send_task_body('t1', 1))
+        self.client.post('/', json=send_task_body('t2', 2))
+        self.client.post(
+            '/',
+            json={
+                'jsonrpc': '2.0',
+                'id': 3,
+                'method': 'tasks/get',
+                'params': {'id': 'missing'},
+            },
+        )
+        samples = self.scrape()
+        self.assertEqual(samples['a2a_requests_total{method="tasks/send"}'], 2)
+        self.assertEqual(
+            samples['a2a_request_errors_total{method="tasks/get"}'], 1
+        )
+        self.assertEqual(
+            samples['a2a_requests_in_flight{method="tasks/send"}'], 0
+        )
+        self.assertEqual(
+            samples[
+                'a2a_request_duration_seconds_bucket'
+                '{method="tasks/send",le="+Inf"}'
+            ],
+            2,
+        )
+        self.assertEqual(samples['a2a_tasks{state="completed"}'], 2)
+        self.assertEqual(samples['a2a_tasks{state="working"}'], 0)
+        self.assertEqual(samples['a2a_sse_subscribers'], 0)
+
+    def test_tasks_by_state_from_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.server.task_manager = EchoTaskManager(
+                store_path=str(Path(tmp) / 'tasks.db')
+            )
+            self.client.post('/', json=send_task_body('t1', 1))
+            samples = self.scrape()
+        self.assertEqual(samples['a2a_tasks{state="completed"}'], 1)
+
+    def test_metrics_can_be_disabled(self):
+        server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=EchoTaskManager(),
+            metrics=False,
+        )
+        client = TestClient(server.app)
+        self.assertEqual(
+            client.post('/', json=send_task_body()).status_code, 200
+        )
+        self.assertEqual(client.get('/metrics').status_code, 404)
+
+
+class TestMethodMetrics(unittest.IsolatedAsyncioTestCase):
+    async def test_track_ends_streams_dropped_unstarted(self):
+        metrics = MethodMetrics()
+
+        async def stream():
+            yield 1
+
+        metrics.begin()
+        tracked = metrics.track(stream())
+        self.assertEqual(metrics.in_flight, 1)
+        del tracked
+        self.assertEqual(metrics.in_flight, 0)
+
+
+class TestPushNotificationMetrics(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_delivery_is_counted(self):
+        metrics = ServerMetrics()
+        sender = PushNotificationSenderAuth(metrics=metrics)
+        sender.generate_jwk()
+        await sender.send_push_notification('http://127.0.0.1:9/', {'a': 1})
+        self.assertEqual(metrics.push_notifications.count, 1)
+        self.assertEqual(metrics.push_notification_failures, 1)
+        self.assertIn(
+            b'a2a_push_notification_failures_total 1', metrics.render()
+        )
+
+    def test_sender_imports_without_the_server(self):
+        # The CLI host imports push_notification_auth before common.server.
+        subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                'import common.utils.push_notification_auth',
+            ],
+            check=True,
+        )
+
+    async def test_sender_reports_to_the_server(self):
+        server = A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        )
+        sender = PushNotificationSenderAuth()
+        sender.generate_jwk()
+        server.add_push_notification_sender(sender)
+        await sender.send_push_notification('http://127.0.0.1:9/', {'a': 1})
+        self.assertEqual(server.metrics.push_notification_failures, 1)
+        client = TestClient(server.app)
+        keys = client.get('/.well-known/jwks.json').json()['keys']
+        self.assertEqual(len(keys), 1)
@@ -0,0 +1,164 @@
+import base64
+import json
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from common.server import A2AServer
+from common.server.request_body import FileSpiller
+from common.types import SendTaskRequest, SendTaskResponse
+from common.utils.blob_store import BlobStore
+from starlette.testclient import TestClient
+from test_server import EchoTaskManager, make_agent_card, send_task_body
+
+
+def file_body(data: bytes, **file_fields):
+    body = send_task_body()
+    body['params']['message']['parts'] = [
+        {
+            'type': 'file',
+            'file': {
+                'name': 'chart.png',
+                'bytes': base64.b64encode(data).decode(),
+                **file_fields,
+            },
+        },
+        {'type': 'data', 'data': {'bytes': 'not a file', 'file': {}}},
+    ]
+    return json.dumps(body).encode()
+
+
+def spill(body: bytes, threshold: int, chunk_size: int, store: BlobStore):
+    spiller = FileSpiller(threshold, store)
+    for i in range(0, len(body), chunk_size):
+        spiller.feed(body[i : i + chunk_size])
+    return json.loads(spiller.finish())
+
+
+class TestFileSpiller(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = BlobStore(self.tmp.name)
+
+    def test_large_file_bytes_are_spilled(self):
+        data = os.urandom(10_000)
+        for chunk_size in (1, 7, 4096, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                body = spill(
+                    file_body(data, mimeType='image/png'),
+                    1000,
+                    chunk_size,
+                    self.store,
+                )
+                parts = body['params']['message']['parts']
+                self.assertEqual(
+                    parts[0]['file'],
+                    {
+                        'name': 'chart.png',
+                        'uri': self.store.put(data),
+                        'mimeType': 'image/png',
+                    },
+                )
+                self.assertEqual(parts[1]['data']['bytes'], 'not a file')
+
+    def test_small_file_bytes_stay_inline(self):
+        body = file_body(b'small')
+        result = spill(body, 1000, 3, self.store)
+        self.assertEqual(result, json.loads(body))
+        self.assertEqual(self.store.stored, 0)
+
+    def test_only_file_parts_of_the_message_are_spilled(self):
+        content = {'bytes': base64.b64encode(os.urandom(3000)).decode()}
+        body = send_task_body()
+        body['params']['message']['parts'] = [
+            {'type': 'data', 'data': {'file': content}},
+            {'type': 'data', 'data': {}, 'file': content},
+            {'file': content, 'type': 'file'},
+        ]
+        body['params']['message']['metadata'] = {'file': content}
+        body['params']['metadata'] = {
+            'message': {'parts': [{'type': 'file', 'file': content}]}
+        }
+        body['file'] = content
+        data = json.dumps(body).encode()
+        self.assertEqual(spill(data, 100, 7, self.store), json.loads(data))
+        self.assertEqual(self.store.stored, 0)
+
+    def test_batch_items(self):
+        data = os.urandom(3000)
+        body = b'[' + file_body(data) + b',' + file_body(data) + b']'
+        result = spill(body, 100, 7, self.store)
+        uris = [
+            item['params']['message']['parts'][0]['file']['uri']
+            for item in result
+        ]
+        self.assertEqual(uris, [self.store.put(data)] * 2)
+
+    def test_escaped_base64(self):
+        data = os.urandom(3000)
+        encoded = base64.encodebytes(data).decode().replace('/', '\\/')
+        body = file_body(b'@').replace(
+            base64.b64encode(b'@'), encoded.replace('\n', '\\n').encode()
+        )
+        body = body.replace(b'"chart.png"', b'"a \\"quoted\\" \\\\ name"')
+        result = spill(body, 100, 5, self.store)
+        file = result['params']['message']['parts'][0]['file']
+        self.assertEqual(self.store.open(file['uri']), data)
+        self.assertEqual(file['name'], 'a "quoted" \\ name')
+
+    def test_invalid_base64_discards_file(self):
+        body = file_body(b'').replace(
+            b'"bytes": ""', b'"bytes": "' + b'!' * 2000 + b'"'
+        )
+        spiller = FileSpiller(100, self.store)
+        with self.assertRaises(ValueError):
+            spiller.feed(body)
+        self.assertEqual(os.listdir(Path(self.tmp.name, 'tmp')), [])
+
+
+class FileTaskManager(EchoTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        self.file = request.params.message.parts[0].file
+        return await super().on_send_task(request)
+
+
+class TestServerRequestBody(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = BlobStore(self.tmp.name)
+        self.task_manager = FileTaskManager()
+        self.server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=self.task_manager,
+            max_body_size=100_000,
+            file_spill_threshold=1000,
+            blob_store=self.store,
+        )
+        self.client = TestClient(self.server.app)
+
+    def test_file_reaches_handler_as_uri(self):
+        data = os.urandom(20_000)
+        response = self.client.post('/', content=file_body(data))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(self.task_manager.file.bytes)
+        self.assertEqual(self.store.open(self.task_manager.file.uri), data)
+
+    def test_body_too_large(self):
+        response = self.client.post('/', content=file_body(os.urandom(80_000)))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+    def test_no_spilling_without_blob_store(self):
+        server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=self.task_manager,
+            file_spill_threshold=1000,
+        )
+        data = os.urandom(20_000)
+        response = TestClient(server.app).post('/', content=file_body(data))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(base64.b64decode(self.task_manager.file.bytes), data)
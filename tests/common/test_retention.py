@@ -0,0 +1,207 @@
+import asyncio
+import unittest
+
+from common.server.metrics import task_manager_metrics
+from common.server.retention import TaskRetention
+from common.types import (
+    GetTaskRequest,
+    Message,
+    PushNotificationConfig,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from test_server import EchoTaskManager
+
+
+def send_params(task_id):
+    return TaskSendParams(
+        id=task_id, message=Message(role='user', parts=[TextPart(text='hi')])
+    )
+
+
+class TestTaskRetention(unittest.IsolatedAsyncioTestCase):
+    async def create(self, manager, task_id, state=None):
+        await manager.upsert_task(send_params(task_id))
+        if state is not None:
+            await manager.update_store(task_id, TaskStatus(state=state), None)
+
+    async def test_keeps_everything_without_policy(self):
+        manager = EchoTaskManager()
+        for i in range(10):
+            await self.create(manager, f't{i}', TaskState.COMPLETED)
+        self.assertEqual(len(manager.tasks), 10)
+        self.assertEqual(await manager.evict_tasks(), [])
+
+    async def test_terminal_tasks_expire(self):
+        manager = EchoTaskManager(retention=TaskRetention(ttl=0))
+        await self.create(manager, 'done', TaskState.COMPLETED)
+        await self.create(manager, 'failed', TaskState.FAILED)
+        await self.create(manager, 'working', TaskState.WORKING)
+
+        response = await manager.on_get_task(
+            GetTaskRequest(params=TaskQueryParams(id='done'))
+        )
+        self.assertIsNotNone(response.error)
+        self.assertEqual(list(manager.tasks), ['working'])
+        self.assertEqual(manager.retention.expired, 2)
+
+    async def test_ttl_not_reached(self):
+        manager = EchoTaskManager(retention=TaskRetention(ttl=60))
+        await self.create(manager, 't1', TaskState.CANCELED)
+        self.assertEqual(await manager.evict_tasks(), [])
+        self.assertIn('t1', manager.tasks)
+
+    async def test_count_budget_evicts_least_recently_used(self):
+        manager = EchoTaskManager(retention=TaskRetention(max_tasks=2))
+        await self.create(manager, 't1', TaskState.COMPLETED)
+        await self.create(manager, 't2', TaskState.COMPLETED)
+        await manager.on_get_task(
+            GetTaskRequest(params=TaskQueryParams(id='t1'))
+        )
+        await self.create(manager, 't3', TaskState.COMPLETED)
+
+        self.assertEqual(sorted(manager.tasks), ['t1', 't3'])
+        self.assertEqual(manager.retention.evicted, 1)
+
+    async def test_byte_budget(self):
+        retention = TaskRetention(max_bytes=1000)
+        manager = EchoTaskManager(retention=retention)
+        for i in range(20):
+            await self.create(manager, f't{i}', TaskState.COMPLETED)
+        self.assertLessEqual(retention.bytes, 1000)
+        self.assertGreater(retention.evicted, 0)
+        self.assertEqual(len(manager.tasks), len(retention))
+        self.assertIn('t19', manager.tasks)
+
+    async def test_eviction_drops_related_state(self):
+        manager = EchoTaskManager(retention=TaskRetention(max_tasks=1))
+        await self.create(manager, 't1', TaskState.COMPLETED)
+        await manager.set_push_notification_info(
+            't1', PushNotificationConfig(url='http://example.com')
+        )
+        manager.task_sse_subscribers['t1'] = []
+        await self.create(manager, 't2', TaskState.COMPLETED)
+        self.assertIn('t1', manager.tasks)
+
+        del manager.task_sse_subscribers['t1']
+        await self.create(manager, 't3', TaskState.COMPLETED)
+        self.assertEqual(sorted(manager.tasks), ['t3'])
+        self.assertNotIn('t1', manager.push_notification_infos)
+
+    async def test_budget_keeps_tasks_in_progress(self):
+        manager = EchoTaskManager(retention=TaskRetention(max_tasks=1))
+        await self.create(manager, 't1', TaskState.WORKING)
+        await self.create(manager, 't2')
+        self.assertEqual(sorted(manager.tasks), ['t1', 't2'])
+
+        await manager.update_store(
+            't1', TaskStatus(state=TaskState.COMPLETED), None
+        )
+        self.assertEqual(list(manager.tasks), ['t2'])
+
+    async def test_budget_keeps_running_work(self):
+        manager = EchoTaskManager(retention=TaskRetention(max_tasks=2))
+        started = asyncio.Event()
+
+        async def send(task_id):
+            await self.create(manager, task_id)
+
+            async def work():
+                await started.wait()
+                return await manager.update_store(
+                    task_id, TaskStatus(state=TaskState.COMPLETED), None
+                )
+
+            return await manager.run_task(task_id, work())
+
+        sends = [asyncio.create_task(send(f't{i}')) for i in range(4)]
+        await asyncio.sleep(0)
+        started.set()
+        tasks = await asyncio.gather(*sends)
+        self.assertEqual(
+            [task.status.state for task in tasks], ['completed'] * 4
+        )
+        # Finished work becomes evictable at the next update.
+        await manager.evict_tasks()
+        self.assertEqual(len(manager.tasks), 2)
+
+    async def test_archive(self):
+        archived = []
+
+        async def archive(task):
+            archived.append(task.id)
+
+        manager = EchoTaskManager(
+            retention=TaskRetention(max_tasks=1, archive=archive)
+        )
+        await self.create(manager, 't1', TaskState.COMPLETED)
+        await self.create(manager, 't2')
+        await manager.wait_archived()
+        self.assertEqual(archived, ['t1'])
+        self.assertEqual(manager.retention.archived, 1)
+
+    async def test_slow_archive_does_not_hold_up_new_tasks(self):
+        archiving = asyncio.Event()
+
+        async def archive(task):
+            await archiving.wait()
+
+        manager = EchoTaskManager(
+            retention=TaskRetention(max_tasks=1, archive=archive)
+        )
+        await self.create(manager, 't1', TaskState.COMPLETED)
+        for task_id in ('t2', 't3'):
+            await asyncio.wait_for(
+                self.create(manager, task_id, TaskState.COMPLETED), 1
+            )
+        self.assertEqual(manager.retention.archived, 0)
+
+        archiving.set()
+        await manager.wait_archived()
+        self.assertEqual(manager.retention.archived, 2)
+
+    async def test_archive_errors_are_counted(self):
+        def archive(task):
+            raise OSError('disk full')
+
+        manager = EchoTaskManager(
+            retention=TaskRetention(max_tasks=1, archive=archive)
+        )
+        await self.create(manager, 't1', TaskState.COMPLETED)
+        await self.create(manager, 't2')
+        self.assertNotIn('t1', manager.tasks)
+        await manager.wait_archived()
+        self.assertEqual(manager.retention.archive_errors, 1)
+
+    async def test_metrics(self):
+        manager = EchoTaskManager(retention=TaskRetention(max_tasks=1))
+        await self.create(manager, 't1', TaskState.COMPLETED)
+        await self.create(manager, 't2')
+        lines = list(task_manager_metrics(manager))
+        self.assertIn('a2a_tasks_evicted_total{reason="capacity"} 1', lines)
+        self.assertIn('a2a_tasks_evicted_total{reason="expired"} 0', lines)
+
+    async def test_last_stream_removes_subscriber_list(self):
+        manager = EchoTaskManager()
+        await self.create(manager, 't1')
+        first = await manager.setup_sse_consumer('t1')
+        second = await manager.setup_sse_consumer('t1')
+        await manager.enqueue_events_for_sse(
+            't1',
+            TaskStatusUpdateEvent(
+                id='t1', status=TaskStatus(state=TaskState.WORKING)
+            ),
+        )
+        stream = manager.dequeue_events_for_sse('r1', 't1', first)
+        await anext(stream)
+        await stream.aclose()
+        self.assertEqual(manager.task_sse_subscribers['t1'], (second,))
+
+        stream = manager.dequeue_events_for_sse('r1', 't1', second)
+        await anext(stream)
+        await stream.aclose()
+        self.assertNotIn('t1', manager.task_sse_subscribers)
@@ -0,0 +1,114 @@
+import unittest
+
+from datetime import datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+
+from common.server import A2AServer
+from common.types import (
+    A2ARequest,
+    GetTaskRequest,
+    Message,
+    SendTaskStreamingResponse,
+    Task,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.utils.codec import JSONCodec
+from common.utils.serialization import (
+    StatusUpdateTemplate,
+    status_template,
+    to_json,
+    type_adapter,
+)
+from test_server import EchoTaskManager, make_agent_card
+
+
+class TestTypeAdapter(unittest.TestCase):
+    def test_cached(self):
+        self.assertIs(type_adapter(list[Task]), type_adapter(list[Task]))
+        adapter = TypeAdapter(int)
+        self.assertIs(type_adapter(adapter), adapter)
+
+    def test_codec_decodes_non_model_types(self):
+        codec = JSONCodec()
+        request = codec.decode(
+            A2ARequest, b'{"id":1,"method":"tasks/get","params":{"id":"t1"}}'
+        )
+        self.assertIsInstance(request, GetTaskRequest)
+        tasks = codec.decode(list[Task], b'[]')
+        self.assertEqual(tasks, [])
+
+
+class TestStatusUpdateTemplate(unittest.TestCase):
+    def validated(self, task_id, timestamp, final=False):
+        return TaskStatusUpdateEvent(
+            id=task_id,
+            status=TaskStatus(
+                state=TaskState.WORKING,
+                message=Message(
+                    role='agent', parts=[TextPart(text='Processing...')]
+                ),
+                timestamp=timestamp,
+            ),
+            final=final,
+        )
+
+    def test_matches_serializer(self):
+        template = status_template(TaskState.WORKING, 'Processing...')
+        timestamp = datetime(2025, 4, 1, 12, 30, 5, 123456)
+        for task_id in ('t1', 'quote"and\\slash', 'ünïcode', ''):
+            event = template.event(task_id, timestamp)
+            expected = self.validated(task_id, timestamp)
+            self.assertEqual(event.model_dump(), expected.model_dump())
+            self.assertEqual(event._json, to_json(expected))
+
+    def test_whole_second_timestamps(self):
+        template = status_template(TaskState.WORKING, 'Processing...')
+        timestamp = datetime(2025, 4, 1, 12, 30, 5)
+        event = template.event('t1', timestamp)
+        self.assertEqual(event._json, to_json(self.validated('t1', timestamp)))
+
+    def test_aware_timestamps(self):
+        template = status_template(TaskState.WORKING, 'Processing...')
+        for timestamp in (
+            datetime(2025, 4, 1, 12, 30, 5, tzinfo=timezone.utc),
+            datetime(
+                2025, 4, 1, 12, 30, 5, tzinfo=timezone(timedelta(hours=2))
+            ),
+        ):
+            event = template.event('t1', timestamp)
+            self.assertEqual(
+                event._json, to_json(self.validated('t1', timestamp))
+            )
+
+    def test_without_message(self):
+        template = status_template(TaskState.COMPLETED, final=True)
+        event = template.event('t1')
+        self.assertIsNone(event.status.message)
+        self.assertTrue(event.final)
+        self.assertEqual(event._json, to_json(event))
+
+    def test_templates_are_cached(self):
+        self.assertIs(
+            status_template(TaskState.WORKING, 'Processing...'),
+            status_template(TaskState.WORKING, 'Processing...'),
+        )
+        self.assertIsInstance(
+            status_template(TaskState.WORKING), StatusUpdateTemplate
+        )
+
+    def test_server_sends_template_json(self):
+        server = A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        )
+        event = status_template(TaskState.WORKING, 'Processing...').event('t1')
+        event._json = b'{"sentinel":true}'
+        encoded = server._encode_stream_item(
+            SendTaskStreamingResponse(id=7, result=event)
+        )
+        self.assertEqual(
+            encoded, b'{"jsonrpc":"2.0","id":7,"result":{"sentinel":true}}'
+        )
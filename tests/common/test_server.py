@@ -0,0 +1,325 @@
+import unittest
+
+from collections.abc import AsyncIterable
+
+from common.server import A2AServer, InMemoryTaskManager
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    JSONRPCResponse,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    TaskState,
+    TaskStatus,
+)
+from common.utils.compression import available_encodings, negotiate
+from starlette.testclient import TestClient
+
+
+class EchoTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        await self.upsert_task(request.params)
+        task = await self.update_store(
+            request.params.id, TaskStatus(state=TaskState.COMPLETED), None
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        pass
+
+
+def make_agent_card():
+    return AgentCard(
+        name='Echo Agent',
+        url='http://localhost:5000/',
+        version='1.0.0',
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+
+
+def send_task_body(task_id='t1', request_id=1):
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': 'tasks/send',
+        'params': {
+            'id': task_id,
+            'message': {
+                'role': 'user',
+                'parts': [{'type': 'text', 'text': 'hello'}],
+            },
+        },
+    }
+
+
+class TestA2AServer(unittest.TestCase):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        )
+        self.client = TestClient(self.server.app)
+
+    def test_send_and_get_task(self):
+        response = self.client.post('/', json=send_task_body())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['result']['id'], 't1')
+
+        response = self.client.post(
+            '/',
+            json={
+                'jsonrpc': '2.0',
+                'id': 2,
+                'method': 'tasks/get',
+                'params': {'id': 't1'},
+            },
+        )
+        self.assertEqual(response.json()['id'], 2)
+        self.assertEqual(
+            response.json()['result']['status']['state'], 'completed'
+        )
+
+    def test_unknown_method(self):
+        response = self.client.post(
+            '/', json={'jsonrpc': '2.0', 'id': 7, 'method': 'tasks/unknown'}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['id'], 7)
+        self.assertEqual(response.json()['error']['code'], -32601)
+
+    def test_missing_method(self):
+        response = self.client.post('/', json={'jsonrpc': '2.0', 'id': 7})
+        self.assertEqual(response.json()['error']['code'], -32600)
+        response = self.client.post('/', content=b'"tasks/get"')
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+    def test_invalid_params(self):
+        body = send_task_body()
+        del body['params']['message']
+        response = self.client.post('/', json=body)
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+    def test_invalid_json(self):
+        response = self.client.post('/', content=b'{not json')
+        self.assertEqual(response.json()['error']['code'], -32700)
+
+    def test_register_method(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            return JSONRPCResponse(id=request.id, result={'ok': True})
+
+        self.server.register_method(SendTaskRequest, handler)
+        response = self.client.post('/', json=send_task_body())
+        self.assertEqual(response.json()['result'], {'ok': True})
+        self.assertIsInstance(calls[0], SendTaskRequest)
+
+
+class TestA2AServerBatch(unittest.TestCase):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        )
+        self.client = TestClient(self.server.app)
+
+    def test_batch(self):
+        batch = [
+            send_task_body('t1', 1),
+            send_task_body('t2', 2),
+            {
+                'jsonrpc': '2.0',
+                'id': 3,
+                'method': 'tasks/get',
+                'params': {'id': 'missing'},
+            },
+        ]
+        response = self.client.post('/', json=batch)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual([item['id'] for item in results], [1, 2, 3])
+        self.assertEqual(results[0]['result']['id'], 't1')
+        self.assertEqual(results[1]['result']['id'], 't2')
+        self.assertEqual(results[2]['error']['code'], -32001)
+
+    def test_batch_rejects_streaming_methods(self):
+        body = send_task_body('t1', 1)
+        body['method'] = 'tasks/sendSubscribe'
+        response = self.client.post('/', json=[body, send_task_body('t2', 2)])
+        results = response.json()
+        self.assertEqual(results[0]['error']['code'], -32600)
+        self.assertEqual(results[1]['result']['id'], 't2')
+
+    def test_batch_invalid_items(self):
+        response = self.client.post(
+            '/', json=[1, {'jsonrpc': '2.0', 'id': 5, 'method': 'nope'}]
+        )
+        results = response.json()
+        self.assertEqual(
+            results[0],
+            {
+                'jsonrpc': '2.0',
+                'error': {
+                    'code': -32600,
+                    'message': 'Request payload validation error',
+                },
+            },
+        )
+        self.assertEqual(results[1]['error']['code'], -32601)
+
+    def test_empty_batch(self):
+        response = self.client.post('/', json=[])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error']['code'], -32600)
+
+
+class TestSchemaValidation(TestA2AServer):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=EchoTaskManager(),
+            validation='schema',
+        )
+        self.client = TestClient(self.server.app)
+
+    def test_error_location(self):
+        body = send_task_body()
+        body['params']['message']['parts'][0]['text'] = 42
+        error = self.client.post('/', json=body).json()['error']
+        self.assertEqual(error['code'], -32600)
+        self.assertEqual(
+            error['data'][0]['loc'], ['params', 'message', 'parts', 0, 'text']
+        )
+
+    def test_methods_outside_the_schema(self):
+        response = self.client.post(
+            '/',
+            json={'jsonrpc': '2.0', 'id': 1, 'method': 'tasks/list'},
+        )
+        self.assertEqual(response.json()['result']['tasks'], [])
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            A2AServer(agent_card=make_agent_card(), validation='fast')
+
+
+class TestSchemaValidationBatch(TestA2AServerBatch):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=EchoTaskManager(),
+            validation='schema',
+        )
+        self.client = TestClient(self.server.app)
+
+
+class TestAgentCardEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        )
+        self.client = TestClient(self.server.app)
+
+    def get_card(self, **headers):
+        return self.client.get('/.well-known/agent.json', headers=headers)
+
+    def test_get_card(self):
+        response = self.get_card(**{'Accept-Encoding': 'identity'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'Echo Agent')
+        self.assertNotIn('content-encoding', response.headers)
+        self.assertIn('max-age=300', response.headers['cache-control'])
+        self.assertTrue(response.headers['etag'].startswith('"'))
+
+    def test_gzip_variant(self):
+        response = self.get_card(**{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['content-encoding'], 'gzip')
+        self.assertEqual(response.json()['name'], 'Echo Agent')
+
+    def test_variant_per_encoding(self):
+        etags = {
+            self.get_card(**{'Accept-Encoding': 'identity'}).headers['etag']
+        }
+        for encoding in available_encodings():
+            with self.subTest(encoding=encoding):
+                response = self.get_card(**{'Accept-Encoding': encoding})
+                self.assertEqual(response.headers['content-encoding'], encoding)
+                etags.add(response.headers['etag'])
+        self.assertEqual(len(etags), len(available_encodings()) + 1)
+
+    def test_if_none_match(self):
+        etag = self.get_card(**{'Accept-Encoding': 'identity'}).headers['etag']
+        response = self.get_card(
+            **{'If-None-Match': etag, 'Accept-Encoding': 'identity'}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_card_change_regenerates_body(self):
+        etag = self.get_card().headers['etag']
+        card = make_agent_card()
+        card.name = 'Renamed Agent'
+        self.server.agent_card = card
+        response = self.get_card(**{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'Renamed Agent')
+
+    def test_card_list(self):
+        self.server.agent_card = [make_agent_card(), make_agent_card()]
+        response = self.get_card()
+        self.assertEqual(len(response.json()), 2)
+
+
+class TestResponseCompression(unittest.TestCase):
+    def setUp(self):
+        self.server = A2AServer(
+            agent_card=make_agent_card(),
+            task_manager=EchoTaskManager(),
+            compression_min_size=512,
+        )
+        self.client = TestClient(self.server.app)
+
+    def post_task(self, text, encoding):
+        body = send_task_body()
+        body['params']['message']['parts'][0]['text'] = text
+        self.client.post('/', json=body)
+        return self.client.post(
+            '/',
+            json={
+                'jsonrpc': '2.0',
+                'id': 2,
+                'method': 'tasks/get',
+                'params': {'id': 't1', 'historyLength': 10},
+            },
+            headers={'Accept-Encoding': encoding},
+        )
+
+    def test_large_response_is_compressed(self):
+        for encoding in available_encodings():
+            with self.subTest(encoding=encoding):
+                response = self.post_task('price ' * 1000, encoding)
+                self.assertEqual(response.headers['content-encoding'], encoding)
+                self.assertLess(int(response.headers['content-length']), 6000)
+                self.assertEqual(response.json()['result']['id'], 't1')
+
+    def test_small_response_is_not_compressed(self):
+        response = self.post_task('hi', 'gzip')
+        self.assertNotIn('content-encoding', response.headers)
+
+    def test_identity_only(self):
+        response = self.post_task('price ' * 1000, 'identity')
+        self.assertNotIn('content-encoding', response.headers)
+
+
+class TestNegotiateEncoding(unittest.TestCase):
+    def test_negotiate(self):
+        self.assertEqual(negotiate('gzip'), 'gzip')
+        self.assertEqual(negotiate('gzip;q=0, deflate'), None)
+        self.assertEqual(negotiate('identity'), None)
+        self.assertEqual(negotiate(''), None)
+        self.assertEqual(negotiate('*'), available_encodings()[0])
+        self.assertEqual(negotiate('gzip;q=1.0, br;q=0.5'), 'gzip')
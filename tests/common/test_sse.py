@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from common.server.sse import EventStream
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+async def items(*values, delay=0.0):
+    for value in values:
+        if delay:
+            await asyncio.sleep(delay)
+        yield value
+
+
+def encode(value):
+    return str(value).encode()
+
+
+class TestEventStream(unittest.IsolatedAsyncioTestCase):
+    async def test_event_ids_increase(self):
+        stream = EventStream(items('a', 'b', 'c', delay=0.01), encode)
+        chunks = await collect(stream)
+        self.assertEqual(
+            b''.join(chunks),
+            b'id: 1\ndata: a\n\nid: 2\ndata: b\n\nid: 3\ndata: c\n\n',
+        )
+        self.assertEqual(stream.stats.events, 3)
+        self.assertEqual(stream.stats.bytes, len(b''.join(chunks)))
+
+    async def test_ready_events_are_coalesced(self):
+        stream = EventStream(items(*range(10)), encode, max_batch=4)
+        chunks = await collect(stream)
+        self.assertLess(len(chunks), 10)
+        self.assertEqual(b''.join(chunks).count(b'data: '), 10)
+        self.assertEqual(stream.stats.flushes, len(chunks))
+        self.assertTrue(all(chunk.count(b'data: ') <= 4 for chunk in chunks))
+
+    async def test_heartbeat_while_idle(self):
+        stream = EventStream(
+            items('a', delay=0.05), encode, heartbeat_interval=0.01
+        )
+        chunks = await collect(stream)
+        self.assertEqual(chunks[0], b': ping\n\n')
+        self.assertEqual(chunks[-1], b'id: 1\ndata: a\n\n')
+        self.assertGreater(stream.stats.heartbeats, 0)
+
+    async def test_multiline_payload(self):
+        stream = EventStream(items('a\nb'), encode)
+        self.assertEqual(
+            await collect(stream), [b'id: 1\ndata: a\ndata: b\n\n']
+        )
+
+    async def test_source_error_is_raised_after_flush(self):
+        async def failing():
+            yield 'a'
+            raise RuntimeError('boom')
+
+        chunks = []
+        with self.assertRaises(RuntimeError):
+            async for chunk in EventStream(failing(), encode):
+                chunks.append(chunk)
+        self.assertEqual(chunks, [b'id: 1\ndata: a\n\n'])
@@ -0,0 +1,129 @@
+import unittest
+
+from common.server.subscriber_queue import (
+    OverflowPolicy,
+    SubscriberQueue,
+)
+from common.types import (
+    Artifact,
+    InternalError,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from test_server import EchoTaskManager
+
+
+def status(state=TaskState.WORKING, task_id='t1', final=False):
+    return TaskStatusUpdateEvent(
+        id=task_id, status=TaskStatus(state=state), final=final
+    )
+
+
+def artifact(text='a', task_id='t1'):
+    return TaskArtifactUpdateEvent(
+        id=task_id, artifact=Artifact(parts=[TextPart(text=text)])
+    )
+
+
+def drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait()[1])
+    return events
+
+
+class TestSubscriberQueue(unittest.TestCase):
+    def test_unbounded(self):
+        queue = SubscriberQueue(None)
+        for _ in range(1000):
+            self.assertTrue(queue.offer(status()))
+        self.assertEqual(queue.qsize(), 1000)
+
+    def test_coalesce_keeps_latest_state(self):
+        queue = SubscriberQueue(2, OverflowPolicy.COALESCE)
+        queue.offer(artifact())
+        queue.offer(status(TaskState.WORKING))
+        self.assertTrue(queue.offer(status(TaskState.INPUT_REQUIRED)))
+        events = drain(queue)
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[1].status.state, TaskState.INPUT_REQUIRED)
+        self.assertEqual(queue.stats.coalesced, 1)
+
+    def test_coalesce_never_merges_other_tasks_or_artifacts(self):
+        queue = SubscriberQueue(1, OverflowPolicy.COALESCE)
+        queue.offer(status(task_id='t1'))
+        self.assertFalse(queue.offer(status(task_id='t2')))
+        self.assertTrue(queue.disconnected)
+
+        queue = SubscriberQueue(1, OverflowPolicy.COALESCE)
+        queue.offer(status())
+        self.assertFalse(queue.offer(artifact()))
+        self.assertIsInstance(drain(queue)[0], InternalError)
+
+    def test_drop_oldest_status(self):
+        queue = SubscriberQueue(3, OverflowPolicy.DROP_OLDEST)
+        queue.offer(artifact('a'))
+        queue.offer(status(TaskState.WORKING))
+        queue.offer(artifact('b'))
+        self.assertTrue(queue.offer(status(TaskState.COMPLETED, final=True)))
+        events = drain(queue)
+        self.assertEqual(
+            [type(e).__name__ for e in events],
+            [
+                'TaskArtifactUpdateEvent',
+                'TaskArtifactUpdateEvent',
+                'TaskStatusUpdateEvent',
+            ],
+        )
+        self.assertTrue(events[-1].final)
+        self.assertEqual(queue.stats.dropped, 1)
+
+    def test_drop_oldest_never_drops_artifacts(self):
+        queue = SubscriberQueue(2, OverflowPolicy.DROP_OLDEST)
+        queue.offer(artifact('a'))
+        queue.offer(artifact('b'))
+        self.assertTrue(queue.offer(status()))
+        self.assertEqual(queue.stats.dropped, 1)
+        self.assertFalse(queue.offer(artifact('c')))
+        self.assertEqual(queue.stats.disconnected, 1)
+
+    def test_disconnect(self):
+        queue = SubscriberQueue(1, OverflowPolicy.DISCONNECT)
+        queue.offer(status())
+        self.assertFalse(queue.offer(status()))
+        self.assertFalse(queue.offer(status()))
+        events = drain(queue)
+        self.assertEqual(len(events), 1)
+        self.assertIsInstance(events[0], InternalError)
+        self.assertEqual(queue.stats.disconnected, 1)
+
+
+class TestTaskManagerSubscribers(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_subscriber_does_not_block_others(self):
+        manager = EchoTaskManager(
+            sse_queue_size=4, sse_overflow_policy=OverflowPolicy.DISCONNECT
+        )
+        slow = await manager.setup_sse_consumer('t1')
+        fast = await manager.setup_sse_consumer('t1')
+        for i in range(10):
+            await manager.enqueue_events_for_sse('t1', artifact(str(i)))
+            fast.get_nowait()
+
+        self.assertEqual(manager.task_sse_subscribers['t1'], (fast,))
+        self.assertEqual(manager.subscriber_stats.disconnected, 1)
+        responses = [
+            r async for r in manager.dequeue_events_for_sse('r1', 't1', slow)
+        ]
+        self.assertEqual(len(responses), 1)
+        self.assertIsNotNone(responses[0].error)
+
+    async def test_queue_stays_bounded(self):
+        manager = EchoTaskManager(sse_queue_size=8)
+        queue = await manager.setup_sse_consumer('t1')
+        for _ in range(1000):
+            await manager.enqueue_events_for_sse('t1', status())
+        self.assertEqual(queue.qsize(), 8)
+        self.assertEqual(manager.subscriber_stats.coalesced, 1000 - 8)
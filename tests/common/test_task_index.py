@@ -0,0 +1,227 @@
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from common.server import A2AServer
+from common.server.retention import TaskRetention
+from common.server.task_index import TaskIndex
+from common.types import (
+    ListTasksRequest,
+    Message,
+    Task,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from starlette.testclient import TestClient
+from test_server import EchoTaskManager, make_agent_card, send_task_body
+
+
+def make_task(task_id, session_id='s1', state=TaskState.WORKING):
+    return Task(
+        id=task_id, sessionId=session_id, status=TaskStatus(state=state)
+    )
+
+
+class TestTaskIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TaskIndex()
+
+    def test_most_recently_updated_first(self):
+        for i in range(3):
+            self.index.update(make_task(f't{i}'))
+        self.index.update(make_task('t0'))
+        self.assertEqual(self.index.query()[0], ['t0', 't2', 't1'])
+        self.assertEqual(len(self.index), 3)
+
+    def test_filters(self):
+        self.index.update(make_task('a', 's1', TaskState.COMPLETED))
+        self.index.update(make_task('b', 's2', TaskState.COMPLETED))
+        self.index.update(make_task('c', 's1', TaskState.WORKING))
+        self.assertEqual(self.index.query(session_id='s1')[0], ['c', 'a'])
+        self.assertEqual(
+            self.index.query(state=TaskState.COMPLETED)[0], ['b', 'a']
+        )
+        self.assertEqual(
+            self.index.query(session_id='s1', state=TaskState.COMPLETED)[0],
+            ['a'],
+        )
+        self.assertEqual(self.index.query(session_id='s3'), ([], None))
+
+        self.index.update(make_task('c', 's1', TaskState.COMPLETED))
+        self.assertEqual(self.index.query(state=TaskState.WORKING), ([], None))
+        self.assertEqual(
+            self.index.query(state=TaskState.COMPLETED)[0], ['c', 'b', 'a']
+        )
+
+    def test_pagination(self):
+        for i in range(5):
+            self.index.update(make_task(f't{i}'))
+        pages = []
+        before_seq = None
+        while True:
+            task_ids, before_seq = self.index.query(
+                before_seq=before_seq, limit=2
+            )
+            pages.append(task_ids)
+            if before_seq is None:
+                break
+        self.assertEqual(pages, [['t4', 't3'], ['t2', 't1'], ['t0']])
+
+    def test_exact_last_page_has_no_cursor(self):
+        for i in range(2):
+            self.index.update(make_task(f't{i}'))
+        self.assertEqual(self.index.query(limit=2), (['t1', 't0'], None))
+
+    def test_time_range(self):
+        self.index.update(make_task('old'))
+        self.index._last_update += 100
+        self.index.update(make_task('new'))
+        cut = self.index._last_update - 50
+        self.assertEqual(self.index.query(updated_after=cut)[0], ['new'])
+        self.assertEqual(self.index.query(updated_before=cut)[0], ['old'])
+
+    def test_remove_and_compaction(self):
+        for _ in range(100):
+            self.index.update(make_task('t1'))
+        self.assertLessEqual(len(self.index._all.seqs), 2)
+        self.index.remove('t1')
+        self.index.remove('missing')
+        self.assertEqual(self.index.query(), ([], None))
+        self.assertEqual(self.index._sessions, {})
+        self.assertEqual(self.index._states, {})
+
+
+class TestListTasks(unittest.IsolatedAsyncioTestCase):
+    async def test_list_session_tasks(self):
+        manager = EchoTaskManager()
+        message = Message(role='user', parts=[TextPart(text='hello')])
+        for i in range(3):
+            await manager.upsert_task(
+                TaskSendParams(id=f't{i}', sessionId='s1', message=message)
+            )
+        await manager.upsert_task(
+            TaskSendParams(id='other', sessionId='s2', message=message)
+        )
+        await manager.update_store(
+            't1', TaskStatus(state=TaskState.COMPLETED), None
+        )
+
+        response = await manager.on_list_tasks(
+            ListTasksRequest(id=1, params={'sessionId': 's1', 'pageSize': 2})
+        )
+        self.assertEqual(
+            [task.id for task in response.result.tasks], ['t1', 't2']
+        )
+        response = await manager.on_list_tasks(
+            ListTasksRequest(
+                id=2,
+                params={
+                    'sessionId': 's1',
+                    'pageSize': 2,
+                    'cursor': response.result.nextCursor,
+                    'historyLength': 0,
+                },
+            )
+        )
+        self.assertEqual([task.id for task in response.result.tasks], ['t0'])
+        self.assertEqual(response.result.tasks[0].history, [])
+        self.assertIsNone(response.result.nextCursor)
+
+        response = await manager.on_list_tasks(
+            ListTasksRequest(id=3, params={'state': 'completed'})
+        )
+        self.assertEqual([task.id for task in response.result.tasks], ['t1'])
+
+        future = datetime.now() + timedelta(hours=1)
+        response = await manager.on_list_tasks(
+            ListTasksRequest(id=4, params={'updatedAfter': future})
+        )
+        self.assertEqual(response.result.tasks, [])
+
+    async def test_bad_cursor(self):
+        response = await EchoTaskManager().on_list_tasks(
+            ListTasksRequest(id=1, params={'cursor': 'nope'})
+        )
+        self.assertEqual(response.error.code, -32602)
+
+    async def test_evicted_tasks_are_unlisted(self):
+        manager = EchoTaskManager(retention=TaskRetention(max_tasks=1))
+        message = Message(role='user', parts=[TextPart(text='hello')])
+        for i in range(3):
+            await manager.upsert_task(
+                TaskSendParams(id=f't{i}', message=message)
+            )
+            await manager.update_store(
+                f't{i}', TaskStatus(state=TaskState.COMPLETED), None
+            )
+        response = await manager.on_list_tasks(ListTasksRequest(id=1))
+        self.assertEqual([task.id for task in response.result.tasks], ['t2'])
+        self.assertEqual(len(manager.task_index), 1)
+
+
+class TestListSharedTasks(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = str(Path(tmp_dir.name) / 'tasks.db')
+
+    async def list_ids(self, manager, **params):
+        response = await manager.on_list_tasks(
+            ListTasksRequest(id=1, params=params)
+        )
+        return [task.id for task in response.result.tasks]
+
+    async def test_tasks_of_other_processes_are_listed(self):
+        writer = EchoTaskManager(store_path=self.path)
+        message = Message(role='user', parts=[TextPart(text='hello')])
+        for i in range(3):
+            await writer.upsert_task(
+                TaskSendParams(id=f't{i}', sessionId='s1', message=message)
+            )
+        await writer.update_store(
+            't1', TaskStatus(state=TaskState.COMPLETED), None
+        )
+        writer.tasks.flush()
+
+        # A restarted process, or another worker, has an empty task index.
+        reader = EchoTaskManager(store_path=self.path)
+        self.assertEqual(
+            await self.list_ids(reader, sessionId='s1'), ['t1', 't2', 't0']
+        )
+        self.assertEqual(await self.list_ids(reader, state='completed'), ['t1'])
+        self.assertEqual(await self.list_ids(reader, sessionId='s2'), [])
+
+        response = await reader.on_list_tasks(
+            ListTasksRequest(id=1, params={'pageSize': 2})
+        )
+        self.assertEqual(len(response.result.tasks), 2)
+        self.assertEqual(
+            await self.list_ids(reader, cursor=response.result.nextCursor),
+            ['t0'],
+        )
+
+        response = await reader.on_list_tasks(
+            ListTasksRequest(id=1, params={'cursor': 'nope'})
+        )
+        self.assertEqual(response.error.code, -32602)
+
+
+class TestListTasksEndpoint(unittest.TestCase):
+    def test_tasks_list(self):
+        server = A2AServer(
+            agent_card=make_agent_card(), task_manager=EchoTaskManager()
+        )
+        client = TestClient(server.app)
+        client.post('/', json=send_task_body('t1'))
+        response = client.post(
+            '/', json={'jsonrpc': '2.0', 'id': 2, 'method': 'tasks/list'}
+        )
+        body = response.json()
+        self.assertEqual(
+            [task['id'] for task in body['result']['tasks']], ['t1']
+        )
+        self.assertNotIn('nextCursor', body['result'])
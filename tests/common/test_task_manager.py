@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 from collections.abc import AsyncIterable
@@ -33,7 +34,6 @@ from common.types import (
     TaskStatus,
     TaskStatusUpdateEvent,
     TextPart,
-    UnsupportedOperationError,
 )
 
 
@@ -183,13 +183,31 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(self.task_manager.tasks), 1)
         self.assertEqual(len(task.history), 2)
 
+    async def test_task_locks_do_not_block_other_tasks(self):
+        manager = self.task_manager
+        busy = 'busy_task'
+        other = next(
+            f'task_{i}'
+            for i in range(100)
+            if manager.task_lock(f'task_{i}') is not manager.task_lock(busy)
+        )
+        async with manager.task_lock(busy):
+            task = await asyncio.wait_for(
+                manager.upsert_task(
+                    TaskSendParams(id=other, message=self.get_test_message())
+                ),
+                timeout=1,
+            )
+            self.assertEqual(task.id, other)
+            self.assertIs(manager.task_lock(busy), manager.task_lock(busy))
+
     async def test_on_resubscribe_to_task(self):
         request = TaskResubscriptionRequest(
             id='1', params=TaskIdParams(id='test_task')
         )
         response = await self.task_manager.on_resubscribe_to_task(request)
         self.assertIsInstance(response, JSONRPCResponse)
-        self.assertIsInstance(response.error, UnsupportedOperationError)
+        self.assertIsInstance(response.error, TaskNotFoundError)
 
     async def test_update_store_success(self):
         task_id = 'test_task'
@@ -243,7 +261,28 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
             ],
         )
         new_task = self.task_manager.append_task_history(task, None)
-        self.assertEqual(len(new_task.history), 0)
+        self.assertEqual(len(new_task.history), 5)
+
+    async def test_append_task_history_zero_length(self):
+        task = Task(
+            id='test_task',
+            status=TaskStatus(state=TaskState.SUBMITTED),
+            history=[self.get_test_message() for _ in range(5)],
+        )
+        new_task = self.task_manager.append_task_history(task, 0)
+        self.assertEqual(new_task.history, [])
+        self.assertEqual(len(task.history), 5)
+
+    async def test_append_task_history_does_not_copy_untrimmed_task(self):
+        task = Task(
+            id='test_task',
+            status=TaskStatus(state=TaskState.SUBMITTED),
+            history=[self.get_test_message() for _ in range(5)],
+        )
+        self.assertIs(self.task_manager.append_task_history(task, 5), task)
+        trimmed = self.task_manager.append_task_history(task, 2)
+        self.assertIsNot(trimmed, task)
+        self.assertEqual(len(task.history), 5)
 
     async def test_setup_sse_consumer_new_task(self):
         task_id = 'new_task'
@@ -289,7 +328,7 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         await self.task_manager.enqueue_events_for_sse(
             task_id, task_update_event
         )
-        retrieved_event = await sse_queue.get()
+        _, retrieved_event = await sse_queue.get()
         self.assertEqual(retrieved_event, task_update_event)
 
     async def test_dequeue_events_for_sse_success(self):
@@ -336,6 +375,4 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
             request_id, task_id, sse_queue
         ):
             pass
-        self.assertEqual(
-            len(self.task_manager.task_sse_subscribers[task_id]), 0
-        )
+        self.assertNotIn(task_id, self.task_manager.task_sse_subscribers)
@@ -0,0 +1,292 @@
+import sqlite3
+import tempfile
+import unittest
+
+from collections.abc import AsyncIterable
+from pathlib import Path
+
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import (
+    CompactTaskStore,
+    InMemoryTaskStore,
+    SQLiteModelStore,
+    SQLiteTaskStore,
+)
+from common.types import (
+    Artifact,
+    DataPart,
+    GetTaskRequest,
+    GetTaskResponse,
+    JSONRPCResponse,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    Task,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+class SharedTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        pass
+
+    async def on_send_task_subscribe(
+        self, request: SendTaskStreamingRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
+        pass
+
+
+class TestSQLiteModelStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp_dir.name) / 'tasks.db')
+        self.store = SQLiteModelStore(self.path, 'tasks', Task)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        task = Task(id='t1', status=TaskStatus(state=TaskState.WORKING))
+        self.store['t1'] = task
+        self.assertIn('t1', self.store)
+        self.assertEqual(self.store['t1'], task)
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(list(self.store), ['t1'])
+
+    def test_missing_key(self):
+        self.assertIsNone(self.store.get('missing'))
+        with self.assertRaises(KeyError):
+            del self.store['missing']
+
+    def test_shared_between_instances(self):
+        self.store['t1'] = Task(
+            id='t1', status=TaskStatus(state=TaskState.SUBMITTED)
+        )
+        other = SQLiteModelStore(self.path, 'tasks', Task)
+        self.assertEqual(other['t1'].status.state, TaskState.SUBMITTED)
+
+
+def make_task(task_id, state=TaskState.SUBMITTED, session_id=None):
+    return Task(
+        id=task_id,
+        sessionId=session_id,
+        status=TaskStatus(state=state),
+        history=[],
+    )
+
+
+class TaskStoreTests:
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.store = self.make_store()
+
+    def test_upsert_and_get(self):
+        self.store.upsert(make_task('t1'))
+        self.assertIn('t1', self.store)
+        self.assertEqual(self.store['t1'].id, 't1')
+        self.assertIsNone(self.store.get('missing'))
+        self.assertEqual(len(self.store), 1)
+
+    def test_update_task_and_history(self):
+        self.store.upsert(make_task('t1'))
+        message = Message(role='agent', parts=[TextPart(text='done')])
+        self.store.update_task('t1', TaskStatus(state=TaskState.COMPLETED))
+        task = self.store.append_history('t1', message)
+        self.assertEqual(task.history, [message])
+        self.assertEqual(self.store['t1'].status.state, TaskState.COMPLETED)
+        with self.assertRaises(KeyError):
+            self.store.update_task('missing', task.status)
+
+    def test_list_tasks(self):
+        self.store.upsert(make_task('t1', TaskState.WORKING, 's1'))
+        self.store.upsert(make_task('t2', TaskState.COMPLETED, 's1'))
+        self.store.upsert(make_task('t3', TaskState.WORKING, 's2'))
+        working = self.store.list_tasks(state=TaskState.WORKING)
+        self.assertEqual(sorted(t.id for t in working), ['t1', 't3'])
+        session = self.store.list_tasks(session_id='s1')
+        self.assertEqual(sorted(t.id for t in session), ['t1', 't2'])
+
+    def test_delete(self):
+        self.store.upsert(make_task('t1'))
+        del self.store['t1']
+        self.assertNotIn('t1', self.store)
+        with self.assertRaises(KeyError):
+            del self.store['t1']
+
+
+class TestInMemoryTaskStore(TaskStoreTests, unittest.TestCase):
+    def make_store(self):
+        return InMemoryTaskStore()
+
+
+class TestCompactTaskStore(TaskStoreTests, unittest.TestCase):
+    def make_store(self):
+        # A single cached task makes every other one go through its
+        # compact form.
+        return CompactTaskStore(cache_size=1)
+
+    def test_round_trip(self):
+        task = Task(
+            id='t1',
+            sessionId='s1',
+            status=TaskStatus(
+                state=TaskState.INPUT_REQUIRED,
+                message=Message(role='agent', parts=[TextPart(text='more?')]),
+            ),
+            artifacts=[Artifact(parts=[DataPart(data={'close': 1.5})])],
+            history=[
+                Message(role='user', parts=[TextPart(text='hi')]),
+                Message(
+                    role='agent',
+                    parts=[TextPart(text='a'), TextPart(text='b')],
+                ),
+                Message(
+                    role='user',
+                    parts=[TextPart(text='c', metadata={'k': 1})],
+                ),
+            ],
+            metadata={'source': 'test'},
+        )
+        self.store.upsert(task)
+        self.store.upsert(make_task('t2'))
+        restored = self.store['t1']
+        self.assertIsNot(restored, task)
+        self.assertEqual(restored, task)
+        self.assertEqual(restored.model_dump_json(), task.model_dump_json())
+
+    def test_updates_of_evicted_tasks(self):
+        self.store.upsert(make_task('t1'))
+        self.store.upsert(make_task('t2'))
+        message = Message(role='agent', parts=[TextPart(text='done')])
+        artifact = Artifact(parts=[TextPart(text='result')])
+        self.store.update_task(
+            't1',
+            TaskStatus(state=TaskState.COMPLETED, message=message),
+            [artifact],
+        )
+        self.store.append_history('t1', message)
+        self.store.upsert(make_task('t3'))
+
+        task = self.store['t1']
+        self.assertEqual(task.status.state, TaskState.COMPLETED)
+        self.assertEqual(task.status.message, message)
+        self.assertEqual(task.artifacts, [artifact])
+        self.assertEqual(task.history, [message])
+        completed = self.store.list_tasks(state=TaskState.COMPLETED)
+        self.assertEqual([t.id for t in completed], ['t1'])
+
+    def test_hot_reads_hit_the_cache(self):
+        self.store.upsert(make_task('t1'))
+        self.assertIs(self.store['t1'], self.store['t1'])
+
+    def test_reads_leave_the_cache(self):
+        self.store.upsert(make_task('t1'))
+        running = make_task('t2', TaskState.WORKING)
+        self.store.upsert(running)
+        self.store['t1']
+        list(self.store.values())
+        self.store.list_tasks()
+        self.assertIs(self.store['t2'], running)
+
+    def test_count_by_state(self):
+        self.store.upsert(make_task('t1', TaskState.WORKING))
+        self.store.upsert(make_task('t2', TaskState.COMPLETED))
+        self.store.upsert(make_task('t3', TaskState.WORKING))
+        self.assertEqual(
+            self.store.count_by('$.status.state'),
+            {'working': 2, 'completed': 1},
+        )
+        with self.assertRaises(ValueError):
+            self.store.count_by('$.sessionId')
+
+
+class TestSQLiteTaskStore(TaskStoreTests, unittest.TestCase):
+    def make_store(self):
+        self.path = str(Path(self.tmp_dir.name) / 'tasks.db')
+        return SQLiteTaskStore(self.path, flush_interval=60)
+
+    def test_writes_are_batched(self):
+        self.store.upsert(make_task('t1'))
+        for state in (TaskState.WORKING, TaskState.INPUT_REQUIRED) * 50:
+            self.store.update_task('t1', TaskStatus(state=state))
+        self.store.upsert(make_task('t2'))
+        self.assertEqual(self.store.commits, 0)
+        self.store.flush()
+        self.assertEqual(self.store.commits, 1)
+
+    def test_survives_restart(self):
+        self.store.upsert(make_task('t1', TaskState.WORKING))
+        self.store.close()
+        reopened = SQLiteTaskStore(self.path)
+        self.assertEqual(reopened['t1'].status.state, TaskState.WORKING)
+
+    def test_tables_without_listing_columns(self):
+        self.store.close()
+        path = str(Path(self.tmp_dir.name) / 'old.db')
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute(
+                'CREATE TABLE tasks '
+                '(id TEXT PRIMARY KEY, data TEXT NOT NULL, version TEXT)'
+            )
+            conn.execute(
+                'INSERT INTO tasks VALUES (?, ?, ?)',
+                ('t1', make_task('t1', session_id='s1').model_dump_json(), 'v'),
+            )
+        conn.close()
+        store = SQLiteTaskStore(path)
+        self.assertEqual(store.query_tasks(session_id='s1'), (['t1'], None))
+        store.close()
+
+    def test_cache_sees_writes_of_other_processes(self):
+        other = SQLiteTaskStore(self.path)
+        self.store.upsert(make_task('t1'))
+        self.store.flush()
+        self.assertEqual(other['t1'].status.state, TaskState.SUBMITTED)
+
+        self.store.update_task('t1', TaskStatus(state=TaskState.COMPLETED))
+        self.store.flush()
+        self.assertEqual(other['t1'].status.state, TaskState.COMPLETED)
+
+    def test_hot_reads_hit_the_cache(self):
+        self.store.upsert(make_task('t1'))
+        self.store.flush()
+        self.assertIs(self.store['t1'], self.store['t1'])
+
+
+class TestSharedTaskManager(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp_dir.name) / 'tasks.db')
+
+    async def asyncTearDown(self):
+        self.tmp_dir.cleanup()
+
+    async def test_task_visible_to_other_manager(self):
+        writer = SharedTaskManager(store_path=self.path)
+        reader = SharedTaskManager(store_path=self.path)
+        message = Message(role='user', parts=[TextPart(text='hello')])
+        await writer.upsert_task(TaskSendParams(id='t1', message=message))
+        await writer.update_store(
+            't1', TaskStatus(state=TaskState.COMPLETED), None
+        )
+        writer.tasks.flush()
+
+        response = await reader.on_get_task(
+            GetTaskRequest(
+                id='1', params=TaskQueryParams(id='t1', historyLength=5)
+            )
+        )
+        self.assertIsInstance(response, GetTaskResponse)
+        self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+        self.assertEqual(len(response.result.history), 1)
@@ -0,0 +1,148 @@
+import unittest
+
+from common.client import A2AClient
+from common.server import A2AServer
+from common.server.admission import ConcurrencyLimit
+from common.types import (
+    Artifact,
+    DataPart,
+    GetTaskRequest,
+    Message,
+    SendTaskStreamingResponse,
+    ServerBusyError,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.utils import trusted
+from test_event_log import StreamingTaskManager, events_of
+from test_server import make_agent_card
+
+
+class TestBuilders(unittest.TestCase):
+    def test_matches_validated_model(self):
+        built = trusted.streaming_response(
+            id=1,
+            result=trusted.status_update(
+                id='t1',
+                status=trusted.task_status(
+                    state=TaskState.WORKING,
+                    message=trusted.message(
+                        role='agent', parts=[trusted.text_part(text='hi')]
+                    ),
+                ),
+            ),
+        )
+        validated = SendTaskStreamingResponse(
+            id=1,
+            result=TaskStatusUpdateEvent(
+                id='t1',
+                status=TaskStatus(
+                    state=TaskState.WORKING,
+                    timestamp=built.result.status.timestamp,
+                    message=Message(role='agent', parts=[TextPart(text='hi')]),
+                ),
+            ),
+        )
+        self.assertEqual(built, validated)
+        self.assertEqual(
+            built.model_dump_json(exclude_none=True),
+            validated.model_dump_json(exclude_none=True),
+        )
+
+    def test_defaults_and_private_attributes(self):
+        first = trusted.task_status(state=TaskState.WORKING)
+        second = trusted.task_status(state=TaskState.WORKING)
+        self.assertIsNone(first.message)
+        self.assertIsNotNone(first.timestamp)
+
+        event = trusted.status_update(id='t1', status=first)
+        self.assertFalse(event.final)
+        self.assertIsNone(event._json)
+        event._json = b'{}'
+        self.assertIsNone(trusted.status_update(id='t1', status=second)._json)
+
+        artifact = trusted.artifact(parts=[trusted.data_part(data={'a': 1})])
+        self.assertEqual(artifact, Artifact(parts=[DataPart(data={'a': 1})]))
+
+    def test_models_stay_mutable(self):
+        status = trusted.task_status(state=TaskState.WORKING)
+        status.state = TaskState.COMPLETED
+        self.assertEqual(status.model_dump()['state'], TaskState.COMPLETED)
+
+    def test_builders_are_cached(self):
+        self.assertIs(trusted.builder(TextPart), trusted.text_part)
+
+    def test_missing_required_field(self):
+        with self.assertRaises(TypeError):
+            trusted.status_update(id='t1')
+
+
+class TestLocalClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.manager = StreamingTaskManager()
+        self.manager.gate.set()
+        self.server = A2AServer(
+            agent_card=make_agent_card(), task_manager=self.manager
+        )
+        self.client = A2AClient(local_server=self.server)
+
+    async def test_send_and_get(self):
+        payload = {
+            'id': 't1',
+            'message': {
+                'role': 'user',
+                'parts': [{'type': 'text', 'text': 'x'}],
+            },
+        }
+        response = await self.client.send_task(payload)
+        self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+
+        response = await self.client.get_task({'id': 't1'})
+        # The stored task itself, not a decoded copy.
+        self.assertIs(response.result, self.manager.tasks['t1'])
+
+        response = await self.client.get_task({'id': 'missing'})
+        self.assertEqual(response.error.code, -32001)
+
+    async def test_streaming(self):
+        payload = {
+            'id': 't1',
+            'message': {
+                'role': 'user',
+                'parts': [{'type': 'text', 'text': 'x'}],
+            },
+        }
+        responses = [
+            response
+            async for response in self.client.send_task_streaming(payload)
+        ]
+        self.assertEqual(
+            [
+                response.result.model_dump(exclude={'status'})
+                for response in responses
+            ],
+            [event.model_dump(exclude={'status'}) for event in events_of('t1')],
+        )
+        self.assertTrue(responses[-1].result.final)
+
+    async def test_batch(self):
+        responses = await self.client.batch(
+            [
+                GetTaskRequest(id=1, params={'id': 'a'}),
+                GetTaskRequest(id=2, params={'id': 'b'}),
+            ]
+        )
+        self.assertEqual([response.id for response in responses], [1, 2])
+
+    async def test_admission_limits_apply(self):
+        limit = ConcurrencyLimit(max_concurrent=1)
+        self.server.set_concurrency_limit('tasks/get', limit)
+        await limit.acquire()
+        response = await self.client.get_task({'id': 't1'})
+        self.assertEqual(response.error.code, ServerBusyError().code)
+
+    def test_requires_a_target(self):
+        with self.assertRaises(ValueError):
+            A2AClient()
@@ -0,0 +1,97 @@
+"""Checks the generated schema decoders against the cases of test_a2a_spec.
+
+Every instance test_a2a_spec validates with jsonschema is also run through
+the decoder generated for the same definition, which has to accept exactly
+what jsonschema accepts and decode it to a model that dumps back to the
+instance.
+"""
+
+import json
+
+from pathlib import Path
+
+import jsonschema
+import pytest
+import test_a2a_spec
+
+from common.utils import a2a_schema
+from common.utils.a2a_schema import DECODERS, SchemaValidationError
+from common.utils.schema_codegen import generate
+from jsonschema import RefResolver
+
+
+SCHEMA_FILE = Path(__file__).parent.parent / 'specification/json/a2a.json'
+SCHEMA = json.loads(SCHEMA_FILE.read_text())
+RESOLVER = RefResolver.from_schema(SCHEMA)
+
+
+def spec_cases():
+    for name, function in vars(test_a2a_spec).items():
+        if not name.startswith('test_') or not callable(function):
+            continue
+        params = [{}]
+        for mark in getattr(function, 'pytestmark', []):
+            if mark.name == 'parametrize':
+                argname, values = mark.args
+                params = [{**p, argname: v} for p in params for v in values]
+        for index, kwargs in enumerate(params):
+            yield pytest.param(function, kwargs, id=f'{name}[{index}]')
+
+
+def dump(value):
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json', exclude_none=True)
+    return value
+
+
+@pytest.mark.parametrize(('case', 'kwargs'), list(spec_cases()))
+def test_spec_case(case, kwargs, monkeypatch):
+    decoded = []
+
+    def validate(instance, schema, **options):
+        name = schema['$ref'].rsplit('/', 1)[-1] if '$ref' in schema else None
+        name = name or schema['title']
+        try:
+            jsonschema.validate(instance=instance, schema=schema, **options)
+        except jsonschema.ValidationError:
+            with pytest.raises(SchemaValidationError):
+                DECODERS[name](instance)
+            raise
+        assert dump(DECODERS[name](instance)) == instance
+        decoded.append(name)
+
+    monkeypatch.setattr(test_a2a_spec, 'validate', validate)
+    case(schema=SCHEMA, resolver=RESOLVER, **kwargs)
+    assert decoded
+
+
+@pytest.mark.parametrize(
+    ('name', 'instance'),
+    [
+        ('TextPart', {'type': 'text'}),
+        ('TextPart', {'type': 'data', 'text': 'x'}),
+        ('Message', {'role': 'bot', 'parts': []}),
+        ('Message', {'role': 'user', 'parts': [{'type': 'text', 'text': 1}]}),
+        ('TaskStatus', {'state': 'done'}),
+        ('Task', {'id': 't1', 'status': {'state': 'working'}, 'history': {}}),
+        ('GetTaskRequest', {'id': 1.5, 'method': 'tasks/get'}),
+        ('GetTaskRequest', {'method': 'tasks/get', 'params': {'id': None}}),
+        ('A2ARequest', {'method': 'tasks/unknown', 'params': {}}),
+        ('AgentCapabilities', {'streaming': 'yes'}),
+    ],
+)
+def test_rejected_like_jsonschema(name, instance):
+    with pytest.raises(jsonschema.ValidationError):
+        jsonschema.validate(
+            instance=instance,
+            schema={'$ref': f'#/$defs/{name}'},
+            resolver=RESOLVER,
+        )
+    with pytest.raises(SchemaValidationError):
+        DECODERS[name](instance)
+
+
+def test_generated_module_is_up_to_date():
+    # Regenerate with: python -m common.utils.schema_codegen
+    source = Path(a2a_schema.__file__).read_text()
+    assert generate(SCHEMA) == source